@@ -0,0 +1,302 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('phone_number', sa.String(length=15), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('gender', sa.String(length=10), nullable=True),
+    sa.Column('village', sa.String(length=100), nullable=True),
+    sa.Column('district', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('language_preference', sa.String(length=10), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('emergency_contact_name', sa.String(length=100), nullable=True),
+    sa.Column('emergency_contact_phone', sa.String(length=15), nullable=True),
+    sa.Column('blood_group', sa.String(length=5), nullable=True),
+    sa.Column('allergies', sa.Text(), nullable=True),
+    sa.Column('chronic_conditions', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_phone_number'), ['phone_number'], unique=True)
+
+    op.create_table('appointments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('doctor_name', sa.String(length=100), nullable=False),
+    sa.Column('doctor_specialization', sa.String(length=100), nullable=True),
+    sa.Column('clinic_name', sa.String(length=200), nullable=True),
+    sa.Column('clinic_address', sa.Text(), nullable=True),
+    sa.Column('appointment_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('appointment_type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('meet_link', sa.String(length=500), nullable=True),
+    sa.Column('meet_id', sa.String(length=100), nullable=True),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('reminder_sent', sa.Boolean(), nullable=True),
+    sa.Column('reminder_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_appointments_id'), ['id'], unique=False)
+
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_change_log_id'), ['id'], unique=False)
+        batch_op.create_index('ix_change_log_user_id_id', ['user_id', 'id'], unique=False)
+
+    op.create_table('device_data',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('device_type', sa.String(length=50), nullable=False),
+    sa.Column('device_model', sa.String(length=100), nullable=True),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('measurement_type', sa.String(length=50), nullable=False),
+    sa.Column('values', sa.Text(), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('normal_range_min', sa.Float(), nullable=True),
+    sa.Column('normal_range_max', sa.Float(), nullable=True),
+    sa.Column('is_normal', sa.String(length=20), nullable=True),
+    sa.Column('measurement_context', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('measured_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_device_data_id'), ['id'], unique=False)
+
+    op.create_table('health_points',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('activity_type', sa.String(length=50), nullable=False),
+    sa.Column('activity_description', sa.Text(), nullable=True),
+    sa.Column('reference_type', sa.String(length=50), nullable=True),
+    sa.Column('reference_id', sa.Integer(), nullable=True),
+    sa.Column('base_points', sa.Integer(), nullable=False),
+    sa.Column('multiplier', sa.Integer(), nullable=True),
+    sa.Column('bonus_points', sa.Integer(), nullable=True),
+    sa.Column('bonus_reason', sa.String(length=100), nullable=True),
+    sa.Column('earned_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('health_points', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_points_id'), ['id'], unique=False)
+
+    op.create_table('health_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('consultation_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('doctor_name', sa.String(length=100), nullable=False),
+    sa.Column('clinic_name', sa.String(length=200), nullable=True),
+    sa.Column('consultation_type', sa.String(length=50), nullable=False),
+    sa.Column('encrypted_transcript', sa.Text(), nullable=True),
+    sa.Column('encrypted_audio_url', sa.String(length=500), nullable=True),
+    sa.Column('encrypted_summary', sa.Text(), nullable=True),
+    sa.Column('encrypted_prescription', sa.Text(), nullable=True),
+    sa.Column('qr_access_key', sa.String(length=100), nullable=True),
+    sa.Column('is_locked', sa.Boolean(), nullable=True),
+    sa.Column('unlock_count', sa.Integer(), nullable=True),
+    sa.Column('last_unlocked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('diagnosis', sa.Text(), nullable=True),
+    sa.Column('symptoms', sa.Text(), nullable=True),
+    sa.Column('attachments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_records_id'), ['id'], unique=False)
+
+    op.create_table('idempotency_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key')
+    )
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_idempotency_keys_id'), ['id'], unique=False)
+
+    op.create_table('medicines',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('dosage', sa.String(length=50), nullable=False),
+    sa.Column('frequency', sa.String(length=50), nullable=False),
+    sa.Column('instructions', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('morning_time', sa.String(length=10), nullable=True),
+    sa.Column('afternoon_time', sa.String(length=10), nullable=True),
+    sa.Column('night_time', sa.String(length=10), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('prescribed_by', sa.String(length=100), nullable=True),
+    sa.Column('prescription_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('medicines', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_medicines_id'), ['id'], unique=False)
+
+    op.create_table('symptom_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('symptom_type', sa.String(length=100), nullable=False),
+    sa.Column('severity', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('body_part', sa.String(length=100), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('triggers', sa.Text(), nullable=True),
+    sa.Column('medications_taken', sa.Text(), nullable=True),
+    sa.Column('mood_rating', sa.Integer(), nullable=True),
+    sa.Column('activity_level', sa.String(length=20), nullable=True),
+    sa.Column('weather_condition', sa.String(length=50), nullable=True),
+    sa.Column('location', sa.String(length=100), nullable=True),
+    sa.Column('logged_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('symptom_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_symptom_logs_id'), ['id'], unique=False)
+
+    op.create_table('medicine_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('medicine_id', sa.Integer(), nullable=False),
+    sa.Column('scheduled_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('taken_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('side_effects', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['medicine_id'], ['medicines.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('medicine_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_medicine_logs_id'), ['id'], unique=False)
+
+    op.create_table('reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('medicine_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('time', sa.String(length=5), nullable=False),
+    sa.Column('frequency', sa.String(length=20), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=True),
+    sa.Column('sound', sa.Boolean(), nullable=True),
+    sa.Column('snooze_minutes', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['medicine_id'], ['medicines.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reminders_id'), ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reminders_id'))
+
+    op.drop_table('reminders')
+    with op.batch_alter_table('medicine_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_medicine_logs_id'))
+
+    op.drop_table('medicine_logs')
+    with op.batch_alter_table('symptom_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_symptom_logs_id'))
+
+    op.drop_table('symptom_logs')
+    with op.batch_alter_table('medicines', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_medicines_id'))
+
+    op.drop_table('medicines')
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_idempotency_keys_id'))
+
+    op.drop_table('idempotency_keys')
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_records_id'))
+
+    op.drop_table('health_records')
+    with op.batch_alter_table('health_points', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_points_id'))
+
+    op.drop_table('health_points')
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_device_data_id'))
+
+    op.drop_table('device_data')
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_user_id_id')
+        batch_op.drop_index(batch_op.f('ix_change_log_id'))
+
+    op.drop_table('change_log')
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_appointments_id'))
+
+    op.drop_table('appointments')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_phone_number'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+
+    op.drop_table('users')
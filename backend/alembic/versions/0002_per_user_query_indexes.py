@@ -0,0 +1,88 @@
+"""per-user query indexes
+
+Composite indexes for the per-user list queries, indexes on the remaining
+foreign keys, and a unique (user_id, medicine_id, frequency) constraint on
+reminders in place of the read-then-insert check in create_reminder.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATE_REMINDERS = "id NOT IN (SELECT MIN(id) FROM reminders GROUP BY user_id, medicine_id, frequency)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_user_id_appointment_date', ['user_id', 'appointment_date'], unique=False)
+
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.create_index('ix_device_data_user_id_measurement_type_measured_at', ['user_id', 'measurement_type', 'measured_at'], unique=False)
+
+    with op.batch_alter_table('health_points', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_points_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_records_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('medicine_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_medicine_logs_medicine_id'), ['medicine_id'], unique=False)
+        batch_op.create_index('ix_medicine_logs_user_id_scheduled_time_id', ['user_id', 'scheduled_time', 'id'], unique=False)
+
+    with op.batch_alter_table('medicines', schema=None) as batch_op:
+        batch_op.create_index('ix_medicines_user_id_id', ['user_id', 'id'], unique=False)
+
+    # Keep the oldest of any duplicate reminders the old check let through,
+    # logging a delete for each removed one so synced clients drop it too
+    op.execute(
+        "INSERT INTO change_log (user_id, table_name, row_id, operation) "
+        f"SELECT user_id, 'reminders', id, 'delete' FROM reminders WHERE {DUPLICATE_REMINDERS} ORDER BY id"
+    )
+    op.execute(f"DELETE FROM reminders WHERE {DUPLICATE_REMINDERS}")
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reminders_medicine_id'), ['medicine_id'], unique=False)
+        batch_op.create_unique_constraint('uq_reminders_user_id_medicine_id_frequency', ['user_id', 'medicine_id', 'frequency'])
+
+    with op.batch_alter_table('symptom_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_symptom_logs_user_id_logged_at', ['user_id', 'logged_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('symptom_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_symptom_logs_user_id_logged_at')
+
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_reminders_user_id_medicine_id_frequency', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_reminders_medicine_id'))
+
+    with op.batch_alter_table('medicines', schema=None) as batch_op:
+        batch_op.drop_index('ix_medicines_user_id_id')
+
+    with op.batch_alter_table('medicine_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_medicine_logs_user_id_scheduled_time_id')
+        batch_op.drop_index(batch_op.f('ix_medicine_logs_medicine_id'))
+
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_records_user_id'))
+
+    with op.batch_alter_table('health_points', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_points_user_id'))
+
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.drop_index('ix_device_data_user_id_measurement_type_measured_at')
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_user_id_appointment_date')
@@ -0,0 +1,52 @@
+"""attachments
+
+Files attached to health records, stored encrypted in the content-addressed
+attachment store; rows with the same blob_id share one stored blob.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('health_record_id', sa.Integer(), nullable=False),
+    sa.Column('blob_id', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['health_record_id'], ['health_records.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_attachments_blob_id'), ['blob_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_attachments_health_record_id'), ['health_record_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_attachments_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_attachments_id'))
+        batch_op.drop_index(batch_op.f('ix_attachments_health_record_id'))
+        batch_op.drop_index(batch_op.f('ix_attachments_blob_id'))
+
+    op.drop_table('attachments')
@@ -0,0 +1,52 @@
+"""qr key hash
+
+Health records keep a SHA-256 of their single-use QR key, under a unique
+index, instead of the key itself. Outstanding keys are hashed in place so
+QR codes already handed out keep working.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qr_key_hash', sa.String(length=64), nullable=True))
+
+    connection = op.get_bind()
+    records = sa.table('health_records', sa.column('id'), sa.column('qr_access_key'), sa.column('qr_key_hash'))
+    rows = connection.execute(
+        sa.select(records.c.id, records.c.qr_access_key).where(records.c.qr_access_key.is_not(None))
+    ).all()
+    if rows:
+        connection.execute(
+            records.update().where(records.c.id == sa.bindparam('row_id')),
+            [{'row_id': row.id, 'qr_key_hash': hashlib.sha256(row.qr_access_key.encode()).hexdigest()} for row in rows],
+        )
+
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_records_qr_key_hash'), ['qr_key_hash'], unique=True)
+        batch_op.drop_column('qr_access_key')
+
+
+def downgrade() -> None:
+    """Downgrade schema. Outstanding QR keys cannot be recovered from their hashes."""
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qr_access_key', sa.String(length=100), nullable=True))
+        batch_op.drop_index(batch_op.f('ix_health_records_qr_key_hash'))
+        batch_op.drop_column('qr_key_hash')
@@ -0,0 +1,134 @@
+"""health record search
+
+A search document per health record (its diagnosis and symptoms tokenized,
+each word scoped to the record's user and clinic) and a full-text index over
+it: an external content FTS5 table kept in step by triggers on SQLite, a
+generated tsvector column with a GIN index on PostgreSQL. Existing records
+are indexed here.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 5000
+
+# The documents are tokenized in Python, so FTS5 only has to split on spaces;
+# the ascii tokenizer keeps every non-ASCII character, so Indic text and the
+# scope separator, whole
+SQLITE_INDEX = [
+    "CREATE VIRTUAL TABLE health_record_search_fts USING fts5("
+    "terms, content='health_record_search', content_rowid='record_id', tokenize='ascii')",
+    "CREATE TRIGGER health_record_search_ai AFTER INSERT ON health_record_search BEGIN "
+    "INSERT INTO health_record_search_fts(rowid, terms) VALUES (new.record_id, new.terms); END",
+    "CREATE TRIGGER health_record_search_ad AFTER DELETE ON health_record_search BEGIN "
+    "INSERT INTO health_record_search_fts(health_record_search_fts, rowid, terms) "
+    "VALUES ('delete', old.record_id, old.terms); END",
+    "CREATE TRIGGER health_record_search_au AFTER UPDATE ON health_record_search BEGIN "
+    "INSERT INTO health_record_search_fts(health_record_search_fts, rowid, terms) "
+    "VALUES ('delete', old.record_id, old.terms); "
+    "INSERT INTO health_record_search_fts(rowid, terms) VALUES (new.record_id, new.terms); END",
+]
+
+# Tokens go in as lexemes as they are, without PostgreSQL's own parser, which
+# would split Indic words at their vowel signs
+POSTGRESQL_INDEX = [
+    "ALTER TABLE health_record_search ADD COLUMN document tsvector GENERATED ALWAYS AS "
+    "(array_to_tsvector(array_remove(string_to_array(terms, ' '), ''))) STORED",
+    "CREATE INDEX ix_health_record_search_document ON health_record_search USING gin (document)",
+]
+
+
+# The tokenizer and search document format as of this revision, frozen here so
+# the backfill doesn't change with app.core.tokenizer or the model; a later
+# change to either needs its own migration to re-index
+INDIC_BLOCKS = "\u0900-\u0963\u0966-\u0dff"
+TOKEN = re.compile(f"(?:[^\\W_]|[{INDIC_BLOCKS}])+")
+JOINERS = dict.fromkeys(map(ord, "\u200c\u200d\u00ad"))
+DIGIT_ZEROS = (0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6, 0x0C66, 0x0CE6, 0x0D66)
+TRANSLATION = {**JOINERS, **{zero + value: str(value) for zero in DIGIT_ZEROS for value in range(10)}}
+MAX_TOKEN_LENGTH = 64
+SCOPE_SEPARATOR = "\u00b7"
+
+
+def tokenize(text: Optional[str]) -> list:
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKC", text).translate(TRANSLATION).casefold()
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN.findall(normalized)]
+
+
+def search_entry(record_id: int, user_id: int, clinic_name: Optional[str], *texts: Optional[str]) -> dict:
+    clinic_tokens = tokenize(clinic_name)
+    key = hashlib.blake2b(" ".join(clinic_tokens).encode(), digest_size=8).hexdigest() if clinic_tokens else None
+    scopes = [f"U{user_id}{SCOPE_SEPARATOR}"] + ([f"C{key}{SCOPE_SEPARATOR}"] if key else [])
+    tokens = [token for text in texts for token in tokenize(text)]
+    return {
+        "record_id": record_id,
+        "user_id": user_id,
+        "clinic_key": key,
+        "terms": " ".join(scope + token for scope in scopes for token in tokens),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('health_record_search',
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('clinic_key', sa.String(length=16), nullable=True),
+    sa.Column('terms', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['record_id'], ['health_records.id'], ),
+    sa.PrimaryKeyConstraint('record_id')
+    )
+    with op.batch_alter_table('health_record_search', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_record_search_user_id'), ['user_id'], unique=False)
+
+    connection = op.get_bind()
+    for statement in {"sqlite": SQLITE_INDEX, "postgresql": POSTGRESQL_INDEX}.get(connection.dialect.name, []):
+        op.execute(statement)
+
+    records = sa.table(
+        'health_records', sa.column('id'), sa.column('user_id'), sa.column('clinic_name'),
+        sa.column('diagnosis'), sa.column('symptoms'),
+    )
+    documents = sa.table(
+        'health_record_search', sa.column('record_id'), sa.column('user_id'), sa.column('clinic_key'),
+        sa.column('terms'),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(records).where(records.c.id > last_id).order_by(records.c.id).limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        connection.execute(sa.insert(documents), [
+            search_entry(row.id, row.user_id, row.clinic_name, row.diagnosis, row.symptoms) for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE health_record_search_fts")
+    with op.batch_alter_table('health_record_search', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_record_search_user_id'))
+
+    op.drop_table('health_record_search')
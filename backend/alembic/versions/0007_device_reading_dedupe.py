@@ -0,0 +1,48 @@
+"""device reading dedupe
+
+A unique (device_id, measurement_type, measured_at) constraint on device
+readings, so re-synced device batches upsert instead of piling up copies.
+Existing duplicates are collapsed to their oldest row first, with a delete
+in the change log for each removed copy so synced clients drop it too.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATES = (
+    "device_id IS NOT NULL AND id NOT IN ("
+    "SELECT MIN(id) FROM device_data WHERE device_id IS NOT NULL "
+    "GROUP BY device_id, measurement_type, measured_at)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "INSERT INTO change_log (user_id, table_name, row_id, operation) "
+        f"SELECT user_id, 'device_data', id, 'delete' FROM device_data WHERE {DUPLICATES} ORDER BY id"
+    )
+    op.execute(f"DELETE FROM device_data WHERE {DUPLICATES}")
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_device_data_device_id_measurement_type_measured_at', ['device_id', 'measurement_type', 'measured_at']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('device_data', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_device_data_device_id_measurement_type_measured_at', type_='unique')
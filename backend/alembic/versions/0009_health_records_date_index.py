@@ -0,0 +1,36 @@
+"""health records date index
+
+A (user_id, consultation_date, id) index on health records, so the records
+list and the history export read a user's records in order instead of
+sorting them all. It replaces the index on user_id alone, which is its
+prefix.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.create_index('ix_health_records_user_id_consultation_date_id', ['user_id', 'consultation_date', 'id'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_health_records_user_id'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('health_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_records_user_id'), ['user_id'], unique=False)
+        batch_op.drop_index('ix_health_records_user_id_consultation_date_id')
@@ -1,15 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.api_v1.endpoints import auth, users, medicines, appointments, records, symptoms, devices, points, reminders
+from app.api.deps import get_current_user
+from app.api.api_v1.endpoints import auth, users, medicines, appointments, records, attachments, symptoms, devices, points, reminders, events, sync
 
 api_router = APIRouter()
 
+# Everything but sign-in needs a bearer token; the event stream checks its own
+authenticated = [Depends(get_current_user)]
+
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(medicines.router, prefix="/medicines", tags=["medicines"])
-api_router.include_router(appointments.router, prefix="/appointments", tags=["appointments"])
-api_router.include_router(records.router, prefix="/records", tags=["health-records"])
-api_router.include_router(symptoms.router, prefix="/symptoms", tags=["symptoms"])
-api_router.include_router(devices.router, prefix="/devices", tags=["devices"])
-api_router.include_router(points.router, prefix="/points", tags=["health-points"])
-api_router.include_router(reminders.router, prefix="/reminders", tags=["reminders"])
\ No newline at end of file
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=authenticated)
+api_router.include_router(medicines.router, prefix="/medicines", tags=["medicines"], dependencies=authenticated)
+api_router.include_router(appointments.router, prefix="/appointments", tags=["appointments"], dependencies=authenticated)
+api_router.include_router(records.router, prefix="/records", tags=["health-records"], dependencies=authenticated)
+api_router.include_router(attachments.router, prefix="/records", tags=["attachments"], dependencies=authenticated)
+api_router.include_router(symptoms.router, prefix="/symptoms", tags=["symptoms"], dependencies=authenticated)
+api_router.include_router(devices.router, prefix="/devices", tags=["devices"], dependencies=authenticated)
+api_router.include_router(points.router, prefix="/points", tags=["health-points"], dependencies=authenticated)
+api_router.include_router(reminders.router, prefix="/reminders", tags=["reminders"], dependencies=authenticated)
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"], dependencies=authenticated)
\ No newline at end of file
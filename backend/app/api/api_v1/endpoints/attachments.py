@@ -0,0 +1,223 @@
+from typing import Any, List, Optional, Tuple
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.api_v1.endpoints.records import get_owned_record
+from app.api.deps import get_current_user_id
+from app.core.config import settings
+from app.core.crypto import cipher
+from app.core.database import get_async_db
+from app.models.attachment import Attachment
+from app.models.health_record import HealthRecord
+from app.schemas.attachment import AttachmentResponse
+from app.services.attachment_store import get_attachment_store
+
+router = APIRouter()
+
+
+async def get_attachment(db: AsyncSession, record: HealthRecord, attachment_id: int) -> Attachment:
+    attachment = await db.get(Attachment, attachment_id)
+    if attachment is None or attachment.health_record_id != record.id:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return attachment
+
+
+def download_path(record_id: int, attachment_id: int) -> str:
+    return f"{settings.API_V1_STR}/records/{record_id}/attachments/{attachment_id}"
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, stop) for a single "bytes=" range, or None to send the whole file.
+    Malformed and multi-range headers are ignored, as RFC 9110 allows.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            stop = int(last) + 1 if last else size
+        else:
+            start, stop = max(size - int(last), 0), size
+    except ValueError:
+        return None
+    stop = min(stop, size)
+    if start >= stop:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, stop
+
+
+async def release_blob(db: AsyncSession, blob_id: str) -> None:
+    """
+    Remove a blob once no attachment refers to it. Uploads commit their row
+    before publishing, so an unreferenced blob is set aside under its lock
+    and the references counted again: an upload that claimed it meanwhile
+    gets it put back. The database is never queried with the lock held.
+    """
+    store = get_attachment_store()
+    references = select(func.count()).select_from(Attachment).where(Attachment.blob_id == blob_id)
+    if await db.scalar(references):
+        return
+    async with store.lock(blob_id):
+        aside = await run_in_threadpool(store.set_aside, blob_id)
+    if aside is None:
+        return
+    if await db.scalar(references):
+        async with store.lock(blob_id):
+            await run_in_threadpool(store.restore, blob_id, aside)
+    else:
+        await run_in_threadpool(store.discard, aside)
+
+
+@router.post("/{record_id}/attachments", response_model=AttachmentResponse)
+async def upload_attachment(
+    record_id: int,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Attach a file to a record. The request body is the file itself, streamed
+    into the encrypted store chunk by chunk; its Content-Type is kept for
+    downloads. An audio file becomes the record's consultation audio.
+    """
+    record = await get_owned_record(db, record_id, user_id)
+    # Hand the connection back to the pool for the length of the upload
+    await db.commit()
+
+    content_type = request.headers.get("content-type", "application/octet-stream").split(";")[0].strip()
+    writer = await run_in_threadpool(get_attachment_store().writer)
+    try:
+        async for piece in request.stream():
+            if writer.size + len(piece) > settings.ATTACHMENT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Attachments are limited to {settings.ATTACHMENT_MAX_BYTES} bytes"
+                )
+            if piece:
+                await run_in_threadpool(writer.write, piece)
+        blob_id, size = await run_in_threadpool(writer.finish)
+    except BaseException:
+        await run_in_threadpool(writer.abort)
+        raise
+
+    # Commit the row before publishing the blob, so a delete of the blob's last
+    # other reference either counts this one or has set the blob aside first
+    attachment = Attachment(
+        user_id=user_id,
+        health_record_id=record.id,
+        blob_id=blob_id,
+        filename=filename,
+        content_type=content_type[:100] or "application/octet-stream",
+        size=size,
+    )
+    try:
+        db.add(attachment)
+        await db.flush()
+        if content_type.startswith("audio/"):
+            record.encrypted_audio_url = cipher().encrypt(download_path(record.id, attachment.id))
+        await db.commit()
+    except BaseException:
+        await run_in_threadpool(writer.abort)
+        raise
+    try:
+        async with get_attachment_store().lock(blob_id):
+            await run_in_threadpool(writer.publish)
+    except BaseException:
+        await run_in_threadpool(writer.abort)
+        await db.delete(attachment)
+        if content_type.startswith("audio/"):
+            record.encrypted_audio_url = None
+        await db.commit()
+        await release_blob(db, blob_id)
+        raise
+    await db.refresh(attachment)
+    return attachment
+
+
+@router.get("/{record_id}/attachments", response_model=List[AttachmentResponse])
+async def get_attachments(
+    record_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """List a record's attachments"""
+    record = await get_owned_record(db, record_id, user_id)
+    result = await db.execute(
+        select(Attachment).where(Attachment.health_record_id == record.id).order_by(Attachment.id)
+    )
+    return result.scalars().all()
+
+
+@router.get("/{record_id}/attachments/{attachment_id}")
+async def download_attachment(
+    record_id: int,
+    attachment_id: int,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream an attachment, decrypting one chunk at a time. A Range header gets
+    a 206 with just those bytes, so audio can seek and downloads can resume.
+    """
+    record = await get_owned_record(db, record_id, user_id)
+    if record.is_locked:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Record is locked")
+    attachment = await get_attachment(db, record, attachment_id)
+    # Nothing below needs the database; don't hold a connection while streaming
+    await db.close()
+
+    etag = f'"{attachment.blob_id}"'
+    requested = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    byte_range = parse_range(requested, attachment.size) if not if_range or if_range == etag else None
+    start, stop = byte_range or (0, attachment.size)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stop - start),
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(attachment.filename)}",
+        "ETag": etag,
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{attachment.size}"
+    return StreamingResponse(
+        get_attachment_store().read(attachment.blob_id, start, stop),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=attachment.content_type,
+        headers=headers,
+    )
+
+
+@router.delete("/{record_id}/attachments/{attachment_id}")
+async def delete_attachment(
+    record_id: int,
+    attachment_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """Remove an attachment; its stored blob goes once nothing else shares it"""
+    record = await get_owned_record(db, record_id, user_id)
+    attachment = await get_attachment(db, record, attachment_id)
+    blob_id = attachment.blob_id
+    audio_url = await db.scalar(select(HealthRecord.encrypted_audio_url).where(HealthRecord.id == record.id))
+    if audio_url is not None and cipher().decrypt(audio_url) == download_path(record.id, attachment.id):
+        record.encrypted_audio_url = None
+    await db.delete(attachment)
+    await db.commit()
+    await release_blob(db, blob_id)
+    return {"message": "Attachment deleted"}
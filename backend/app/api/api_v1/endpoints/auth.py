@@ -2,24 +2,44 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import oauth2_scheme
 from app.core import security
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.passwords import PasswordHasherBusy, password_hasher
 from app.models.user import User
 from app.schemas.auth import Token, UserLogin, UserRegister
 from app.schemas.user import UserResponse
+from app.services.token_revocations import token_revocations
 
 router = APIRouter()
 
 
-def get_user_by_phone(db: Session, phone_number: str) -> User:
-    return db.query(User).filter(User.phone_number == phone_number).first()
+async def get_user_by_phone(db: AsyncSession, phone_number: str) -> User:
+    result = await db.execute(select(User).where(User.phone_number == phone_number))
+    return result.scalars().first()
 
 
-def create_user(db: Session, user_data: UserRegister) -> User:
-    hashed_password = security.get_password_hash(user_data.password)
+def raise_busy():
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise_busy()
+
+
+async def create_user(db: AsyncSession, user_data: UserRegister) -> User:
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         phone_number=user_data.phone_number,
         name=user_data.name,
@@ -37,30 +57,41 @@ def create_user(db: Session, user_data: UserRegister) -> User:
         chronic_conditions=user_data.chronic_conditions
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def authenticate_user(db: Session, phone_number: str, password: str) -> User:
-    user = get_user_by_phone(db, phone_number)
-    if not user:
+async def authenticate_user(db: AsyncSession, phone_number: str, password: str) -> User:
+    user = await get_user_by_phone(db, phone_number)
+    if not user or not user.hashed_password:
         return None
-    if not security.verify_password(password, user.hashed_password):
+    # Hand the connection back to the pool while bcrypt runs
+    await db.commit()
+    try:
+        verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise_busy()
+    if not verified:
         return None
+    if new_hash:
+        # The stored hash predates the current policy; upgrade it while we have the password
+        user.hashed_password = new_hash
+        await db.commit()
+        await db.refresh(user)
     return user
 
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new user
     """
     # Check if user already exists
-    user = get_user_by_phone(db, user_data.phone_number)
+    user = await get_user_by_phone(db, user_data.phone_number)
     if user:
         raise HTTPException(
             status_code=400,
@@ -68,19 +99,19 @@ def register(
         )
     
     # Create new user
-    user = create_user(db, user_data)
+    user = await create_user(db, user_data)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     user_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = authenticate_user(db, user_data.phone_number, user_data.password)
+    user = await authenticate_user(db, user_data.phone_number, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -106,14 +137,14 @@ def login(
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,4 +159,16 @@ def login_for_access_token(
         "access_token": access_token,
         "token_type": "bearer",
         "user": user
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Revoke the bearer token used for this request, in every worker
+    """
+    await token_revocations.revoke(db, token)
+    return {"message": "Logged out"}
@@ -1,4 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_id
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.schemas.device import DeviceSyncResult
+from app.services.device_ingestion import MSGPACK_CONTENT_TYPES, ingest_readings, read_msgpack, read_ndjson
 
 router = APIRouter()
 
@@ -6,6 +13,26 @@ router = APIRouter()
 def get_device_data():
     return {"message": "Device data endpoint - coming soon"}
 
-@router.post("/sync")
-def sync_device_data():
-    return {"message": "Device data synced successfully"}
\ No newline at end of file
+@router.post("/sync", response_model=DeviceSyncResult)
+async def sync_device_data(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload a device's buffered readings in one batch: NDJSON, one reading per
+    line, or a compact MessagePack batch (Content-Type: application/msgpack).
+    Each reading's values are checked against its measurement_type; readings
+    already uploaded from the same device are updated, not duplicated.
+    """
+    body = bytearray()
+    async for piece in request.stream():
+        body += piece
+        if len(body) > settings.DEVICE_SYNC_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Device batches are limited to {settings.DEVICE_SYNC_MAX_BYTES} bytes"
+            )
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    rows = read_msgpack(bytes(body)) if content_type in MSGPACK_CONTENT_TYPES else read_ndjson(bytes(body))
+    return await ingest_readings(db, rows, user_id, settings.DEVICE_SYNC_CHUNK_SIZE)
@@ -0,0 +1,72 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import authenticate_stream, get_stream_user_id
+from app.core.config import settings
+from app.services.event_hub import event_hub
+
+router = APIRouter()
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    user_id: int = Depends(get_stream_user_id)
+):
+    """Server-sent events: reminder due/changes and points earned for a user"""
+    subscription = event_hub.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not (subscription.closed and subscription.queue.empty()):
+                event = await subscription.get(timeout=settings.EVENT_HEARTBEAT_SECONDS)
+                if event is not None:
+                    yield format_sse(event)
+                elif await request.is_disconnected():
+                    break
+                else:
+                    yield ": ping\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    access_token: Optional[str] = Query(None)
+):
+    """WebSocket variant of /stream carrying the same events as JSON messages"""
+    token = access_token
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer":
+        token = credentials
+    try:
+        user = await authenticate_stream(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscription = event_hub.subscribe(user.id)
+    try:
+        while not (subscription.closed and subscription.queue.empty()):
+            event = await subscription.get(timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            await websocket.send_json(event if event is not None else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
@@ -1,114 +1,106 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import get_current_user_id
+from app.core.database import get_async_db
+from app.core.pagination import decode_cursor, paginated_response, select_fields
 from app.models.medicine import Medicine, MedicineLog
-from app.schemas.medicine import MedicineResponse, MedicineCreate, MedicineLogResponse
+from app.schemas.medicine import MedicineResponse, MedicineLogResponse
+from app.services.event_hub import event_hub
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[MedicineResponse])
-def get_medicines(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_medicines(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
-    Retrieve medicines (mock data for now)
+    Retrieve medicines in id order, one keyset page at a time.
+    Large text (instructions) is only returned when named in ``fields``
+    (comma separated); the next page's cursor is in the X-Next-Cursor header.
     """
-    # Mock data for testing
-    mock_medicines = [
-        {
-            "id": 1,
-            "user_id": 1,
-            "name": "Paracetamol",
-            "dosage": "500mg",
-            "frequency": "morning,afternoon,night",
-            "instructions": "Take after meals",
-            "start_date": "2024-09-20T00:00:00Z",
-            "end_date": None,
-            "morning_time": "08:00",
-            "afternoon_time": "14:00",
-            "night_time": "21:00",
-            "is_active": True,
-            "prescribed_by": "Dr. Sharma",
-            "prescription_date": "2024-09-20T00:00:00Z",
-            "created_at": "2024-09-20T00:00:00Z",
-            "updated_at": None
-        },
-        {
-            "id": 2,
-            "user_id": 1,
-            "name": "Vitamin D",
-            "dosage": "1000 IU",
-            "frequency": "morning",
-            "instructions": "Take with water",
-            "start_date": "2024-09-20T00:00:00Z",
-            "end_date": None,
-            "morning_time": "08:00",
-            "afternoon_time": None,
-            "night_time": None,
-            "is_active": True,
-            "prescribed_by": "Dr. Patel",
-            "prescription_date": "2024-09-20T00:00:00Z",
-            "created_at": "2024-09-20T00:00:00Z",
-            "updated_at": None
-        }
-    ]
-    
-    return mock_medicines
+    columns = select_fields(Medicine, fields)
+    query = (
+        select(*columns)
+        .where(Medicine.user_id == user_id)
+        .order_by(Medicine.id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_id, = decode_cursor(cursor, 1)
+        query = query.where(Medicine.id > last_id)
+
+    rows = (await db.execute(query)).all()
+    return paginated_response(rows, columns, lambda row: (row.id,), limit)
 
 
 @router.get("/logs", response_model=List[MedicineLogResponse])
-def get_medicine_logs(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_medicine_logs(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
-    Retrieve medicine logs (mock data for now)
+    Retrieve medicine logs, newest scheduled first, one keyset page at a time.
+    Large text (notes, side_effects) is only returned when named in ``fields``
+    (comma separated); the next page's cursor is in the X-Next-Cursor header.
     """
-    # Mock data for testing
-    mock_logs = [
-        {
-            "id": 1,
-            "user_id": 1,
-            "medicine_id": 1,
-            "scheduled_time": "2024-09-24T08:00:00Z",
-            "taken_time": "2024-09-24T08:15:00Z",
-            "status": "taken",
-            "notes": None,
-            "side_effects": None,
-            "created_at": "2024-09-24T08:15:00Z"
-        },
-        {
-            "id": 2,
-            "user_id": 1,
-            "medicine_id": 2,
-            "scheduled_time": "2024-09-24T08:00:00Z",
-            "taken_time": "2024-09-24T08:10:00Z",
-            "status": "taken",
-            "notes": None,
-            "side_effects": None,
-            "created_at": "2024-09-24T08:10:00Z"
-        }
-    ]
-    
-    return mock_logs
+    columns = select_fields(MedicineLog, fields, always=("id", "scheduled_time"))
+    query = (
+        select(*columns)
+        .where(MedicineLog.user_id == user_id)
+        .order_by(MedicineLog.scheduled_time.desc(), MedicineLog.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        scheduled_time, last_id = decode_cursor(cursor, 2)
+        try:
+            scheduled_time = datetime.fromisoformat(scheduled_time)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(MedicineLog.scheduled_time, MedicineLog.id) < tuple_(scheduled_time, last_id)
+        )
+
+    rows = (await db.execute(query)).all()
+    return paginated_response(
+        rows, columns, lambda row: (row.scheduled_time.isoformat(), row.id), limit
+    )
 
 
 @router.post("/log", response_model=dict)
-def log_medicine_taken(
+async def log_medicine_taken(
     medicine_id: int,
     status: str = "taken",
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Log medicine as taken/missed
     """
+    owned = await db.scalar(select(Medicine.id).where(Medicine.id == medicine_id, Medicine.user_id == user_id))
+    if owned is None:
+        raise HTTPException(status_code=404, detail="Medicine not found")
+    points_earned = 10 if status == "taken" else 0
+    if points_earned:
+        event_hub.publish(user_id, {
+            "type": "points_earned",
+            "points": points_earned,
+            "activity_type": "medicine_taken",
+            "medicine_id": medicine_id
+        })
+    
     return {
         "message": f"Medicine {medicine_id} logged as {status}",
-        "points_earned": 10 if status == "taken" else 0
+        "points_earned": points_earned
     }
\ No newline at end of file
@@ -1,27 +1,295 @@
-from fastapi import APIRouter
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_user_id
+from app.core.crypto import DecryptionError, cipher
+from app.core.database import get_async_db
+from app.core.pagination import decode_cursor, paginated_response
+from app.core.security import generate_qr_access_key, qr_key_hash
+from app.models.change_log import record_changes
+from app.models.health_record import HealthRecord
+from app.schemas.health_record import (
+    HealthRecordCreate, HealthRecordDetail, HealthRecordSummary, HealthRecordUnlock, HealthRecordUpdate
+)
+from app.services.qr_codes import render_qr
+from app.services.record_cache import record_cache
+from app.services.record_search import search_records
 
 router = APIRouter()
 
-@router.get("/")
-def get_health_records():
-    return [
-        {
-            "id": 1,
-            "consultation_date": "2024-09-20T00:00:00Z",
-            "doctor_name": "Dr. Sharma",
-            "consultation_type": "General Consultation",
-            "is_locked": False,
-            "summary": "Patient reported mild headache and fatigue. Prescribed rest and hydration."
-        },
-        {
-            "id": 2,
-            "consultation_date": "2024-09-15T00:00:00Z",
-            "doctor_name": "Dr. Patel",
-            "consultation_type": "Follow-up",
-            "is_locked": True
-        }
-    ]
-
-@router.post("/{record_id}/unlock")
-def unlock_record(record_id: int, qr_key: str):
-    return {"message": f"Record {record_id} unlocked successfully"}
\ No newline at end of file
+# What a records list entry carries; no encrypted column and no QR key
+LIST_COLUMNS = [HealthRecord.__table__.c[name] for name in HealthRecordSummary.model_fields]
+
+# Detail fields and the encrypted column behind each
+ENCRYPTED_FIELDS = {
+    "transcript": HealthRecord.encrypted_transcript,
+    "audio_url": HealthRecord.encrypted_audio_url,
+    "summary": HealthRecord.encrypted_summary,
+    "prescription": HealthRecord.encrypted_prescription,
+}
+
+# Small and read on every card expansion; transcripts are too big to be worth keeping
+CACHED_FIELDS = {"summary"}
+
+
+def parse_fields(fields: str) -> List[str]:
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = set(requested) - set(ENCRYPTED_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+async def get_owned_record(db: AsyncSession, record_id: int, user_id: int) -> HealthRecord:
+    record = await db.get(HealthRecord, record_id)
+    if record is None or record.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Health record not found")
+    return record
+
+
+async def encrypt_fields(values: dict) -> dict:
+    """Encrypted column values for the plain-text fields present in values"""
+    names = [name for name in ENCRYPTED_FIELDS if name in values]
+    encrypted = await cipher().aencrypt_many([values[name] for name in names])
+    return {ENCRYPTED_FIELDS[name].key: value for name, value in zip(names, encrypted)}
+
+
+async def decrypt_fields(db: AsyncSession, row, requested: List[str], user_id: int) -> dict:
+    """A record's metadata row with the requested fields decrypted, cached ones first"""
+    detail = dict(row._mapping)
+    missing = []
+    for name in requested:
+        value = record_cache.get(user_id, row.id, name) if name in CACHED_FIELDS else None
+        if value is None:
+            missing.append(name)
+        else:
+            detail[name] = value
+    if missing:
+        encrypted = (await db.execute(
+            select(*(ENCRYPTED_FIELDS[name] for name in missing)).where(HealthRecord.id == row.id)
+        )).one()
+        try:
+            decrypted = await cipher().adecrypt_many(list(encrypted))
+        except DecryptionError:
+            raise HTTPException(status_code=500, detail="Record could not be decrypted")
+        for name, value in zip(missing, decrypted):
+            detail[name] = value
+            if name in CACHED_FIELDS and value is not None:
+                record_cache.put(user_id, row.id, name, value)
+    return detail
+
+
+def issue_qr_key(record: HealthRecord) -> str:
+    """Give a record a new single-use QR key, replacing any outstanding one"""
+    key = generate_qr_access_key()
+    record.qr_key_hash = qr_key_hash(key)
+    return key
+
+
+@router.get("/", response_model=List[HealthRecordSummary])
+async def get_health_records(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Retrieve record metadata, newest consultation first, one keyset page at a
+    time. Nothing is decrypted here; expand a record through GET /records/{id}.
+    """
+    query = (
+        select(*LIST_COLUMNS)
+        .where(HealthRecord.user_id == user_id)
+        .order_by(HealthRecord.consultation_date.desc(), HealthRecord.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, 2)
+        try:
+            last_date = datetime.fromisoformat(last_date)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(HealthRecord.consultation_date, HealthRecord.id) < tuple_(last_date, last_id)
+        )
+
+    rows = (await db.execute(query)).all()
+    return paginated_response(
+        rows, LIST_COLUMNS, lambda row: (row.consultation_date.isoformat(), row.id), limit
+    )
+
+
+@router.get("/search", response_model=List[HealthRecordSummary])
+async def search_health_records(
+    q: str = Query(..., min_length=1, max_length=200),
+    clinic: Optional[str] = Query(None, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Search record diagnoses and symptoms, in English, Hindi, Tamil or Telugu,
+    best match first. Every word has to match; the last may be the start of
+    one. ?clinic= narrows the results to one clinic's records.
+    """
+    offset = 0
+    if cursor:
+        offset, = decode_cursor(cursor, 1)
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = await search_records(db, q, LIST_COLUMNS, user_id=user_id, clinic=clinic, offset=offset, limit=limit)
+    # The score comes after LIST_COLUMNS in each row, so it is left out of the response;
+    # the cursor is the next page's position in the ranking
+    return paginated_response(rows, LIST_COLUMNS, lambda row: (offset + limit,), limit)
+
+
+@router.post("/", response_model=HealthRecordSummary)
+async def create_health_record(
+    record_in: HealthRecordCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Store a consultation record; its content is encrypted and it starts
+    locked. POST /{record_id}/qr issues the key that unlocks it.
+    """
+    values = record_in.model_dump()
+    record = HealthRecord(
+        user_id=user_id,
+        **{name: value for name, value in values.items() if name not in ENCRYPTED_FIELDS},
+        **await encrypt_fields(values),
+    )
+    db.add(record)
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+@router.get("/{record_id}", response_model=HealthRecordDetail)
+async def get_health_record(
+    record_id: int,
+    fields: str = Query("summary", description="Comma separated: transcript, audio_url, summary, prescription"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    One record with the requested fields decrypted. Only those columns are
+    loaded; summaries come from a short-lived per-user cache when possible.
+    """
+    requested = parse_fields(fields)
+    row = (await db.execute(
+        select(*LIST_COLUMNS).where(HealthRecord.id == record_id, HealthRecord.user_id == user_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Health record not found")
+    if requested and row.is_locked:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Record is locked")
+    return await decrypt_fields(db, row, requested, user_id)
+
+
+@router.put("/{record_id}", response_model=HealthRecordSummary)
+async def update_health_record(
+    record_id: int,
+    record_in: HealthRecordUpdate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """Update a record's metadata or content"""
+    record = await get_owned_record(db, record_id, user_id)
+    values = record_in.model_dump(exclude_unset=True)
+    for name, value in values.items():
+        if name not in ENCRYPTED_FIELDS:
+            setattr(record, name, value)
+    for name, value in (await encrypt_fields(values)).items():
+        setattr(record, name, value)
+    await db.commit()
+    record_cache.evict_record(user_id, record_id)
+    await db.refresh(record)
+    return record
+
+
+@router.post("/{record_id}/lock", response_model=HealthRecordSummary)
+async def lock_health_record(
+    record_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Lock a record again; any outstanding QR key stops working, and
+    POST /{record_id}/qr issues a new one to read it
+    """
+    record = await get_owned_record(db, record_id, user_id)
+    record.is_locked = True
+    record.qr_key_hash = None
+    await db.commit()
+    record_cache.evict_record(user_id, record_id)
+    await db.refresh(record)
+    return record
+
+
+@router.post("/{record_id}/qr", response_class=Response)
+async def reissue_qr_code(
+    record_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Issue a record's QR key and return its code as a PNG; any earlier key
+    stops working. Only a hash of the key is stored, so this response is the
+    one chance to see the code: if it is lost, issue another.
+    """
+    record = await get_owned_record(db, record_id, user_id)
+    key = issue_qr_key(record)
+    await db.commit()
+    png = await run_in_threadpool(render_qr, key)
+    return Response(png, media_type="image/png", headers={"Cache-Control": "no-store"})
+
+
+@router.post("/{record_id}/unlock", response_model=HealthRecordDetail)
+async def unlock_record(
+    record_id: int,
+    unlock_in: HealthRecordUnlock,
+    fields: str = Query("summary", description="Comma separated: transcript, audio_url, summary, prescription"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Unlock a record with its QR key and return it with the requested fields
+    decrypted. The key is found through its hash and consumed by the same
+    conditional UPDATE, so of two scans of one code only one succeeds.
+    """
+    requested = parse_fields(fields)
+    result = await db.execute(
+        update(HealthRecord)
+        .where(
+            HealthRecord.qr_key_hash == qr_key_hash(unlock_in.qr_key),
+            HealthRecord.id == record_id,
+            HealthRecord.user_id == user_id,
+        )
+        .values(
+            qr_key_hash=None,
+            is_locked=False,
+            unlock_count=func.coalesce(HealthRecord.unlock_count, 0) + 1,
+            last_unlocked_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        await get_owned_record(db, record_id, user_id)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or already used QR key")
+    await db.run_sync(lambda session: record_changes(session.connection(), [
+        {"user_id": user_id, "table_name": HealthRecord.__tablename__, "row_id": record_id, "operation": "upsert"}
+    ]))
+    await db.commit()
+
+    row = (await db.execute(select(*LIST_COLUMNS).where(HealthRecord.id == record_id))).one()
+    return await decrypt_fields(db, row, requested, user_id)
@@ -1,25 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Annotated, Dict, List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, Field
 
-from app.core.database import get_db
+from app.api.deps import get_current_user_id
+from app.core.database import get_async_db
+from app.core.responses import model_response
 from app.models.reminder import Reminder
 from app.models.medicine import Medicine
+from app.services.event_hub import event_hub
+from app.services.reminder_scheduler import reminder_scheduler
 
 router = APIRouter()
 
+# 24-hour HH:MM; anything else would never reach the scheduler's timing wheel
+TIME_PATTERN = r"^([01]\d|2[0-3]):[0-5]\d$"
+
 # Pydantic models
 class ReminderCreate(BaseModel):
     medicine_id: int
-    time: str  # HH:MM format
+    time: str = Field(..., pattern=TIME_PATTERN)
     frequency: str  # morning, afternoon, night
     enabled: bool = True
     sound: bool = True
     snooze_minutes: int = 10
 
 class ReminderUpdate(BaseModel):
-    time: str = None
+    time: str = Field(None, pattern=TIME_PATTERN)
     frequency: str = None
     enabled: bool = None
     sound: bool = None
@@ -40,69 +50,90 @@ class ReminderResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ReminderCreateOperation(ReminderCreate):
+    op: Literal["create"]
+
+class ReminderUpdateOperation(ReminderUpdate):
+    op: Literal["update"]
+    reminder_id: int
+
+class ReminderToggleOperation(BaseModel):
+    op: Literal["toggle"]
+    reminder_id: int
+
+class ReminderDeleteOperation(BaseModel):
+    op: Literal["delete"]
+    reminder_id: int
+
+ReminderOperation = Annotated[
+    Union[ReminderCreateOperation, ReminderUpdateOperation, ReminderToggleOperation, ReminderDeleteOperation],
+    Field(discriminator="op")
+]
+
+class ReminderBatch(BaseModel):
+    operations: List[ReminderOperation] = Field(..., max_length=200)
+
+class ReminderBatchResult(BaseModel):
+    index: int
+    op: str
+    status_code: int
+    detail: Optional[str] = None
+    reminder_id: Optional[int] = None
+    reminder: Optional[ReminderResponse] = None
+
+def publish_reminder_change(reminder: Reminder):
+    """Push the saved reminder to the user's live connections"""
+    event_hub.publish(reminder.user_id, {
+        "type": "reminder_updated",
+        "reminder": ReminderResponse.model_validate(reminder).model_dump()
+    })
+
+async def commit_reminders(db: AsyncSession, frequency: str):
+    """Commit, reporting a clash with an existing reminder's slot as a 400"""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Reminder already exists for {frequency}"
+        )
+
+def select_reminders():
+    """Reminder query with the medicine joined in, so responses need no extra lookups"""
+    return select(Reminder).options(joinedload(Reminder.medicine))
+
 @router.get("/", response_model=List[ReminderResponse])
 async def get_reminders(
     medicine_id: int = None,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all reminders for a user, optionally filtered by medicine"""
-    query = db.query(Reminder).filter(Reminder.user_id == user_id)
+    query = select_reminders().where(Reminder.user_id == user_id)
     
     if medicine_id:
-        query = query.filter(Reminder.medicine_id == medicine_id)
+        query = query.where(Reminder.medicine_id == medicine_id)
     
-    reminders = query.all()
-    
-    # Enrich with medicine details
-    result = []
-    for reminder in reminders:
-        medicine = db.query(Medicine).filter(Medicine.id == reminder.medicine_id).first()
-        reminder_dict = {
-            "id": reminder.id,
-            "medicine_id": reminder.medicine_id,
-            "user_id": reminder.user_id,
-            "time": reminder.time,
-            "frequency": reminder.frequency,
-            "enabled": reminder.enabled,
-            "sound": reminder.sound,
-            "snooze_minutes": reminder.snooze_minutes,
-            "medicine_name": medicine.name if medicine else None,
-            "medicine_dosage": medicine.dosage if medicine else None
-        }
-        result.append(ReminderResponse(**reminder_dict))
-    
-    return result
+    reminders = (await db.execute(query)).scalars().all()
+    return model_response(List[ReminderResponse], reminders, from_attributes=True)
 
 @router.post("/", response_model=ReminderResponse)
 async def create_reminder(
     reminder: ReminderCreate,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new medicine reminder"""
     
     # Verify medicine exists
-    medicine = db.query(Medicine).filter(Medicine.id == reminder.medicine_id).first()
-    if not medicine:
+    medicine = await db.get(Medicine, reminder.medicine_id)
+    if not medicine or medicine.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found"
         )
     
-    # Check if reminder already exists for this medicine and frequency
-    existing = db.query(Reminder).filter(
-        Reminder.medicine_id == reminder.medicine_id,
-        Reminder.user_id == user_id,
-        Reminder.frequency == reminder.frequency
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Reminder already exists for {reminder.frequency}"
-        )
-    
     # Create new reminder
     db_reminder = Reminder(
         medicine_id=reminder.medicine_id,
@@ -114,35 +145,160 @@ async def create_reminder(
         snooze_minutes=reminder.snooze_minutes
     )
     
+    db_reminder.medicine = medicine
+    
     db.add(db_reminder)
-    db.commit()
-    db.refresh(db_reminder)
+    # One reminder per medicine and frequency is enforced by a unique constraint
+    await commit_reminders(db, db_reminder.frequency)
+    reminder_scheduler.upsert(db_reminder)
+    publish_reminder_change(db_reminder)
     
-    # Return with medicine details
-    return ReminderResponse(
-        id=db_reminder.id,
-        medicine_id=db_reminder.medicine_id,
-        user_id=db_reminder.user_id,
-        time=db_reminder.time,
-        frequency=db_reminder.frequency,
-        enabled=db_reminder.enabled,
-        sound=db_reminder.sound,
-        snooze_minutes=db_reminder.snooze_minutes,
-        medicine_name=medicine.name,
-        medicine_dosage=medicine.dosage
-    )
+    return db_reminder
+
+@router.post("/batch", response_model=List[ReminderBatchResult])
+async def batch_reminders(
+    batch: ReminderBatch,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Apply a list of create/update/toggle/delete operations in one transaction"""
+    operations = batch.operations
+    medicine_ids = {op.medicine_id for op in operations if op.op == "create"}
+    reminder_ids = {op.reminder_id for op in operations if op.op != "create"}
+    
+    # Everything the operations refer to is validated with set-based queries up front
+    reminders: Dict[int, Reminder] = {}
+    if reminder_ids:
+        reminders = {
+            reminder.id: reminder
+            for reminder in (await db.execute(
+                select_reminders().where(
+                    Reminder.id.in_(reminder_ids),
+                    Reminder.user_id == user_id
+                )
+            )).scalars()
+        }
+    
+    medicines: Dict[int, Medicine] = {}
+    if medicine_ids:
+        medicines = {
+            medicine.id: medicine
+            for medicine in (await db.execute(
+                select(Medicine).where(Medicine.id.in_(medicine_ids), Medicine.user_id == user_id)
+            )).scalars()
+        }
+    
+    # (medicine_id, frequency) pairs already taken by this user, for every
+    # medicine a create names or an updated reminder belongs to, so moving a
+    # reminder onto a frequency held by one outside the batch is caught here
+    slot_medicines = medicine_ids | {reminder.medicine_id for reminder in reminders.values()}
+    slots = set()
+    if slot_medicines:
+        slots = set((await db.execute(
+            select(Reminder.medicine_id, Reminder.frequency).where(
+                Reminder.user_id == user_id,
+                Reminder.medicine_id.in_(slot_medicines)
+            )
+        )).tuples())
+    
+    # Each result gets a snapshot of its reminder as that operation left it,
+    # so a reminder touched twice isn't reported in its final state both times;
+    # created reminders are snapshotted once the commit has given them an id
+    results = []
+    created: List[Tuple[dict, Reminder]] = []
+    changed: Dict[int, Reminder] = {}
+    deleted_ids = set()
+    for index, operation in enumerate(operations):
+        result = {"index": index, "op": operation.op, "status_code": status.HTTP_200_OK}
+        results.append(result)
+        
+        if operation.op == "create":
+            slot = (operation.medicine_id, operation.frequency)
+            medicine = medicines.get(operation.medicine_id)
+            if not medicine:
+                result.update(status_code=status.HTTP_404_NOT_FOUND, detail="Medicine not found")
+            elif slot in slots:
+                result.update(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Reminder already exists for {operation.frequency}"
+                )
+            else:
+                db_reminder = Reminder(user_id=user_id, **operation.model_dump(exclude={"op"}))
+                db_reminder.medicine = medicine
+                db.add(db_reminder)
+                slots.add(slot)
+                created.append((result, db_reminder))
+            continue
+        
+        reminder = reminders.get(operation.reminder_id)
+        result["reminder_id"] = operation.reminder_id
+        if not reminder:
+            result.update(status_code=status.HTTP_404_NOT_FOUND, detail="Reminder not found")
+        elif operation.op == "update":
+            changes = operation.model_dump(exclude_unset=True, exclude={"op", "reminder_id"})
+            frequency = changes.get("frequency", reminder.frequency)
+            slot = (reminder.medicine_id, frequency)
+            if frequency != reminder.frequency and slot in slots:
+                result.update(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Reminder already exists for {frequency}"
+                )
+                continue
+            slots.discard((reminder.medicine_id, reminder.frequency))
+            for field, value in changes.items():
+                setattr(reminder, field, value)
+            slots.add(slot)
+            result["reminder"] = ReminderResponse.model_validate(reminder)
+            changed[reminder.id] = reminder
+        elif operation.op == "toggle":
+            reminder.enabled = not reminder.enabled
+            result["reminder"] = ReminderResponse.model_validate(reminder)
+            changed[reminder.id] = reminder
+        else:
+            await db.delete(reminder)
+            # Flush now so a later create may reuse the slot (inserts run before deletes)
+            await db.flush()
+            del reminders[reminder.id]
+            changed.pop(reminder.id, None)
+            slots.discard((reminder.medicine_id, reminder.frequency))
+            deleted_ids.add(reminder.id)
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request took one of the slots after validation
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Reminders changed concurrently, retry the batch"
+        )
+    
+    for result, reminder in created:
+        result["reminder_id"] = reminder.id
+        result["reminder"] = ReminderResponse.model_validate(reminder)
+        changed[reminder.id] = reminder
+    for reminder in changed.values():
+        reminder_scheduler.upsert(reminder)
+        publish_reminder_change(reminder)
+    for reminder_id in deleted_ids:
+        reminder_scheduler.remove(reminder_id)
+        event_hub.publish(user_id, {"type": "reminder_deleted", "reminder_id": reminder_id})
+    
+    return model_response(List[ReminderBatchResult], results, from_attributes=True)
 
 @router.get("/{reminder_id}", response_model=ReminderResponse)
 async def get_reminder(
     reminder_id: int,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific reminder"""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == user_id
-    ).first()
+    reminder = (await db.execute(
+        select_reminders().where(
+            Reminder.id == reminder_id,
+            Reminder.user_id == user_id
+        )
+    )).scalars().first()
     
     if not reminder:
         raise HTTPException(
@@ -150,33 +306,22 @@ async def get_reminder(
             detail="Reminder not found"
         )
     
-    medicine = db.query(Medicine).filter(Medicine.id == reminder.medicine_id).first()
-    
-    return ReminderResponse(
-        id=reminder.id,
-        medicine_id=reminder.medicine_id,
-        user_id=reminder.user_id,
-        time=reminder.time,
-        frequency=reminder.frequency,
-        enabled=reminder.enabled,
-        sound=reminder.sound,
-        snooze_minutes=reminder.snooze_minutes,
-        medicine_name=medicine.name if medicine else None,
-        medicine_dosage=medicine.dosage if medicine else None
-    )
+    return reminder
 
 @router.put("/{reminder_id}", response_model=ReminderResponse)
 async def update_reminder(
     reminder_id: int,
     reminder_update: ReminderUpdate,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a reminder"""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == user_id
-    ).first()
+    reminder = (await db.execute(
+        select_reminders().where(
+            Reminder.id == reminder_id,
+            Reminder.user_id == user_id
+        )
+    )).scalars().first()
     
     if not reminder:
         raise HTTPException(
@@ -189,35 +334,25 @@ async def update_reminder(
     for field, value in update_data.items():
         setattr(reminder, field, value)
     
-    db.commit()
-    db.refresh(reminder)
+    await commit_reminders(db, reminder.frequency)
+    reminder_scheduler.upsert(reminder)
+    publish_reminder_change(reminder)
     
-    medicine = db.query(Medicine).filter(Medicine.id == reminder.medicine_id).first()
-    
-    return ReminderResponse(
-        id=reminder.id,
-        medicine_id=reminder.medicine_id,
-        user_id=reminder.user_id,
-        time=reminder.time,
-        frequency=reminder.frequency,
-        enabled=reminder.enabled,
-        sound=reminder.sound,
-        snooze_minutes=reminder.snooze_minutes,
-        medicine_name=medicine.name if medicine else None,
-        medicine_dosage=medicine.dosage if medicine else None
-    )
+    return reminder
 
 @router.delete("/{reminder_id}")
 async def delete_reminder(
     reminder_id: int,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a reminder"""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == user_id
-    ).first()
+    reminder = (await db.execute(
+        select(Reminder).where(
+            Reminder.id == reminder_id,
+            Reminder.user_id == user_id
+        )
+    )).scalars().first()
     
     if not reminder:
         raise HTTPException(
@@ -225,22 +360,26 @@ async def delete_reminder(
             detail="Reminder not found"
         )
     
-    db.delete(reminder)
-    db.commit()
+    await db.delete(reminder)
+    await db.commit()
+    reminder_scheduler.remove(reminder_id)
+    event_hub.publish(user_id, {"type": "reminder_deleted", "reminder_id": reminder_id})
     
     return {"message": "Reminder deleted successfully"}
 
 @router.post("/{reminder_id}/toggle")
 async def toggle_reminder(
     reminder_id: int,
-    user_id: int = 1,  # Default user for demo
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle reminder enabled/disabled status"""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == user_id
-    ).first()
+    reminder = (await db.execute(
+        select_reminders().where(
+            Reminder.id == reminder_id,
+            Reminder.user_id == user_id
+        )
+    )).scalars().first()
     
     if not reminder:
         raise HTTPException(
@@ -249,7 +388,9 @@ async def toggle_reminder(
         )
     
     reminder.enabled = not reminder.enabled
-    db.commit()
+    await db.commit()
+    reminder_scheduler.upsert(reminder)
+    publish_reminder_change(reminder)
     
     return {
         "message": f"Reminder {'enabled' if reminder.enabled else 'disabled'}",
@@ -0,0 +1,248 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_id
+from app.core.config import settings
+from app.core.database import Base, get_async_db
+from app.core.responses import ORJSONResponse, model_response
+from app.models.change_log import ChangeLog, SYNCED_TABLES, SYNC_EXCLUDED_COLUMNS
+from app.models.device_data import DeviceData
+from app.models.idempotency_key import IdempotencyKey
+from app.models.medicine import Medicine, MedicineLog
+from app.models.symptom_log import SymptomLog
+from app.schemas.device import DeviceMeasurement
+from app.schemas.sync import SyncChanges, SyncPush, SyncPushResult
+from app.services.device_ingestion import describe, reading_key, upsert_readings
+
+router = APIRouter()
+
+SYNCED_MODELS = {
+    mapper.class_.__tablename__: mapper.class_
+    for mapper in Base.registry.mappers
+    if mapper.class_.__tablename__ in SYNCED_TABLES
+}
+
+MUTATION_MODELS = {
+    "medicine_log": MedicineLog,
+    "symptom_log": SymptomLog,
+    "device_reading": DeviceData,
+}
+
+
+def synced_columns(model):
+    excluded = SYNC_EXCLUDED_COLUMNS.get(model.__tablename__, set())
+    return [column for column in model.__table__.columns if column.name not in excluded]
+
+
+@router.get("/changes", response_model=SyncChanges)
+async def get_changes(
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Rows created, updated or deleted since ``cursor``, at most ``limit`` change entries per page.
+    Pass the returned cursor back until ``has_more`` is false. Changes from the
+    last CHANGE_LOG_SETTLE_SECONDS may be sent again on the next call.
+    """
+    entries = (await db.execute(
+        select(ChangeLog.id, ChangeLog.table_name, ChangeLog.row_id, ChangeLog.operation, ChangeLog.changed_at)
+        .where(ChangeLog.user_id == user_id, ChangeLog.id > cursor)
+        .order_by(ChangeLog.id)
+        .limit(limit + 1)
+    )).all()
+    
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    
+    # An entry's id is assigned when it is written but it only shows up once
+    # its transaction commits, so concurrent writers can make one appear
+    # behind ids a client has already passed. The cursor only moves past
+    # entries older than CHANGE_LOG_SETTLE_SECONDS; newer ones are sent again
+    # on the next call, which clients apply idempotently.
+    settled = datetime.now(timezone.utc) - timedelta(seconds=settings.CHANGE_LOG_SETTLE_SECONDS)
+    next_cursor = cursor
+    for entry in entries:
+        # SQLite hands datetimes back without their zone; they are stored in UTC
+        changed_at = entry.changed_at if entry.changed_at.tzinfo else entry.changed_at.replace(tzinfo=timezone.utc)
+        if changed_at > settled:
+            break
+        next_cursor = entry.id
+    # A page cut short by unsettled entries is picked up on the next sync instead
+    has_more = has_more and next_cursor == entries[-1].id
+    
+    # Several changes to one row in a page collapse to the latest
+    latest = {}
+    for entry in entries:
+        latest[(entry.table_name, entry.row_id)] = entry.operation
+    
+    upserted = defaultdict(list)
+    deleted = defaultdict(list)
+    for (table_name, row_id), operation in latest.items():
+        (deleted if operation == "delete" else upserted)[table_name].append(row_id)
+    
+    # One query per table; rows deleted after this page's entries come back as later tombstones
+    changes = {}
+    for table_name, row_ids in upserted.items():
+        model = SYNCED_MODELS[table_name]
+        rows = await db.execute(
+            select(*synced_columns(model)).where(model.id.in_(row_ids), model.user_id == user_id)
+        )
+        changes[table_name] = [dict(row._mapping) for row in rows]
+    
+    # Rows are plain column mappings; orjson encodes their datetimes directly
+    return ORJSONResponse({
+        "cursor": next_cursor,
+        "has_more": has_more,
+        "changes": changes,
+        "deleted": dict(deleted)
+    })
+
+
+
+def mutation_row(mutation, user_id: int) -> dict:
+    row = mutation.model_dump(exclude={"key", "type"})
+    row["user_id"] = user_id
+    if mutation.type == "symptom_log":
+        row["logged_at"] = row["logged_at"] or datetime.now(timezone.utc)
+    elif mutation.type == "device_reading":
+        # The checks POST /devices/sync makes: values against the measurement's
+        # schema, a default unit, the time in UTC and the same JSON encoding, so
+        # a re-pushed reading matches its earlier copy
+        row = {**DeviceMeasurement.model_validate(row).model_dump(), "user_id": user_id}
+        row["values"] = orjson.dumps(row["values"]).decode()
+    return row
+
+
+async def store_device_readings(db: AsyncSession, rows: List[dict]) -> Tuple[List[Optional[int]], Set[int]]:
+    """
+    Row ids for pushed device readings, in order, and the ids of those that
+    were already stored unchanged. Readings that name their device upsert
+    like POST /devices/sync does; None where the reading is already stored for
+    another user.
+    """
+    keyed = {reading_key(row["device_id"], row["measurement_type"], row["measured_at"]): row for row in rows if row["device_id"]}
+    written, unchanged = await upsert_readings(db, list(keyed.values())) if keyed else ({}, {})
+    stored = {**written, **unchanged}
+    plain = [row for row in rows if not row["device_id"]]
+    plain_ids = iter((await db.execute(
+        insert(DeviceData).returning(DeviceData.id, sort_by_parameter_order=True), plain
+    )).scalars().all() if plain else [])
+    return [
+        stored.get(reading_key(row["device_id"], row["measurement_type"], row["measured_at"]))
+        if row["device_id"] else next(plain_ids)
+        for row in rows
+    ], set(unchanged.values())
+
+
+@router.post("/push", response_model=List[SyncPushResult])
+async def push_mutations(
+    push: SyncPush,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Apply an ordered batch of offline mutations in one transaction.
+    Each mutation carries a client-generated key; keys already applied are
+    reported with their original row instead of being inserted twice.
+    """
+    mutations = push.mutations
+    results = [
+        {"index": index, "key": mutation.key, "status_code": status.HTTP_201_CREATED}
+        for index, mutation in enumerate(mutations)
+    ]
+    
+    applied = {
+        row.key: row
+        for row in (await db.execute(
+            select(IdempotencyKey.key, IdempotencyKey.table_name, IdempotencyKey.row_id).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key.in_({mutation.key for mutation in mutations})
+            )
+        ))
+    }
+    
+    medicine_ids = {mutation.medicine_id for mutation in mutations if mutation.type == "medicine_log"}
+    own_medicines = set()
+    if medicine_ids:
+        own_medicines = set((await db.execute(
+            select(Medicine.id).where(Medicine.id.in_(medicine_ids), Medicine.user_id == user_id)
+        )).scalars())
+    
+    # Pending inserts per mutation type, as (result, row) pairs in request order
+    pending = defaultdict(list)
+    seen_keys = {}
+    for result, mutation in zip(results, mutations):
+        if mutation.key in applied:
+            previous = applied[mutation.key]
+            result.update(
+                status_code=status.HTTP_200_OK,
+                detail="Already applied",
+                table=previous.table_name,
+                row_id=previous.row_id
+            )
+        elif mutation.key in seen_keys:
+            result.update(status_code=status.HTTP_200_OK, detail="Duplicate key in batch")
+            seen_keys[mutation.key].append(result)
+        elif mutation.type == "medicine_log" and mutation.medicine_id not in own_medicines:
+            result.update(status_code=status.HTTP_404_NOT_FOUND, detail="Medicine not found")
+        else:
+            try:
+                row = mutation_row(mutation, user_id)
+            except ValidationError as exc:
+                result.update(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=describe(exc))
+                continue
+            seen_keys[mutation.key] = [result]
+            pending[mutation.type].append((result, row))
+    
+    keys = []
+    changes = []
+    for mutation_type, items in pending.items():
+        model = MUTATION_MODELS[mutation_type]
+        unchanged = set()
+        if mutation_type == "device_reading":
+            row_ids, unchanged = await store_device_readings(db, [row for _, row in items])
+        else:
+            row_ids = (await db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [row for _, row in items]
+            )).scalars().all()
+        for (result, _), row_id in zip(items, row_ids):
+            if row_id is None:
+                for same_key in seen_keys[result["key"]]:
+                    same_key.update(status_code=status.HTTP_409_CONFLICT, detail="Reading is already stored for another account")
+                continue
+            for same_key in seen_keys[result["key"]]:
+                same_key.update(table=model.__tablename__, row_id=row_id)
+            keys.append({"user_id": user_id, "key": result["key"], "table_name": model.__tablename__, "row_id": row_id})
+            if row_id in unchanged:
+                # Clients already have it; nothing to replay
+                for same_key in seen_keys[result["key"]]:
+                    same_key.update(status_code=status.HTTP_200_OK, detail="Reading already stored")
+                continue
+            changes.append({"user_id": user_id, "table_name": model.__tablename__, "row_id": row_id, "operation": "upsert"})
+    
+    if keys:
+        # Core inserts bypass the flush listener, so the change log is written here
+        if changes:
+            await db.execute(insert(ChangeLog), changes)
+        try:
+            await db.execute(insert(IdempotencyKey), keys)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another upload with the same keys is in progress, retry"
+            )
+    
+    return model_response(List[SyncPushResult], results)
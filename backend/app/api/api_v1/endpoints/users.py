@@ -1,7 +1,90 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_current_user_id, user_cache
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.passwords import password_hasher
+from app.models.user import User
+from app.schemas.auth import BulkRegistrationResult
+from app.schemas.user import UserResponse, UserUpdate
+from app.services.bulk_registration import guess_format, read_rows, register_users
+from app.services.history_export import EXPORT_FORMATS, export_filename
 
 router = APIRouter()
 
-@router.get("/me")
-def get_current_user():
-    return {"message": "User endpoint - coming soon"}
\ No newline at end of file
+
+@router.get("/me", response_model=UserResponse)
+async def read_current_user(current_user: UserResponse = Depends(get_current_user)):
+    """The signed-in user's profile"""
+    return current_user
+
+
+@router.put("/me", response_model=UserResponse)
+async def update_current_user(
+    user_update: UserUpdate,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update the signed-in user's profile"""
+    user = await db.get(User, current_user.id)
+    for field, value in user_update.model_dump(exclude_unset=True).items():
+        setattr(user, field, value)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
+    return user
+
+
+@router.post("/bulk", response_model=BulkRegistrationResult)
+async def bulk_register_users(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Register patients from a CSV or NDJSON upload of registration rows; rows
+    that fail are reported individually and the rest are still imported
+    """
+    format = format or guess_format(file.filename, file.content_type)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a .csv or .ndjson file, or pass ?format="
+        )
+    return await register_users(read_rows(file.file, format), db, password_hasher)
+
+
+@router.get("/{user_id}/export")
+async def export_history(
+    user_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|zip)$"),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    A patient's complete history, unlocked health records decrypted (locked
+    ones without their content), as one NDJSON file or ZIP to hand over to a
+    doctor. Rows are streamed from the database a batch at a time, so memory
+    use does not grow with the history.
+    """
+    if user_id != current_user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only export your own history")
+    export, media_type, extension = EXPORT_FORMATS[format]
+
+    async def body():
+        # A session of its own that lives exactly as long as the stream
+        async with AsyncSessionLocal() as db:
+            async for piece in export(db, user_id):
+                if piece:
+                    yield piece
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(user_id, extension)}"',
+            "Cache-Control": "no-store",
+        },
+    )
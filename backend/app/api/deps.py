@@ -0,0 +1,123 @@
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False)
+
+
+class UserCache:
+    """Recently authenticated users, so a cached token needs no DB hit either"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[UserResponse]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: UserResponse) -> None:
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Call after any change to the user's row"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+async def authenticate(token: Optional[str], db: AsyncSession) -> UserResponse:
+    """The active user a bearer token belongs to"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    subject = security.verify_token(token) if token else None
+    try:
+        user_id = int(subject)
+    except (TypeError, ValueError):
+        raise credentials_exception
+
+    user = user_cache.get(user_id)
+    if user is None:
+        db_user = await db.get(User, user_id)
+        if db_user is None:
+            raise credentials_exception
+        user = UserResponse.model_validate(db_user)
+        user_cache.put(user)
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserResponse:
+    return await authenticate(token, db)
+
+
+async def get_current_user_id(current_user: UserResponse = Depends(get_current_user)) -> int:
+    return current_user.id
+
+
+async def authenticate_stream(token: Optional[str]) -> UserResponse:
+    """
+    authenticate() for long-lived connections, on a session of its own so no
+    pooled connection is held for the lifetime of the stream
+    """
+    async with AsyncSessionLocal() as db:
+        return await authenticate(token, db)
+
+
+async def get_stream_user_id(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None)
+) -> int:
+    """Like get_current_user_id, but EventSource cannot set headers so the token may come as ?access_token="""
+    return (await authenticate_stream(header_token or access_token)).id
+
+
+async def require_monitoring_token(token: Optional[str] = Depends(optional_oauth2_scheme)) -> None:
+    """
+    Guard for operational telemetry: the caller sends MONITORING_TOKEN as its
+    bearer token, not a user's. With no token configured the endpoints don't exist.
+    """
+    if not settings.MONITORING_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if token is None or not hmac.compare_digest(token.encode(), settings.MONITORING_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
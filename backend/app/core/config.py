@@ -7,9 +7,39 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = "healthaxis-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # Verified tokens and current-user rows cached per process
+    TOKEN_CACHE_SIZE: int = 10000
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 300
+    # How often each worker picks up tokens revoked (logged out) by the others
+    TOKEN_REVOCATION_POLL_SECONDS: float = 5.0
+    # Password hashing; hashes made under an older policy are upgraded on login
+    PASSWORD_SCHEMES: List[str] = ["bcrypt"]  # first is used for new hashes
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2  # processes; 0 hashes on the request threadpool
+    PASSWORD_HASH_MAX_PENDING: int = 16  # queued + running; logins beyond this get a 503
+    PASSWORD_HASH_NICENESS: int = 5
     
     # Database
     DATABASE_URL: str = "sqlite:///./healthaxis.db"
+    # On startup: "check" the schema revision, "migrate" to the latest, or "skip"
+    DATABASE_STARTUP_MODE: str = "check"
+    # Connection pool (per engine; not used for in-memory SQLite)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DATABASE_POOL_PRE_PING: bool = True
+    # Pragmas applied to every new SQLite connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    # Read replicas for GET/HEAD requests (a JSON list in the environment);
+    # writes and read-after-write stay on the primary
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: int = 5  # reads go to the primary this long after a client's write
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10.0
+    REPLICA_HEALTH_CHECK_TIMEOUT: float = 2.0
     
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
@@ -29,7 +59,7 @@ class Settings(BaseSettings):
         "work-2-isuyteossihjpgfx.prod-runtime.all-hands.dev"
     ]
 
-    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @field_validator("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS", "PASSWORD_SCHEMES", "ENCRYPTION_OLD_KEYS", mode="before")
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
@@ -42,8 +72,51 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_REDIRECT_URI: str = ""
     
-    # Encryption
+    # Encryption; a 32-byte secret or a Fernet key is used directly, anything else is run through HKDF
     ENCRYPTION_KEY: str = "your-32-byte-encryption-key-here!!"
+    # Keys being rotated out, still tried for decryption (a JSON list in the environment)
+    ENCRYPTION_OLD_KEYS: List[str] = []
+    REENCRYPTION_ROWS_PER_SECOND: float = 200.0  # throttle for python -m app.reencrypt
+    REENCRYPTION_BATCH_SIZE: int = 100
+    CRYPTO_THREADS: int = 4  # threads for batch encrypt/decrypt
+    CRYPTO_BATCH_CHUNK: int = 64  # values per thread task; smaller batches run inline
+    # Encrypted attachment store (consultation audio, scans, photos)
+    ATTACHMENT_STORE_DIR: str = "./attachments"
+    # Blob keys derive from this and it is never rotated; empty uses ENCRYPTION_KEY,
+    # so set it to that value before rotating ENCRYPTION_KEY
+    ATTACHMENT_KEY: str = ""
+    ATTACHMENT_CHUNK_SIZE: int = 64 * 1024  # plaintext bytes per encrypted chunk, for new blobs
+    ATTACHMENT_MAX_BYTES: int = 200 * 1024 * 1024
+    # Decrypted record summaries kept per process, per user
+    RECORD_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    RECORD_CACHE_TTL_SECONDS: int = 300
+    
+    # Delta sync: the cursor only passes change log entries this old, so one
+    # committed late by a slower transaction is not skipped; longer than any write transaction
+    CHANGE_LOG_SETTLE_SECONDS: float = 60.0
+    
+    # Device reading batches (POST /devices/sync)
+    DEVICE_SYNC_MAX_BYTES: int = 8 * 1024 * 1024
+    DEVICE_SYNC_CHUNK_SIZE: int = 1000  # readings per upsert statement and transaction
+    
+    # Reminders
+    REMINDER_TIMEZONE: str = "Asia/Kolkata"
+    REMINDER_SCHEDULER_ENABLED: bool = True
+    REMINDER_SCHEDULER_MAX_CATCHUP_MINUTES: int = 15
+    REMINDER_SCHEDULER_POLL_SECONDS: float = 5.0  # how often each worker picks up reminder changes made elsewhere
+    
+    # Real-time events
+    EVENT_QUEUE_SIZE: int = 64
+    EVENT_HEARTBEAT_SECONDS: float = 25.0
+    
+    # Bearer token for the pool and password hashing telemetry under /health;
+    # empty turns those endpoints off
+    MONITORING_TOKEN: str = ""
+    
+    # Response encoding
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes
+    BROTLI_QUALITY: int = 5
+    GZIP_LEVEL: int = 6
     
     # AI/ML
     OPENAI_API_KEY: str = ""
@@ -0,0 +1,141 @@
+import asyncio
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# cryptography is imported when the first cipher is built
+
+# Stored values are "v1:" + a Fernet token. Fernet tokens are already
+# urlsafe base64, so there is no second encoding. Values without a prefix are
+# the old format: base64 of the token.
+FORMAT_PREFIX = "v1:"
+
+
+class DecryptionError(ValueError):
+    """Ciphertext that is corrupt or was made with an unknown key"""
+
+
+def fernet_key(secret: str) -> bytes:
+    """
+    The Fernet key for ENCRYPTION_KEY. A 32-byte secret is used as is, as it
+    always was; a Fernet key passes through; anything else goes through HKDF,
+    so every process derives the same key.
+    """
+    raw = secret.encode()
+    if len(raw) == 32:
+        return base64.urlsafe_b64encode(raw)
+    try:
+        if len(base64.urlsafe_b64decode(raw)) == 32:
+            return raw
+    except ValueError:
+        pass
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    derived = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"healthaxis health records").derive(raw)
+    return base64.urlsafe_b64encode(derived)
+
+
+class RecordCipher:
+    """
+    Encrypts health-record fields with the current key and decrypts with it or
+    any of the old ones, so a key can be rotated while the service runs. Build
+    it through get_cipher.
+    """
+
+    def __init__(self, secret: str, old_secrets: Tuple[str, ...] = ()):
+        from cryptography.fernet import Fernet, MultiFernet
+
+        key = fernet_key(secret)
+        self.fingerprint = hashlib.sha256(key).hexdigest()[:16]
+        self.fernet = Fernet(key)
+        self.decrypter = MultiFernet([self.fernet] + [Fernet(fernet_key(old)) for old in old_secrets])
+
+    def encrypt(self, plaintext: Optional[str]) -> Optional[str]:
+        if plaintext is None:
+            return None
+        return FORMAT_PREFIX + self.fernet.encrypt(plaintext.encode()).decode()
+
+    def decrypt(self, stored: Optional[str]) -> Optional[str]:
+        if stored is None:
+            return None
+        from cryptography.fernet import InvalidToken
+
+        try:
+            if stored.startswith(FORMAT_PREFIX):
+                token = stored[len(FORMAT_PREFIX):].encode()
+            else:
+                token = base64.urlsafe_b64decode(stored.encode())
+            return self.decrypter.decrypt(token).decode()
+        except (InvalidToken, ValueError) as exc:
+            raise DecryptionError("Could not decrypt value") from exc
+
+    def rotate(self, stored: Optional[str]) -> Optional[str]:
+        """stored re-encrypted in the current format and key, or None if it already is"""
+        if stored is None:
+            return None
+        if stored.startswith(FORMAT_PREFIX):
+            from cryptography.fernet import InvalidToken
+
+            try:
+                self.fernet.decrypt(stored[len(FORMAT_PREFIX):].encode())
+                return None
+            except InvalidToken:
+                pass
+        return self.encrypt(self.decrypt(stored))
+
+    def _encrypt_chunk(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        return [self.encrypt(value) for value in values]
+
+    def _decrypt_chunk(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        return [self.decrypt(value) for value in values]
+
+    def _map(self, fn, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        size = settings.CRYPTO_BATCH_CHUNK
+        if len(values) <= size:
+            return fn(values)
+        chunks = [values[i:i + size] for i in range(0, len(values), size)]
+        return list(chain.from_iterable(crypto_executor().map(fn, chunks)))
+
+    async def _amap(self, fn, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        size = settings.CRYPTO_BATCH_CHUNK
+        loop = asyncio.get_running_loop()
+        chunks = [values[i:i + size] for i in range(0, len(values), size)]
+        results = await asyncio.gather(*(loop.run_in_executor(crypto_executor(), fn, chunk) for chunk in chunks))
+        return list(chain.from_iterable(results))
+
+    def encrypt_many(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """encrypt() over a batch, split across the crypto thread pool"""
+        return self._map(self._encrypt_chunk, values)
+
+    def decrypt_many(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """decrypt() over a batch, split across the crypto thread pool"""
+        return self._map(self._decrypt_chunk, values)
+
+    async def aencrypt_many(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """encrypt_many() for async code; the event loop never runs the cipher"""
+        return await self._amap(self._encrypt_chunk, values)
+
+    async def adecrypt_many(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """decrypt_many() for async code; the event loop never runs the cipher"""
+        return await self._amap(self._decrypt_chunk, values)
+
+
+@lru_cache(maxsize=8)
+def get_cipher(secret: str, old_secrets: Tuple[str, ...] = ()) -> RecordCipher:
+    return RecordCipher(secret, old_secrets)
+
+
+def cipher() -> RecordCipher:
+    """The cipher for the configured ENCRYPTION_KEY and ENCRYPTION_OLD_KEYS"""
+    return get_cipher(settings.ENCRYPTION_KEY, tuple(settings.ENCRYPTION_OLD_KEYS))
+
+
+@lru_cache(maxsize=None)
+def crypto_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.CRYPTO_THREADS, thread_name_prefix="crypto")
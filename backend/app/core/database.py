@@ -1,16 +1,254 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.sql import Delete, Insert, Update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+logger = logging.getLogger(__name__)
+
+# Async drivers used when the configured URL names the sync driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching asyncio driver"""
+    url = make_url(database_url)
+    async_driver = ASYNC_DRIVERS.get(url.drivername)
+    if async_driver:
+        url = url.set(drivername=async_driver)
+    return url.render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Checkout wait telemetry; the pool itself reports size and connections in use"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def begin(self):
+        with self.lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def end(self, started: float, timed_out: bool = False):
+        waited = time.perf_counter() - started
+        with self.lock:
+            self.waiting -= 1
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class MeteredPoolMixin:
+    """Times every checkout, including the wait for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = self.metrics.begin()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.end(started, timed_out)
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, MeteredPoolMixin):
+        metrics = pool.metrics
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            waiting=metrics.waiting,
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_seconds_total=round(metrics.wait_seconds_total, 6),
+            wait_seconds_max=round(metrics.wait_seconds_max, 6),
+        )
+    return status
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the writer; busy_timeout makes writers queue instead of failing"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+
+def engine_options(database_url: str, async_: bool = False) -> dict:
+    """Pool settings for a URL; in-memory SQLite keeps SQLAlchemy's single-connection pool"""
+    url = make_url(database_url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        if not async_:
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=MeteredAsyncQueuePool if async_ else MeteredQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+    return options
+
+
+def build_engine(database_url: str):
+    engine = create_engine(database_url, **engine_options(database_url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+def build_async_engine(database_url: str):
+    async_url = get_async_database_url(database_url)
+    engine = create_async_engine(async_url, **engine_options(async_url, async_=True))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
+
+async_engine = build_async_engine(settings.DATABASE_URL)
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = build_async_engine(url)
+        self.healthy = True
+
+
+class ReplicaSet:
+    """Read replicas, used round-robin while they pass a periodic health check"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self):
+        """A healthy replica's sync engine, or None to fall back to the primary"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)].engine.sync_engine
+
+    async def ping(self, replica: Replica) -> None:
+        async with replica.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(self.ping(replica), settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+            except Exception as exc:
+                if replica.healthy:
+                    logger.warning("Replica %s failed its health check: %r", replica.engine.url, exc)
+                replica.healthy = False
+            else:
+                if not replica.healthy:
+                    logger.info("Replica %s is healthy again", replica.engine.url)
+                replica.healthy = True
+
+    async def run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_set = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
+# Set by ReadReplicaMiddleware for safe requests from clients that have not
+# just written; sessions opened anywhere else always use the primary.
+replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to a replica when the request allows it. Flushes and DML go to
+    the primary, and once a session has written, its later reads do too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["wrote"] = True
+        elif replica_reads.get() and not self.info.get("wrote"):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = replica_set.choose() or async_engine.sync_engine
+            return replica
+        return async_engine.sync_engine
+
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -19,4 +257,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,200 @@
+import gzip
+import time
+from typing import Optional
+
+import brotli
+import msgpack
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+
+from app.core.config import settings
+from app.core.database import replica_reads
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "application/msgpack", "text/")
+
+
+def qvalue(params: str) -> float:
+    """The q weight from the parameters of one Accept-* list element; 1 if absent, 0 if malformed"""
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(max(float(value.strip()), 0.0), 1.0)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepted_codings(accept_encoding: str) -> set:
+    """Content codings from an Accept-Encoding header, minus any refused with q=0"""
+    codings = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding and qvalue(params) > 0:
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def accepted_media_types(accept: str) -> dict:
+    """Media range -> q weight from an Accept header; a range listed twice keeps its highest"""
+    ranges = {}
+    for part in accept.split(","):
+        media_range, _, params = part.strip().partition(";")
+        media_range = media_range.strip().lower()
+        if media_range:
+            ranges[media_range] = max(ranges.get(media_range, 0.0), qvalue(params))
+    return ranges
+
+
+class CompleteBodyMiddleware:
+    """
+    Base for middlewares that rewrite whole response bodies.
+
+    Only responses sent as a single body message are rewritten; streaming
+    responses such as the SSE event stream pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def negotiate(self, request_headers: Headers) -> Optional[str]:
+        raise NotImplementedError
+
+    def rewrite(self, choice: str, headers: MutableHeaders, body: bytes) -> bytes:
+        raise NotImplementedError
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        choice = self.negotiate(Headers(scope=scope))
+        if choice is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                headers = MutableHeaders(raw=start["headers"])
+                body = self.rewrite(choice, headers, message.get("body", b""))
+                headers["content-length"] = str(len(body))
+                message = {"type": "http.response.body", "body": body}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class MessagePackMiddleware(CompleteBodyMiddleware):
+    """Re-encode JSON responses as MessagePack for clients that ask for it in Accept"""
+
+    def negotiate(self, request_headers: Headers) -> Optional[str]:
+        # MessagePack only when named outright with q > 0, and weighted no lower
+        # than JSON (or the wildcard JSON would be served under)
+        ranges = accepted_media_types(request_headers.get("accept", ""))
+        msgpack_q = max(ranges.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+        json_q = next(
+            (ranges[media_range] for media_range in ("application/json", "application/*", "*/*") if media_range in ranges),
+            0.0,
+        )
+        if msgpack_q > 0 and msgpack_q >= json_q:
+            return "msgpack"
+        return None
+
+    def rewrite(self, choice: str, headers: MutableHeaders, body: bytes) -> bytes:
+        headers.add_vary_header("Accept")
+        if not headers.get("content-type", "").startswith("application/json") or not body:
+            return body
+        headers["content-type"] = "application/msgpack"
+        return msgpack.packb(orjson.loads(body))
+
+
+class CompressionMiddleware(CompleteBodyMiddleware):
+    """Brotli or gzip response compression above a size threshold"""
+
+    def __init__(self, app, minimum_size: int = 500):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+
+    def negotiate(self, request_headers: Headers) -> Optional[str]:
+        codings = accepted_codings(request_headers.get("accept-encoding", ""))
+        if "br" in codings:
+            return "br"
+        if "gzip" in codings:
+            return "gzip"
+        return None
+
+    def rewrite(self, choice: str, headers: MutableHeaders, body: bytes) -> bytes:
+        headers.add_vary_header("Accept-Encoding")
+        content_type = headers.get("content-type", "")
+        if (
+            len(body) < self.minimum_size
+            or "content-encoding" in headers
+            or "content-range" in headers
+            or not content_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+        ):
+            return body
+        headers["content-encoding"] = choice
+        if choice == "br":
+            return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
+
+
+class ReadReplicaMiddleware:
+    """
+    Lets safe requests read from the replicas. A successful write hands the
+    client a short-lived cookie that keeps its reads on the primary until the
+    replicas have caught up with what it just wrote.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    STICKY_COOKIE = "read_primary_until"
+
+    def __init__(self, app, sticky_seconds: int = 5):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    def is_sticky(self, request_headers: Headers) -> bool:
+        until = cookie_parser(request_headers.get("cookie", "")).get(self.STICKY_COOKIE)
+        try:
+            return float(until) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in self.SAFE_METHODS:
+            token = replica_reads.set(not self.is_sticky(Headers(scope=scope)))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                replica_reads.reset(token)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + self.sticky_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.STICKY_COOKIE}={until}; Max-Age={self.sticky_seconds}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
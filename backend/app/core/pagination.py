@@ -0,0 +1,57 @@
+import base64
+from typing import Any, List, Optional
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import inspect
+
+from app.core.responses import ORJSONResponse
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor holding the sort key of the last row on a page"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def select_fields(model, fields: Optional[str], always: tuple = ("id",)) -> list:
+    """
+    Columns for a sparse fieldset given as ``fields=a,b,c``. When omitted, every
+    column except the model's deferred (large text) ones is selected.
+    Columns in ``always`` are selected regardless because paging depends on them.
+    """
+    columns = model.__table__.columns
+    if not fields:
+        return [
+            prop.columns[0] for prop in inspect(model).column_attrs
+            if not prop.deferred
+        ]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(columns.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [column for column in columns if column.name in requested or column.name in always]
+
+
+def paginated_response(rows, columns, cursor_of, limit: int) -> ORJSONResponse:
+    """Serialize a page of column rows, advertising the next page's cursor in a header"""
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*cursor_of(rows[-1]))
+    names = [column.name for column in columns]
+    return ORJSONResponse([dict(zip(names, row)) for row in rows], headers=headers)
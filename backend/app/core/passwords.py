@@ -0,0 +1,132 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core import security
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hashes already queued; the caller should retry later"""
+
+
+def _init_worker(niceness: int) -> None:
+    # Hashing is never latency critical compared with serving requests
+    if niceness:
+        os.nice(niceness)
+    security.get_password_context()
+
+
+def _hash(password: str) -> str:
+    return security.get_password_hash(password)
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    return [security.get_password_hash(password) for password in passwords]
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(matches, new hash when the stored one no longer meets the policy)"""
+    return security.get_password_context().verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool, so a login storm cannot take the
+    request threadpool or the event loop with it. At most max_pending hashes
+    may be queued or running; beyond that calls fail fast with PasswordHasherBusy.
+    With workers=0 hashing runs on the request threadpool instead.
+    """
+
+    def __init__(self, workers: int, max_pending: int, niceness: int = 0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.niceness = niceness
+        self.pending = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self.workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.niceness,),
+            )
+            # Spawn the workers now rather than on the first login
+            for _ in range(self.workers):
+                self._executor.submit(os.getpid)
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def _run(self, fn: Callable, *args):
+        self._admit()
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def hash_many(self, passwords: List[str], chunk_size: int = 8) -> List[str]:
+        """
+        Hashes for a bulk import, in chunks spread over the workers. At most one
+        chunk per worker is pending at a time, so sign-ins still get through, and
+        a full queue is waited out rather than failed.
+        """
+        slots = asyncio.Semaphore(max(self.workers, 1))
+
+        async def run_chunk(chunk: List[str]) -> List[str]:
+            async with slots:
+                while True:
+                    try:
+                        return await self._run(_hash_many, chunk)
+                    except PasswordHasherBusy:
+                        await asyncio.sleep(0.1)
+
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        hashed = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        return [password_hash for chunk in hashed for password_hash in chunk]
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(_verify_and_update, password, hashed_password)
+
+    def status(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+    settings.PASSWORD_HASH_NICENESS,
+)
@@ -0,0 +1,40 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: orjson encodes datetimes, UUIDs and dataclasses natively"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def model_response(
+    response_type,
+    content: Any,
+    status_code: int = 200,
+    from_attributes: bool = False,
+    validated: bool = False
+) -> Response:
+    """
+    Validate ``content`` against ``response_type`` once and serialize it straight
+    to JSON bytes in pydantic-core.
+
+    Returning the Response skips FastAPI's own response_model pass, so keep
+    ``response_model`` on the route for the OpenAPI schema only. Pass
+    ``from_attributes=True`` for ORM rows, or ``validated=True`` for models that
+    were already built, which are then only dumped.
+    """
+    adapter = type_adapter(response_type)
+    if not validated:
+        content = adapter.validate_python(content, from_attributes=from_attributes)
+    return Response(adapter.dump_json(content), status_code=status_code, media_type="application/json")
@@ -0,0 +1,60 @@
+import os
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, "alembic")
+
+_REVISION = re.compile(r"^revision: str = '([^']+)'", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision: [^=]+= (.+)$", re.MULTILINE)
+
+
+def head_revision() -> str:
+    """
+    Latest migration revision, read from the version files' headers.
+    Importing alembic costs more than the rest of startup, so it is only
+    loaded when migrations actually run.
+    """
+    revisions, parents = set(), set()
+    versions_dir = os.path.join(MIGRATIONS_DIR, "versions")
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, name)) as f:
+            source = f.read()
+        revisions.add(_REVISION.search(source).group(1))
+        parents.update(re.findall(r"'([^']+)'", _DOWN_REVISION.search(source).group(1)))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+async def check_schema(engine) -> None:
+    """Fail fast when the database is not at the revision this code was written for"""
+    try:
+        async with engine.connect() as connection:
+            current = (await connection.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except DBAPIError:
+        current = None
+    head = head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}. "
+            "Run `python -m app.migrate` (or set DATABASE_STARTUP_MODE=migrate)."
+        )
+
+
+def upgrade_schema(revision: str = "head") -> None:
+    """Run the Alembic migrations against DATABASE_URL"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+    command.upgrade(config, revision)
@@ -1,14 +1,28 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
-from passlib.context import CryptContext
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 import base64
+import hashlib
 import os
+import threading
+import time
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose, passlib and cryptography are imported on first use to keep startup fast
+
+
+@lru_cache(maxsize=None)
+def get_password_context():
+    from passlib.context import CryptContext
+    # min_rounds makes hashes below the configured cost count as outdated too
+    return CryptContext(
+        schemes=settings.PASSWORD_SCHEMES,
+        deprecated="auto",
+        bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    )
 
 ALGORITHM = "HS256"
 
@@ -22,54 +36,145 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
 
-def verify_token(token: str) -> Union[str, None]:
+class TokenCache:
+    """
+    LRU of verified tokens keyed by the token's SHA-256, so a repeat request
+    skips the signature check. Entries are dropped once the token's exp passes.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            subject, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return subject
+
+    def put(self, key: bytes, subject: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (subject, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+# Hashes of revoked tokens mapped to their exp, kept until they would have
+# expired. Kept in step with the revoked_tokens table by
+# app.services.token_revocations, so every worker rejects them.
+revoked_tokens: Dict[bytes, float] = {}
+
+
+def token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def decode_token(token: str) -> Optional[dict]:
+    from jose import jwt
+
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
         )
-        return payload.get("sub")
     except jwt.JWTError:
         return None
 
 
-# Encryption for health records
-def get_encryption_key() -> bytes:
-    """Get or generate encryption key for health records"""
-    key = settings.ENCRYPTION_KEY.encode()
-    if len(key) != 32:
-        # Generate a proper 32-byte key
-        key = base64.urlsafe_b64encode(os.urandom(32))
-    return key
+def token_expiry(payload: Optional[dict]) -> Optional[float]:
+    """The exp of a decoded token; None if it has none, which no token we issue lacks"""
+    expires_at = payload.get("exp") if payload else None
+    return float(expires_at) if isinstance(expires_at, (int, float)) else None
 
 
+def verify_token(token: str) -> Union[str, None]:
+    key = token_key(token)
+    if key in revoked_tokens:
+        return None
+    subject = token_cache.get(key)
+    if subject is not None:
+        return subject
+
+    payload = decode_token(token)
+    expires_at = token_expiry(payload)
+    if expires_at is None or payload.get("sub") is None:
+        return None
+    token_cache.put(key, payload["sub"], expires_at)
+    return payload["sub"]
+
+
+def mark_revoked(key: bytes, expires_at: float) -> None:
+    """Reject the token with this key in this process until it expires"""
+    revoked_tokens[key] = expires_at
+    token_cache.discard(key)
+
+
+def revoke_token(token: str) -> Optional[Tuple[bytes, float]]:
+    """
+    Reject the token in this process from now on, e.g. after logout. Returns
+    (key, exp) to persist for the other workers, or None for a token that is
+    not valid anyway.
+    """
+    expires_at = token_expiry(decode_token(token))
+    if expires_at is None:
+        return None
+    now = time.time()
+    for key, revoked_until in list(revoked_tokens.items()):
+        if revoked_until <= now:
+            revoked_tokens.pop(key, None)
+    key = token_key(token)
+    mark_revoked(key, expires_at)
+    return key, expires_at
+
+
+# Encryption for health records, see app.core.crypto
 def encrypt_data(data: str) -> str:
     """Encrypt sensitive health data"""
-    f = Fernet(base64.urlsafe_b64encode(get_encryption_key()))
-    encrypted_data = f.encrypt(data.encode())
-    return base64.urlsafe_b64encode(encrypted_data).decode()
+    from app.core.crypto import cipher
+
+    return cipher().encrypt(data)
 
 
 def decrypt_data(encrypted_data: str) -> str:
     """Decrypt sensitive health data"""
-    f = Fernet(base64.urlsafe_b64encode(get_encryption_key()))
-    decoded_data = base64.urlsafe_b64decode(encrypted_data.encode())
-    decrypted_data = f.decrypt(decoded_data)
-    return decrypted_data.decode()
+    from app.core.crypto import cipher
+
+    return cipher().decrypt(encrypted_data)
 
 
 def generate_qr_access_key() -> str:
     """Generate a single-use QR access key"""
-    return base64.urlsafe_b64encode(os.urandom(32)).decode()[:32]
\ No newline at end of file
+    return base64.urlsafe_b64encode(os.urandom(32)).decode()[:32]
+
+
+def qr_key_hash(key: str) -> str:
+    """What is stored for a QR key; the key itself is random enough that a plain digest suffices"""
+    return hashlib.sha256(key.encode()).hexdigest()
\ No newline at end of file
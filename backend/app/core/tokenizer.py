@@ -0,0 +1,34 @@
+import re
+import unicodedata
+from typing import List
+
+# Search tokens for English, Hindi, Tamil and Telugu text.
+#
+# str.isalnum() and regex \w treat the vowel signs and viramas of Indic scripts
+# as punctuation, so a \w+ split breaks "बुखार" or "காய்ச்சல்" into pieces. A
+# token here is a run of word characters or Indic block characters, minus the
+# dandas, after NFKC normalisation and case folding. Joiners only change how a
+# conjunct is drawn and are dropped, and native digits become ASCII digits so
+# "१०२" and "102" match.
+INDIC_BLOCKS = "\u0900-\u0963\u0966-\u0dff"  # Devanagari to Malayalam, less the dandas
+TOKEN = re.compile(f"(?:[^\\W_]|[{INDIC_BLOCKS}])+")
+JOINERS = dict.fromkeys(map(ord, "\u200c\u200d\u00ad"))  # ZWNJ, ZWJ, soft hyphen
+
+# Zero of each Indic script's digits; the next nine code points are 1 to 9
+DIGIT_ZEROS = (0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6, 0x0C66, 0x0CE6, 0x0D66)
+NATIVE_DIGITS = {zero + value: str(value) for zero in DIGIT_ZEROS for value in range(10)}
+
+TRANSLATION = {**JOINERS, **NATIVE_DIGITS}
+
+MAX_TOKEN_LENGTH = 64
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).translate(TRANSLATION).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Search tokens of text, in order, duplicates kept"""
+    if not text:
+        return []
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN.findall(normalize(text))]
@@ -1,24 +1,63 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.responses import ORJSONResponse
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.middleware import CompressionMiddleware, MessagePackMiddleware, ReadReplicaMiddleware
+from app.core.database import engine, async_engine, AsyncSessionLocal, pool_status, replica_set
+from app.core.schema import check_schema, upgrade_schema
+from app.core.passwords import password_hasher
 from app.api.api_v1.api import api_router
+from app.api.deps import require_monitoring_token
+from app.services.attachment_store import attachment_secret
+from app.services.event_hub import publish_due_reminders
+from app.services.reminder_scheduler import reminder_scheduler
+from app.services.token_revocations import token_revocations
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Schema changes are applied by migrations, not on every boot
+    if settings.DATABASE_STARTUP_MODE == "migrate":
+        await asyncio.to_thread(upgrade_schema)
+    elif settings.DATABASE_STARTUP_MODE == "check":
+        await check_schema(async_engine)
+    # Fail before serving, not on the first attachment download, if a key
+    # rotation would change the attachment keys
+    attachment_secret()
+    
+    # Logouts from before this worker started, and from other workers as they happen
+    async with AsyncSessionLocal() as db:
+        await token_revocations.load(db)
+    token_revocations.start()
+    
+    replica_set.start()
+    password_hasher.start()
+    
+    if settings.REMINDER_SCHEDULER_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await reminder_scheduler.load(db)
+        reminder_scheduler.add_listener(publish_due_reminders)
+        reminder_scheduler.start()
+    
     yield
+    
+    await reminder_scheduler.stop()
+    await token_revocations.stop()
+    await replica_set.stop()
+    password_hasher.stop()
+    await async_engine.dispose()
 
 
 app = FastAPI(
     title="HEALTHAXIS API",
     description="Offline-first AI-powered community health ecosystem for rural India",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -30,6 +69,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 # Add trusted host middleware
@@ -38,6 +78,14 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Compact encodings for low-bandwidth clients; compression wraps the MessagePack re-encoding
+app.add_middleware(MessagePackMiddleware)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Route safe requests to read replicas when any are configured
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadReplicaMiddleware, sticky_seconds=settings.REPLICA_STICKY_SECONDS)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
@@ -55,6 +103,25 @@ async def health_check():
     return {"status": "healthy", "service": "healthaxis-api"}
 
 
+@app.get("/health/pool", dependencies=[Depends(require_monitoring_token)])
+async def pool_health():
+    """Connection pool usage and checkout wait times"""
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine),
+        "replicas": [
+            dict(pool_status(replica.engine), healthy=replica.healthy)
+            for replica in replica_set.replicas
+        ]
+    }
+
+
+@app.get("/health/passwords", dependencies=[Depends(require_monitoring_token)])
+async def password_hasher_health():
+    """Password hashing queue depth and how many sign-ins were turned away"""
+    return password_hasher.status()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,14 @@
+"""
+Upgrade the database to the latest migration, then exit.
+
+    cd backend
+    python -m app.migrate
+"""
+import logging
+
+from app.core.schema import upgrade_schema
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    upgrade_schema()
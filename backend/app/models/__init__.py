@@ -6,6 +6,12 @@ from .symptom_log import SymptomLog
 from .device_data import DeviceData
 from .health_points import HealthPoints
 from .reminder import Reminder
+from .change_log import ChangeLog
+from .idempotency_key import IdempotencyKey
+from .job_checkpoint import JobCheckpoint
+from .attachment import Attachment
+from .health_record_search import HealthRecordSearch
+from .revoked_token import RevokedToken
 
 __all__ = [
     "User",
@@ -16,5 +22,11 @@ __all__ = [
     "SymptomLog",
     "DeviceData",
     "HealthPoints",
-    "Reminder"
+    "Reminder",
+    "ChangeLog",
+    "IdempotencyKey",
+    "JobCheckpoint",
+    "Attachment",
+    "HealthRecordSearch",
+    "RevokedToken"
 ]
\ No newline at end of file
@@ -0,0 +1,80 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, event, insert
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+
+# Patient tables whose inserts, updates and deletes are replayed to offline clients
+SYNCED_TABLES = (
+    "medicines",
+    "medicine_logs",
+    "reminders",
+    "appointments",
+    "health_records",
+    "symptom_logs",
+    "device_data",
+    "health_points",
+)
+
+# Columns that never leave the server through sync
+SYNC_EXCLUDED_COLUMNS = {
+    "health_records": {
+        "encrypted_transcript",
+        "encrypted_audio_url",
+        "encrypted_summary",
+        "encrypted_prescription",
+        "qr_key_hash",
+    },
+}
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    # The id doubles as the client's sync cursor
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # "upsert", "delete"
+    
+    # Timestamps
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_change_log_user_id_id", "user_id", "id"),
+    )
+
+
+def change_log_entry(instance, operation: str) -> dict:
+    return {
+        "user_id": instance.user_id,
+        "table_name": instance.__tablename__,
+        "row_id": instance.id,
+        "operation": operation,
+    }
+
+
+def record_changes(connection, entries) -> None:
+    """Append change log entries for writes that bypass the ORM unit of work"""
+    if entries:
+        connection.execute(insert(ChangeLog), list(entries))
+
+
+@event.listens_for(Session, "after_flush")
+def track_changes(session, flush_context):
+    entries = []
+    for instance in session.new:
+        if getattr(instance, "__tablename__", None) in SYNCED_TABLES:
+            entries.append(change_log_entry(instance, "upsert"))
+    for instance in session.dirty:
+        if (
+            getattr(instance, "__tablename__", None) in SYNCED_TABLES
+            and session.is_modified(instance, include_collections=False)
+        ):
+            entries.append(change_log_entry(instance, "upsert"))
+    for instance in session.deleted:
+        if getattr(instance, "__tablename__", None) in SYNCED_TABLES:
+            entries.append(change_log_entry(instance, "delete"))
+    record_changes(session.connection(), entries)
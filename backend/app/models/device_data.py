@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Float, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -41,5 +41,13 @@ class DeviceData(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_device_data_user_id_measurement_type_measured_at", "user_id", "measurement_type", "measured_at"),
+        # A device reports each measurement once per instant; re-synced readings upsert onto it
+        UniqueConstraint(
+            "device_id", "measurement_type", "measured_at", name="uq_device_data_device_id_measurement_type_measured_at"
+        ),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="device_data")
\ No newline at end of file
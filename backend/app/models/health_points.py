@@ -9,7 +9,7 @@ class HealthPoints(Base):
     __tablename__ = "health_points"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Points details
     points = Column(Integer, nullable=False)
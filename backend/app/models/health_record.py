@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
@@ -19,16 +19,16 @@ class HealthRecord(Base):
     # Consultation type
     consultation_type = Column(String(50), nullable=False)  # "general", "follow-up", "emergency", etc.
     
-    # Encrypted content
-    encrypted_transcript = Column(Text)  # Encrypted full transcript
-    encrypted_audio_url = Column(String(500))  # Encrypted audio file path/URL
-    encrypted_summary = Column(Text)  # Encrypted AI-generated summary
+    # Encrypted content, deferred so list queries never load it
+    encrypted_transcript = deferred(Column(Text))  # Encrypted full transcript
+    encrypted_audio_url = deferred(Column(String(500)))  # Encrypted audio file path/URL
+    encrypted_summary = deferred(Column(Text))  # Encrypted AI-generated summary
     
     # Prescription
-    encrypted_prescription = Column(Text)  # Encrypted prescription details
+    encrypted_prescription = deferred(Column(Text))  # Encrypted prescription details
     
     # Digital Safe - QR Access
-    qr_access_key = Column(String(100))  # Single-use QR key for unlocking
+    qr_key_hash = Column(String(64), unique=True, index=True)  # SHA-256 of the single-use QR key
     is_locked = Column(Boolean, default=True)
     unlock_count = Column(Integer, default=0)
     last_unlocked_at = Column(DateTime(timezone=True))
@@ -37,12 +37,18 @@ class HealthRecord(Base):
     diagnosis = Column(Text)  # Non-encrypted basic diagnosis for search
     symptoms = Column(Text)  # Non-encrypted symptoms for analytics
     
-    # File attachments
+    # File attachments; superseded by attachment_files
     attachments = Column(Text)  # JSON array of file paths
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # The records list and history export read a user's records in this order
+        Index("ix_health_records_user_id_consultation_date_id", "user_id", "consultation_date", "id"),
+    )
     
     # Relationships
-    user = relationship("User", back_populates="health_records")
\ No newline at end of file
+    user = relationship("User", back_populates="health_records")
+    attachment_files = relationship("Attachment", back_populates="health_record")
\ No newline at end of file
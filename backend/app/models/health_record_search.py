@@ -0,0 +1,101 @@
+import hashlib
+from typing import Optional
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, delete, event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.tokenizer import tokenize
+
+# Record fields that are searchable; they are stored unencrypted for this
+SEARCHED_FIELDS = ("diagnosis", "symptoms")
+
+# A change to any of these re-indexes the record
+INDEXED_FIELDS = SEARCHED_FIELDS + ("clinic_name", "user_id")
+
+
+# Joins a scope to a word in a scoped term. The tokenizer never keeps it, and
+# it is not ASCII, so FTS5's ascii tokenizer doesn't split on it either.
+SCOPE_SEPARATOR = "\u00b7"
+
+
+class HealthRecordSearch(Base):
+    """
+    The search document for one health record. Every word is stored once per
+    scope the record can be searched in, as "U<user id>·word" and
+    "C<clinic key>·word", so a search reads only the postings of one patient
+    or one clinic however common the word is overall. The full-text index
+    over the terms is per database, see migration 0006: an FTS5 table kept in
+    step by triggers on SQLite, a generated tsvector column with a GIN index
+    on PostgreSQL.
+    """
+    __tablename__ = "health_record_search"
+
+    record_id = Column(Integer, ForeignKey("health_records.id"), primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    clinic_key = Column(String(16))
+
+    # Space-separated scoped terms from SEARCHED_FIELDS, repeats kept for ranking
+    terms = Column(Text, nullable=False)
+
+
+def clinic_key(clinic_name: Optional[str]) -> Optional[str]:
+    """Stable key for a clinic, so case and spacing differences in the name don't split it"""
+    tokens = tokenize(clinic_name or "")
+    if not tokens:
+        return None
+    return hashlib.blake2b(" ".join(tokens).encode(), digest_size=8).hexdigest()
+
+
+def user_scope(user_id: int) -> str:
+    return f"U{user_id}{SCOPE_SEPARATOR}"
+
+
+def clinic_scope(key: str) -> str:
+    return f"C{key}{SCOPE_SEPARATOR}"
+
+
+def search_entry(record_id: int, user_id: int, clinic_name: Optional[str], *texts: Optional[str]) -> dict:
+    key = clinic_key(clinic_name)
+    scopes = [user_scope(user_id)] + ([clinic_scope(key)] if key else [])
+    tokens = [token for text in texts for token in tokenize(text or "")]
+    return {
+        "record_id": record_id,
+        "user_id": user_id,
+        "clinic_key": key,
+        "terms": " ".join(scope + token for scope in scopes for token in tokens),
+    }
+
+
+def index_records(connection, entries) -> None:
+    """Replace the search documents for records written outside the ORM unit of work"""
+    entries = list(entries)
+    if entries:
+        connection.execute(
+            delete(HealthRecordSearch).where(HealthRecordSearch.record_id.in_([entry["record_id"] for entry in entries]))
+        )
+        connection.execute(insert(HealthRecordSearch), entries)
+
+
+def record_entry(record) -> dict:
+    return search_entry(record.id, record.user_id, record.clinic_name, *(getattr(record, name) for name in SEARCHED_FIELDS))
+
+
+@event.listens_for(Session, "after_flush")
+def track_search_documents(session, flush_context):
+    entries, removed = [], []
+    for instance in session.new:
+        if getattr(instance, "__tablename__", None) == "health_records":
+            entries.append(record_entry(instance))
+    for instance in session.dirty:
+        if getattr(instance, "__tablename__", None) == "health_records":
+            state = inspect(instance)
+            if any(state.attrs[name].history.has_changes() for name in INDEXED_FIELDS):
+                entries.append(record_entry(instance))
+    for instance in session.deleted:
+        if getattr(instance, "__tablename__", None) == "health_records":
+            removed.append(instance.id)
+    connection = session.connection()
+    if removed:
+        connection.execute(delete(HealthRecordSearch).where(HealthRecordSearch.record_id.in_(removed)))
+    index_records(connection, entries)
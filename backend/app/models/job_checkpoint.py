@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    # One row per resumable maintenance job
+    name = Column(String(100), primary_key=True)
+    
+    # Progress: rows up to last_id are done
+    last_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)  # rows examined
+    updated = Column(Integer, nullable=False, default=0)  # rows rewritten
+    total = Column(Integer)  # rows to examine when the run started
+    
+    # Job-specific marker of what the run is for, e.g. the target key
+    target = Column(String(100))
+    
+    # Timestamps
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, Float
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
@@ -14,7 +14,7 @@ class Medicine(Base):
     name = Column(String(200), nullable=False)
     dosage = Column(String(50), nullable=False)
     frequency = Column(String(50), nullable=False)  # "morning", "afternoon", "night", "twice_daily", etc.
-    instructions = Column(Text)
+    instructions = deferred(Column(Text))  # Large text, loaded on access
     
     # Schedule
     start_date = Column(DateTime(timezone=True), nullable=False)
@@ -36,6 +36,10 @@ class Medicine(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_medicines_user_id_id", "user_id", "id"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="medicines")
     logs = relationship("MedicineLog", back_populates="medicine")
@@ -47,20 +51,24 @@ class MedicineLog(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    medicine_id = Column(Integer, ForeignKey("medicines.id"), nullable=False)
+    medicine_id = Column(Integer, ForeignKey("medicines.id"), nullable=False, index=True)
     
     # Log details
     scheduled_time = Column(DateTime(timezone=True), nullable=False)
     taken_time = Column(DateTime(timezone=True))
     status = Column(String(20), nullable=False)  # "taken", "missed", "skipped"
     
-    # Additional info
-    notes = Column(Text)
-    side_effects = Column(Text)
+    # Additional info (large text, loaded on access)
+    notes = deferred(Column(Text))
+    side_effects = deferred(Column(Text))
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_medicine_logs_user_id_scheduled_time_id", "user_id", "scheduled_time", "id"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="medicine_logs")
     medicine = relationship("Medicine", back_populates="logs")
\ No newline at end of file
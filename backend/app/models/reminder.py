@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -7,7 +7,7 @@ class Reminder(Base):
     __tablename__ = "reminders"
     
     id = Column(Integer, primary_key=True, index=True)
-    medicine_id = Column(Integer, ForeignKey("medicines.id"), nullable=False)
+    medicine_id = Column(Integer, ForeignKey("medicines.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Reminder details
@@ -21,10 +21,23 @@ class Reminder(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # One reminder per medicine and time of day for a user
+        UniqueConstraint("user_id", "medicine_id", "frequency", name="uq_reminders_user_id_medicine_id_frequency"),
+    )
+    
     # Relationships
     medicine = relationship("Medicine", back_populates="reminders")
     user = relationship("User", back_populates="reminders")
     
+    @property
+    def medicine_name(self):
+        return self.medicine.name if self.medicine else None
+    
+    @property
+    def medicine_dosage(self):
+        return self.medicine.dosage if self.medicine else None
+    
     def to_dict(self):
         return {
             "id": str(self.id),
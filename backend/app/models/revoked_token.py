@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # Increasing, so workers can poll for revocations newer than the last they saw
+    id = Column(Integer, primary_key=True)
+    
+    # SHA-256 of the revoked token, hex
+    token_hash = Column(String(64), nullable=False)
+    
+    # The token's own exp; the row is useless, and purged, after it
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    # Timestamps
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("token_hash", name="uq_revoked_tokens_token_hash"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Float
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -39,5 +39,9 @@ class SymptomLog(Base):
     logged_at = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_symptom_logs_user_id_logged_at", "user_id", "logged_at"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="symptom_logs")
\ No newline at end of file
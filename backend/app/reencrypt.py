@@ -0,0 +1,77 @@
+"""
+Re-encrypt health records under the current ENCRYPTION_KEY after a key rotation.
+
+    cd backend
+    python -m app.reencrypt
+
+Rotate by setting ENCRYPTION_KEY to the new key and listing the previous one in
+ENCRYPTION_OLD_KEYS (e.g. ENCRYPTION_OLD_KEYS='["old key"]'), restarting the
+service, then running this while it serves traffic. Attachments are not
+re-encrypted: their keys come from ATTACHMENT_KEY, which has to be set to the
+old ENCRYPTION_KEY first if it was not already. Progress is checkpointed
+per batch; run it again to resume. Once it reports finished, the old key can
+be dropped from ENCRYPTION_OLD_KEYS.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.crypto import cipher
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.attachment import Attachment
+from app.models.job_checkpoint import JobCheckpoint
+from app.services.reencryption import JOB_NAME, ReencryptionJob
+
+logger = logging.getLogger("app.reencrypt")
+
+
+async def show_status():
+    async with AsyncSessionLocal() as db:
+        checkpoint = await db.get(JobCheckpoint, JOB_NAME)
+    await async_engine.dispose()
+    if checkpoint is None:
+        logger.info("No re-encryption has run yet")
+    elif checkpoint.target != cipher().fingerprint:
+        logger.info("The last run was for a different key; a new run starts from the beginning")
+    else:
+        state = "finished" if checkpoint.finished_at else f"stopped after id {checkpoint.last_id}"
+        logger.info(
+            "%s: %d/%s rows examined, %d rewritten, last progress %s",
+            state, checkpoint.processed, checkpoint.total, checkpoint.updated, checkpoint.updated_at,
+        )
+
+
+async def run(rows_per_second: float, batch_size: int, restart: bool):
+    job = ReencryptionJob(cipher(), rows_per_second, batch_size)
+    try:
+        async with AsyncSessionLocal() as db:
+            if not settings.ATTACHMENT_KEY and await db.scalar(select(Attachment.id).limit(1)) is not None:
+                # Dropping the old key afterwards would leave every stored attachment unreadable
+                logger.error("Attachments are keyed from ENCRYPTION_KEY; set ATTACHMENT_KEY to the old key before rotating")
+                sys.exit(1)
+            await job.run(db, restart=restart)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=settings.REENCRYPTION_ROWS_PER_SECOND, help="rows per second")
+    parser.add_argument("--batch-size", type=int, default=settings.REENCRYPTION_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--status", action="store_true", help="report progress and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        asyncio.run(show_status())
+    else:
+        asyncio.run(run(args.rate, args.batch_size, args.restart))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    main()
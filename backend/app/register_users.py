@@ -0,0 +1,56 @@
+"""
+Register patients in bulk from a CSV or NDJSON file of registration rows.
+
+    cd backend
+    python -m app.register_users patients.csv
+
+Rows that fail are printed as NDJSON on stdout; the rest are imported.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+import orjson
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.passwords import PasswordHasher
+from app.services.bulk_registration import guess_format, read_rows, register_users
+
+logger = logging.getLogger("app.register_users")
+
+
+async def run(path: str, format: str, batch_size: int, workers: int):
+    hasher = PasswordHasher(workers, max_pending=workers)
+    hasher.start()
+    try:
+        with open(path, "rb") as file:
+            async with AsyncSessionLocal() as db:
+                return await register_users(read_rows(file, format), db, hasher, batch_size)
+    finally:
+        hasher.stop()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    args = parser.parse_args()
+
+    format = args.format or guess_format(args.path, None)
+    if format is None:
+        parser.error("cannot tell the format from the file name, pass --format")
+    result = asyncio.run(run(args.path, format, args.batch_size, args.workers))
+    for error in result.errors:
+        sys.stdout.buffer.write(orjson.dumps(error.model_dump()) + b"\n")
+    logger.info("Registered %d users, %d rows failed", result.created, result.failed)
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    sys.exit(main())
@@ -0,0 +1,14 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class AttachmentResponse(BaseModel):
+    id: int
+    health_record_id: int
+    filename: str
+    content_type: str
+    size: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
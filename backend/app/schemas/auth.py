@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.schemas.user import UserResponse
 
@@ -32,4 +32,15 @@ class UserRegister(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
-    user: UserResponse
\ No newline at end of file
+    user: UserResponse
+
+class BulkRegistrationError(BaseModel):
+    row: int  # 1-based data row, not counting a CSV header
+    phone_number: Optional[str] = None
+    detail: str
+
+
+class BulkRegistrationResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[BulkRegistrationError]
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Optional, Type
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, model_validator
+
+
+# Values for each measurement_type; ranges are what a device can plausibly report
+class BloodPressureValues(BaseModel):
+    systolic: int = Field(..., ge=40, le=300)
+    diastolic: int = Field(..., ge=20, le=200)
+    pulse: Optional[int] = Field(None, ge=20, le=250)
+
+    class Config:
+        extra = "forbid"
+
+
+class BloodSugarValues(BaseModel):
+    glucose: float = Field(..., ge=10, le=1000)  # mg/dL
+
+    class Config:
+        extra = "forbid"
+
+
+class TemperatureValues(BaseModel):
+    temperature: float = Field(..., ge=30, le=45)  # °C
+
+    class Config:
+        extra = "forbid"
+
+
+class OxygenSaturationValues(BaseModel):
+    spo2: int = Field(..., ge=50, le=100)  # %
+    pulse: Optional[int] = Field(None, ge=20, le=250)
+
+    class Config:
+        extra = "forbid"
+
+
+MEASUREMENT_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "blood_pressure": BloodPressureValues,
+    "blood_sugar": BloodSugarValues,
+    "temperature": TemperatureValues,
+    "oxygen_saturation": OxygenSaturationValues,
+}
+
+# Stored when a reading doesn't name its unit
+DEFAULT_UNITS = {
+    "blood_pressure": "mmHg",
+    "blood_sugar": "mg/dL",
+    "temperature": "°C",
+    "oxygen_saturation": "%",
+}
+
+
+class DeviceMeasurement(BaseModel):
+    """One device reading, its values checked against its measurement_type"""
+    device_type: str = Field(..., max_length=50)
+    device_model: Optional[str] = Field(None, max_length=100)
+    device_id: Optional[str] = Field(None, max_length=100)
+    measurement_type: str = Field(..., max_length=50)
+    values: Dict[str, Any]
+    unit: Optional[str] = Field(None, max_length=20)
+    measurement_context: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = None
+    measured_at: datetime
+
+    @model_validator(mode="after")
+    def check_values(self) -> "DeviceMeasurement":
+        schema = MEASUREMENT_SCHEMAS.get(self.measurement_type)
+        if schema is None:
+            raise ValueError(f"Unknown measurement_type {self.measurement_type!r}")
+        self.values = schema.model_validate(self.values).model_dump(exclude_none=True)
+        self.unit = self.unit or DEFAULT_UNITS[self.measurement_type]
+        # One instant, one stored value, whatever offset the device reported it in
+        if self.measured_at.tzinfo is None:
+            self.measured_at = self.measured_at.replace(tzinfo=timezone.utc)
+        else:
+            self.measured_at = self.measured_at.astimezone(timezone.utc)
+        return self
+
+
+class DeviceReading(DeviceMeasurement):
+    """One reading from a device batch; device_id is required because readings are deduplicated on it"""
+    device_id: str = Field(..., min_length=1, max_length=100)
+
+
+class DeviceSyncError(BaseModel):
+    reading: int  # 1-based position in the upload
+    detail: str
+
+
+class DeviceSyncResult(BaseModel):
+    received: int
+    stored: int  # new, or changing an earlier upload of the same reading
+    duplicates: int  # repeated within this upload, or already stored unchanged
+    errors: List[DeviceSyncError]
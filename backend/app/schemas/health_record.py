@@ -0,0 +1,60 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class HealthRecordBase(BaseModel):
+    consultation_date: datetime
+    doctor_name: str = Field(..., max_length=100)
+    clinic_name: Optional[str] = Field(None, max_length=200)
+    consultation_type: str = Field(..., max_length=50)
+    diagnosis: Optional[str] = None
+    symptoms: Optional[str] = None
+
+
+class HealthRecordCreate(HealthRecordBase):
+    # Plain text; stored encrypted
+    transcript: Optional[str] = None
+    audio_url: Optional[str] = None
+    summary: Optional[str] = None
+    prescription: Optional[str] = None
+
+
+class HealthRecordUpdate(BaseModel):
+    # Required columns may be left out but not set to null
+    consultation_date: datetime = None
+    doctor_name: str = Field(None, max_length=100)
+    clinic_name: Optional[str] = Field(None, max_length=200)
+    consultation_type: str = Field(None, max_length=50)
+    diagnosis: Optional[str] = None
+    symptoms: Optional[str] = None
+    transcript: Optional[str] = None
+    audio_url: Optional[str] = None
+    summary: Optional[str] = None
+    prescription: Optional[str] = None
+
+
+class HealthRecordSummary(HealthRecordBase):
+    """A records list entry: metadata only, nothing that needs decrypting"""
+    id: int
+    user_id: int
+    is_locked: bool
+    unlock_count: int
+    last_unlocked_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class HealthRecordDetail(HealthRecordSummary):
+    """An expanded record; only the requested encrypted fields are filled in"""
+    transcript: Optional[str] = None
+    audio_url: Optional[str] = None
+    summary: Optional[str] = None
+    prescription: Optional[str] = None
+
+
+class HealthRecordUnlock(BaseModel):
+    qr_key: str = Field(..., min_length=1, max_length=100)
@@ -0,0 +1,69 @@
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class SyncChanges(BaseModel):
+    cursor: int
+    has_more: bool
+    changes: Dict[str, List[Dict[str, Any]]]
+    deleted: Dict[str, List[int]]
+
+
+class MutationBase(BaseModel):
+    key: str = Field(..., min_length=8, max_length=64)
+
+
+class MedicineLogMutation(MutationBase):
+    type: Literal["medicine_log"]
+    medicine_id: int
+    scheduled_time: datetime
+    taken_time: Optional[datetime] = None
+    status: str = Field(..., pattern="^(taken|missed|skipped)$")
+    notes: Optional[str] = None
+    side_effects: Optional[str] = None
+
+
+class SymptomLogMutation(MutationBase):
+    type: Literal["symptom_log"]
+    symptom_type: str = Field(..., max_length=100)
+    severity: int = Field(..., ge=1, le=10)
+    description: Optional[str] = None
+    body_part: Optional[str] = Field(None, max_length=100)
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    mood_rating: Optional[int] = Field(None, ge=1, le=10)
+    activity_level: Optional[str] = Field(None, pattern="^(low|moderate|high)$")
+    logged_at: Optional[datetime] = None
+
+
+class DeviceReadingMutation(MutationBase):
+    type: Literal["device_reading"]
+    device_type: str = Field(..., max_length=50)
+    device_model: Optional[str] = Field(None, max_length=100)
+    device_id: Optional[str] = Field(None, max_length=100)
+    measurement_type: str = Field(..., max_length=50)
+    values: Dict[str, Any]
+    unit: Optional[str] = Field(None, max_length=20)
+    measurement_context: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = None
+    measured_at: datetime
+
+
+Mutation = Annotated[
+    Union[MedicineLogMutation, SymptomLogMutation, DeviceReadingMutation],
+    Field(discriminator="type")
+]
+
+
+class SyncPush(BaseModel):
+    mutations: List[Mutation] = Field(..., max_length=5000)
+
+
+class SyncPushResult(BaseModel):
+    index: int
+    key: str
+    status_code: int
+    detail: Optional[str] = None
+    table: Optional[str] = None
+    row_id: Optional[int] = None
@@ -0,0 +1,255 @@
+import asyncio
+import fcntl
+import hashlib
+import hmac
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.crypto import DecryptionError
+
+# Blob layout: a header, then the file in fixed-size plaintext chunks, each
+# sealed with AES-GCM on its own so any byte range can be read by decrypting
+# only the chunks it covers. The nonce is the blob's random prefix plus the
+# chunk index; the associated data binds the index and whether the chunk is the
+# last one, so chunks cannot be reordered and a blob cannot be truncated.
+MAGIC = b"HXA1"
+HEADER = struct.Struct("!4s8sIQ")  # magic, nonce prefix, chunk size, plaintext size
+TAG_SIZE = 16
+
+# Threads that wait on blob lock files, apart from the request threadpool
+LOCK_THREADS = 8
+
+
+@lru_cache(maxsize=8)
+def attachment_keys(secret: str) -> Tuple[bytes, bytes]:
+    """(AES key, content-address MAC key) derived from the attachment secret"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    derived = HKDF(algorithm=hashes.SHA256(), length=64, salt=None, info=b"healthaxis attachments").derive(secret.encode())
+    return derived[:32], derived[32:]
+
+
+def chunk_aad(index: int, final: bool) -> bytes:
+    return struct.pack("!I?", index, final)
+
+
+class BlobWriter:
+    """
+    Encrypts a stream into a temporary blob; nothing larger than one chunk is
+    held in memory. finish() returns the blob's content address, a keyed hash
+    of the plaintext, so equal files map to the same blob without the name
+    revealing a plain hash of the content. publish() then moves it into the
+    store, under the blob's lock.
+    """
+
+    def __init__(self, store: "AttachmentStore"):
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        self.store = store
+        self.chunk_size = store.chunk_size
+        self.aead = AESGCM(store.key)
+        self.nonce_prefix = os.urandom(8)
+        self.mac = hmac.new(store.mac_key, digestmod=hashlib.sha256)
+        self.size = 0
+        self.index = 0
+        self.buffer = bytearray()
+        fd, self.temp_path = tempfile.mkstemp(dir=store.temp_dir)
+        self.file = os.fdopen(fd, "wb")
+        self.file.write(HEADER.pack(MAGIC, self.nonce_prefix, self.chunk_size, 0))
+
+    def _seal(self, data: bytes, final: bool) -> None:
+        nonce = self.nonce_prefix + self.index.to_bytes(4, "big")
+        self.file.write(self.aead.encrypt(nonce, data, chunk_aad(self.index, final)))
+        self.index += 1
+
+    def write(self, data: bytes) -> None:
+        self.mac.update(data)
+        self.size += len(data)
+        self.buffer += data
+        # Hold back a full chunk until more data shows it is not the last
+        while len(self.buffer) > self.chunk_size:
+            self._seal(bytes(self.buffer[:self.chunk_size]), final=False)
+            del self.buffer[:self.chunk_size]
+
+    def finish(self) -> Tuple[str, int]:
+        """Seal the last chunk: (blob id, size)"""
+        self._seal(bytes(self.buffer), final=True)
+        self.buffer.clear()
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, self.nonce_prefix, self.chunk_size, self.size))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        self.blob_id = self.mac.hexdigest()
+        return self.blob_id, self.size
+
+    def publish(self) -> None:
+        """
+        Move the finished blob into the store, unless it is already there.
+        Call with the blob's lock held, once the row referring to it is committed.
+        """
+        path = self.store.path(self.blob_id)
+        if path.exists():
+            os.unlink(self.temp_path)  # already stored: deduplicated
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.temp_path, path)
+
+    def abort(self) -> None:
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.unlink(self.temp_path)
+
+
+@lru_cache(maxsize=None)
+def lock_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=LOCK_THREADS, thread_name_prefix="blob-lock")
+
+
+class BlobLock:
+    """
+    An exclusive lock on one blob across tasks and worker processes, used as
+    ``async with``. Publishing a blob and setting an unreferenced one aside
+    both happen under it; see release_blob in the attachments endpoints.
+    Blobs share 256 lock files by id prefix. Tasks of one process queue on an
+    asyncio lock per file, so at most one of them waits on the flock, and it
+    waits on a lock thread rather than the request threadpool.
+    """
+
+    _local: Dict[Path, asyncio.Lock] = {}
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = None
+
+    def _flock(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self.path, "ab")
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+    async def __aenter__(self) -> "BlobLock":
+        local = self._local.setdefault(self.path, asyncio.Lock())
+        await local.acquire()
+        future = asyncio.get_running_loop().run_in_executor(lock_executor(), self._flock)
+        try:
+            self.file = await asyncio.shield(future)
+        except BaseException:
+            # Cancelled while waiting: let go of the lock file once the flock returns
+            future.add_done_callback(lambda done: done.cancelled() or done.exception() or done.result().close())
+            local.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Closing the file drops the flock
+        self.file.close()
+        self._local[self.path].release()
+
+
+class AttachmentStore:
+    """
+    Encrypted, content-addressed files under ATTACHMENT_STORE_DIR. Blobs are
+    shared by every attachment with the same content, so one is only removed
+    once no attachment refers to it.
+    """
+
+    def __init__(self, root: str, chunk_size: int, secret: str):
+        self.root = Path(root)
+        self.temp_dir = self.root / "tmp"
+        self.chunk_size = chunk_size
+        self.key, self.mac_key = attachment_keys(secret)
+
+    def path(self, blob_id: str) -> Path:
+        return self.root / blob_id[:2] / blob_id[2:4] / blob_id
+
+    def lock(self, blob_id: str) -> BlobLock:
+        return BlobLock(self.root / "locks" / blob_id[:2])
+
+    def writer(self) -> BlobWriter:
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        return BlobWriter(self)
+
+    def set_aside(self, blob_id: str) -> Optional[Path]:
+        """Move a blob out of the store to be deleted; its new path, or None if it was not there"""
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        aside = self.temp_dir / f"{blob_id}.{os.urandom(8).hex()}"
+        try:
+            os.rename(self.path(blob_id), aside)
+        except FileNotFoundError:
+            return None
+        return aside
+
+    def restore(self, blob_id: str, aside: Path) -> None:
+        """Put a set-aside blob back, unless an upload has stored it again meanwhile"""
+        path = self.path(blob_id)
+        if path.exists():
+            os.unlink(aside)
+        else:
+            os.replace(aside, path)
+
+    @staticmethod
+    def discard(aside: Path) -> None:
+        os.unlink(aside)
+
+    def read(self, blob_id: str, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Plaintext bytes [start, stop) of a blob, decrypting one chunk at a time.
+        The file stays open only while the iterator is consumed.
+        """
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        aead = AESGCM(self.key)
+        with open(self.path(blob_id), "rb") as file:
+            magic, nonce_prefix, chunk_size, blob_size = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise DecryptionError("Not an attachment blob")
+            stop = blob_size if stop is None else min(stop, blob_size)
+            if start >= stop:
+                return
+            last = max(blob_size - 1, 0) // chunk_size
+            for index in range(start // chunk_size, (stop - 1) // chunk_size + 1):
+                chunk_start = index * chunk_size
+                plain_size = min(chunk_size, blob_size - chunk_start)
+                file.seek(HEADER.size + index * (chunk_size + TAG_SIZE))
+                sealed = file.read(plain_size + TAG_SIZE)
+                try:
+                    data = aead.decrypt(
+                        nonce_prefix + index.to_bytes(4, "big"), sealed, chunk_aad(index, index == last)
+                    )
+                except InvalidTag as exc:
+                    raise DecryptionError(f"Blob {blob_id} chunk {index} failed authentication") from exc
+                yield data[max(start - chunk_start, 0):stop - chunk_start]
+
+
+def attachment_secret() -> str:
+    """
+    The secret blob keys derive from. Blobs are never re-encrypted and their
+    content addresses depend on it, so it must not change: ATTACHMENT_KEY, or
+    ENCRYPTION_KEY for as long as that has not been rotated.
+    """
+    if settings.ATTACHMENT_KEY:
+        return settings.ATTACHMENT_KEY
+    if settings.ENCRYPTION_OLD_KEYS:
+        raise RuntimeError(
+            "ENCRYPTION_KEY is being rotated but ATTACHMENT_KEY is not set. Set ATTACHMENT_KEY "
+            "to the ENCRYPTION_KEY attachments were stored under; attachments are not re-encrypted."
+        )
+    return settings.ENCRYPTION_KEY
+
+
+@lru_cache(maxsize=None)
+def get_attachment_store() -> AttachmentStore:
+    return AttachmentStore(settings.ATTACHMENT_STORE_DIR, settings.ATTACHMENT_CHUNK_SIZE, attachment_secret())
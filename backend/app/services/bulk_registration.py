@@ -0,0 +1,164 @@
+import asyncio
+import csv
+import io
+from itertools import islice
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.passwords import PasswordHasher
+from app.models.user import User
+from app.schemas.auth import BulkRegistrationError, BulkRegistrationResult, UserRegister
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+
+Row = Tuple[int, Any]
+
+
+def guess_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """"csv" or "ndjson" from an upload's content type or file extension"""
+    if content_type in CONTENT_TYPES:
+        return CONTENT_TYPES[content_type]
+    for extension, format in FORMATS.items():
+        if (filename or "").lower().endswith(extension):
+            return format
+    return None
+
+
+def read_rows(file: BinaryIO, format: str) -> Iterator[Row]:
+    """
+    (row number, data) for each record, read incrementally. Empty CSV cells are
+    left out so field defaults apply; an unparseable NDJSON line yields None.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        for number, record in enumerate(csv.DictReader(text), 1):
+            yield number, {field: value for field, value in record.items() if field and value not in (None, "")}
+        return
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield number, None
+
+
+def describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+async def registered_phones(db: AsyncSession, phone_numbers: List[str]) -> Set[str]:
+    result = await db.execute(select(User.phone_number).where(User.phone_number.in_(phone_numbers)))
+    return set(result.scalars())
+
+
+async def insert_batch(
+    db: AsyncSession,
+    batch: List[Tuple[int, UserRegister]],
+    hasher: PasswordHasher,
+    errors: List[BulkRegistrationError],
+) -> int:
+    """Insert one batch in one transaction; returns how many users were created"""
+    for attempt in range(2):
+        taken = await registered_phones(db, [user.phone_number for _, user in batch])
+        # Hand the connection back to the pool while bcrypt runs
+        await db.commit()
+        for number, user in batch:
+            if user.phone_number in taken:
+                errors.append(BulkRegistrationError(
+                    row=number, phone_number=user.phone_number, detail="Phone number already registered"
+                ))
+        batch = [(number, user) for number, user in batch if user.phone_number not in taken]
+        if not batch:
+            return 0
+
+        if attempt == 0:
+            hashes = await hasher.hash_many([user.password for _, user in batch])
+            values = {
+                user.phone_number: dict(user.model_dump(exclude={"password"}), hashed_password=password_hash)
+                for (_, user), password_hash in zip(batch, hashes)
+            }
+        try:
+            await db.execute(insert(User), [values[user.phone_number] for _, user in batch])
+            await db.commit()
+            return len(batch)
+        except IntegrityError:
+            # Someone registered one of these numbers since the check; drop them and retry once
+            await db.rollback()
+            if attempt:
+                raise
+    return 0
+
+
+def next_batch(
+    rows: Iterator[Row],
+    batch_size: int,
+    seen: Set[str],
+    errors: List[BulkRegistrationError],
+) -> Optional[List[Tuple[int, UserRegister]]]:
+    """
+    Read and validate up to batch_size rows; returns the valid ones, or None
+    once the rows run out. Rejected rows are added to errors.
+    """
+    chunk = list(islice(rows, batch_size))
+    if not chunk:
+        return None
+    batch = []
+    for number, data in chunk:
+        if not isinstance(data, dict):
+            errors.append(BulkRegistrationError(row=number, detail="Row is not a JSON object"))
+            continue
+        try:
+            user = UserRegister.model_validate(data)
+        except ValidationError as exc:
+            phone_number = data.get("phone_number")
+            errors.append(BulkRegistrationError(
+                row=number, phone_number=str(phone_number) if phone_number else None, detail=describe(exc)
+            ))
+            continue
+        if user.phone_number in seen:
+            errors.append(BulkRegistrationError(
+                row=number, phone_number=user.phone_number, detail="Phone number repeated in file"
+            ))
+            continue
+        seen.add(user.phone_number)
+        batch.append((number, user))
+    return batch
+
+
+async def register_users(
+    rows: Iterable[Row],
+    db: AsyncSession,
+    hasher: PasswordHasher,
+    batch_size: int = 500,
+) -> BulkRegistrationResult:
+    """
+    Register users from (row number, data) pairs in batches: one phone lookup,
+    one round of parallel hashing and one insert per batch. Invalid rows,
+    numbers repeated within the file and numbers already registered are
+    reported per row and do not stop the import.
+    """
+    created = 0
+    errors: List[BulkRegistrationError] = []
+    seen: Set[str] = set()
+    rows = iter(rows)
+    while True:
+        # Reading the file and validating rows block, so each batch is parsed off the event loop
+        batch = await asyncio.to_thread(next_batch, rows, batch_size, seen, errors)
+        if batch is None:
+            break
+        if batch:
+            created += await insert_batch(db, batch, hasher, errors)
+
+    errors.sort(key=lambda error: error.row)
+    return BulkRegistrationResult(created=created, failed=len(errors), errors=errors)
@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import msgpack
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_log import record_changes
+from app.models.device_data import DeviceData
+from app.schemas.device import MEASUREMENT_SCHEMAS, DeviceReading, DeviceSyncError, DeviceSyncResult
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# A re-sent reading replaces these; who it belongs to and when it was taken stay
+UPDATED_COLUMNS = ("device_type", "device_model", "values", "unit", "measurement_context", "notes")
+
+Row = Tuple[int, Any]
+
+
+def read_ndjson(body: bytes) -> Iterator[Row]:
+    """(reading number, data) for each line; an unparseable line yields None"""
+    number = 0
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield number, None
+
+
+def read_msgpack(body: bytes) -> Iterator[Row]:
+    """
+    (reading number, data) for each reading in a compact batch:
+
+        {"device_id": ..., "device_type": ..., "device_model": ...,
+         "series": [{"measurement_type": "blood_sugar", "unit": "mg/dL",
+                     "readings": [[unix time, 95], [unix time, 101], ...]}]}
+
+    Each reading is the time followed by the values in the order
+    MEASUREMENT_SCHEMAS lists them, optional trailing ones left off.
+    """
+    try:
+        batch = msgpack.unpackb(body, raw=False)
+    except (ValueError, msgpack.UnpackException):
+        yield 1, None
+        return
+    if not isinstance(batch, dict) or not isinstance(batch.get("series"), list):
+        yield 1, None
+        return
+    device = {name: batch.get(name) for name in ("device_id", "device_type", "device_model")}
+    number = 0
+    for series in batch["series"]:
+        if not isinstance(series, dict) or not isinstance(series.get("readings"), list):
+            number += 1
+            yield number, None
+            continue
+        schema = MEASUREMENT_SCHEMAS.get(series.get("measurement_type"))
+        fields = list(schema.model_fields) if schema else []
+        for reading in series["readings"]:
+            number += 1
+            if not isinstance(reading, list) or not reading or not isinstance(reading[0], (int, float)):
+                yield number, None
+                continue
+            yield number, {
+                **device,
+                "measurement_type": series.get("measurement_type"),
+                "unit": series.get("unit"),
+                "measurement_context": series.get("measurement_context"),
+                "measured_at": datetime.fromtimestamp(reading[0], timezone.utc),
+                "values": dict(zip(fields, reading[1:])) if schema else {},
+            }
+
+
+def describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def reading_key(device_id: str, measurement_type: str, measured_at: datetime) -> tuple:
+    # SQLite hands datetimes back without their zone; every stored one is UTC
+    return device_id, measurement_type, measured_at.replace(tzinfo=None)
+
+
+def upsert_statement(dialect: str):
+    """
+    Insert readings; one already stored for the same device, measurement and
+    time is refreshed instead if anything about it changed, unless it belongs
+    to another user. Only new and changed rows are returned.
+    """
+    statement = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(DeviceData)
+    return statement.on_conflict_do_update(
+        index_elements=[DeviceData.device_id, DeviceData.measurement_type, DeviceData.measured_at],
+        set_={**{name: statement.excluded[name] for name in UPDATED_COLUMNS}, "synced_at": func.now()},
+        where=and_(
+            DeviceData.user_id == statement.excluded.user_id,
+            or_(*(DeviceData.__table__.c[name].is_distinct_from(statement.excluded[name]) for name in UPDATED_COLUMNS)),
+        ),
+    ).returning(DeviceData.id, DeviceData.device_id, DeviceData.measurement_type, DeviceData.measured_at)
+
+
+async def upsert_readings(db: AsyncSession, rows: Sequence[dict]) -> Tuple[Dict[tuple, int], Dict[tuple, int]]:
+    """
+    Upsert device_data rows, each with a distinct reading_key. Returns the row
+    id for each key written (new or changed) and for each key already stored
+    unchanged for the same user; keys in neither were stored for another user
+    and left alone. Core upserts bypass the flush listener, so callers write
+    the change log, for the written rows only.
+    """
+    rows = list(rows)
+    returned = (await db.execute(upsert_statement(db.get_bind().dialect.name), rows)).all()
+    written = {reading_key(row.device_id, row.measurement_type, row.measured_at): row.id for row in returned}
+    owners = {
+        reading_key(row["device_id"], row["measurement_type"], row["measured_at"]): row for row in rows
+    }
+    skipped = [
+        (row["device_id"], row["measurement_type"], row["measured_at"])
+        for key, row in owners.items() if key not in written
+    ]
+    unchanged = {}
+    if skipped:
+        existing = await db.execute(
+            select(DeviceData.id, DeviceData.user_id, DeviceData.device_id, DeviceData.measurement_type, DeviceData.measured_at)
+            .where(tuple_(DeviceData.device_id, DeviceData.measurement_type, DeviceData.measured_at).in_(skipped))
+        )
+        for row in existing:
+            key = reading_key(row.device_id, row.measurement_type, row.measured_at)
+            if key in owners and owners[key]["user_id"] == row.user_id:
+                unchanged[key] = row.id
+    return written, unchanged
+
+
+def validate_readings(rows: Iterator[Row]) -> Tuple[int, Dict[tuple, Tuple[int, DeviceReading]], List[DeviceSyncError]]:
+    """(readings received, valid readings by reading_key, errors); a repeated reading keeps its last copy"""
+    errors: List[DeviceSyncError] = []
+    readings: Dict[tuple, Tuple[int, DeviceReading]] = {}
+    received = 0
+    for number, data in rows:
+        received += 1
+        if not isinstance(data, dict):
+            errors.append(DeviceSyncError(reading=number, detail="Not a reading"))
+            continue
+        try:
+            reading = DeviceReading.model_validate(data)
+        except ValidationError as exc:
+            errors.append(DeviceSyncError(reading=number, detail=describe(exc)))
+            continue
+        key = reading_key(reading.device_id, reading.measurement_type, reading.measured_at)
+        readings.pop(key, None)
+        readings[key] = (number, reading)
+    return received, readings, errors
+
+
+async def ingest_readings(db: AsyncSession, rows: Iterator[Row], user_id: int, chunk_size: int) -> DeviceSyncResult:
+    """
+    Validate readings and upsert them chunk_size at a time, one transaction
+    per chunk. Invalid readings are reported by number and the rest still
+    stored; a reading repeated within the upload is stored once, and one
+    already stored with the same content counts as a duplicate too.
+    """
+    # Parsing and validating a large batch is CPU work; keep it off the event loop
+    received, readings, errors = await asyncio.to_thread(validate_readings, rows)
+    duplicates = received - len(errors) - len(readings)
+
+    stored = 0
+    pending = iter(readings.items())
+    while chunk := list(islice(pending, chunk_size)):
+        params = []
+        for _, (_, reading) in chunk:
+            row = reading.model_dump()
+            row["user_id"] = user_id
+            row["values"] = orjson.dumps(row["values"]).decode()
+            params.append(row)
+        written, unchanged = await upsert_readings(db, params)
+        await db.run_sync(lambda session: record_changes(session.connection(), [
+            {"user_id": user_id, "table_name": DeviceData.__tablename__, "row_id": row_id, "operation": "upsert"}
+            for row_id in written.values()
+        ]))
+        await db.commit()
+        stored += len(written)
+        duplicates += len(unchanged)
+        for key, (number, _) in chunk:
+            if key not in written and key not in unchanged:
+                errors.append(DeviceSyncError(reading=number, detail="Reading is already stored for another account"))
+
+    errors.sort(key=lambda error: error.reading)
+    return DeviceSyncResult(received=received, stored=stored, duplicates=duplicates, errors=errors)
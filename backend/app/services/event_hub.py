@@ -0,0 +1,106 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+
+Event = Dict[str, Any]
+
+RESYNC_EVENT: Event = {"type": "resync"}
+
+
+class Subscription:
+    """One live client connection with its own bounded event queue"""
+
+    def __init__(self, hub: "EventHub", user_id: int, maxsize: int):
+        self.hub = hub
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def offer(self, event: Event) -> bool:
+        """
+        Queue an event without blocking the publisher.
+
+        A client that falls a full queue behind is cut off with a final resync
+        event. It reconnects and refetches, rather than the hub buffering
+        without bound or stalling every other subscriber.
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            self.closed = True
+            self.hub.dropped += 1
+            return False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None if nothing arrived within ``timeout`` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.closed = True
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """In-process fan-out of per-user events to live SSE/WebSocket connections"""
+
+    def __init__(self, queue_size: int = settings.EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, user_id, self.queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.user_id)
+        if subs is None:
+            return
+        subs.discard(subscription)
+        if not subs:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, event: Event) -> int:
+        """Deliver an event to every connection of a user, returns how many accepted it"""
+        delivered = 0
+        for subscription in list(self._subscribers.get(user_id, ())):
+            if subscription.offer(event):
+                delivered += 1
+        self.published += 1
+        return delivered
+
+
+event_hub = EventHub()
+
+
+async def publish_due_reminders(minute: int, due) -> None:
+    """Reminder scheduler listener: push each due reminder to its user's connections"""
+    time_str = f"{minute // 60:02d}:{minute % 60:02d}"
+    for i, reminder in enumerate(due, 1):
+        event_hub.publish(reminder.user_id, {
+            "type": "reminder_due",
+            "reminder_id": reminder.reminder_id,
+            "medicine_id": reminder.medicine_id,
+            "time": time_str,
+            "sound": reminder.sound
+        })
+        # Let connections drain between chunks of a large 08:00-style spike
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
@@ -0,0 +1,186 @@
+import asyncio
+import zipfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, List
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crypto import DecryptionError, cipher
+from app.models.appointment import Appointment
+from app.models.device_data import DeviceData
+from app.models.health_record import HealthRecord
+from app.models.medicine import Medicine, MedicineLog
+from app.models.symptom_log import SymptomLog
+from app.models.user import User
+
+# Rows fetched per round trip; each batch is decrypted and encoded as one piece
+EXPORT_BATCH_SIZE = 1000
+
+# Exported tables, each read in the order of its per-user index so the database
+# can stream rows without sorting the whole history first
+EXPORT_TABLES = [
+    (HealthRecord, (HealthRecord.user_id, HealthRecord.consultation_date, HealthRecord.id)),
+    (Medicine, (Medicine.user_id, Medicine.id)),
+    (MedicineLog, (MedicineLog.user_id, MedicineLog.scheduled_time, MedicineLog.id)),
+    (SymptomLog, (SymptomLog.user_id, SymptomLog.logged_at, SymptomLog.id)),
+    (DeviceData, (DeviceData.user_id, DeviceData.measurement_type, DeviceData.measured_at, DeviceData.id)),
+    (Appointment, (Appointment.user_id, Appointment.appointment_date, Appointment.id)),
+]
+
+# Never exported; the record's content is exported decrypted instead
+EXCLUDED_COLUMNS = {
+    "users": {"hashed_password"},
+    "health_records": {
+        "encrypted_transcript", "encrypted_audio_url", "encrypted_summary", "encrypted_prescription", "qr_key_hash",
+    },
+}
+
+# Decrypted health record fields and their columns
+DECRYPTED_FIELDS = {
+    "transcript": HealthRecord.encrypted_transcript,
+    "audio_url": HealthRecord.encrypted_audio_url,
+    "summary": HealthRecord.encrypted_summary,
+    "prescription": HealthRecord.encrypted_prescription,
+}
+
+
+def export_columns(model) -> list:
+    excluded = EXCLUDED_COLUMNS.get(model.__tablename__, set())
+    return [column for column in model.__table__.columns if column.name not in excluded]
+
+
+def encode_lines(rows: List[dict]) -> bytes:
+    return b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+
+def decrypt_each(values: List) -> List:
+    decrypted = []
+    for value in values:
+        try:
+            decrypted.append(cipher().decrypt(value) if value is not None else None)
+        except DecryptionError:
+            decrypted.append(None)
+    return decrypted
+
+
+async def decrypt_records(rows) -> List[dict]:
+    """
+    Health record rows with their content decrypted, one batch call for the
+    lot. Locked records keep their content null, as GET /records/{id} refuses
+    it until the record is unlocked by QR.
+    """
+    names = list(DECRYPTED_FIELDS)
+    width = len(names)
+    values = [None if row.is_locked else getattr(row, f"_export_{name}") for row in rows for name in names]
+    try:
+        decrypted = await cipher().adecrypt_many(values)
+    except DecryptionError:
+        # One undecryptable value should not cost the whole export
+        decrypted = await asyncio.to_thread(decrypt_each, values)
+    records = []
+    for index, row in enumerate(rows):
+        record = {key: value for key, value in row._mapping.items() if not key.startswith("_export_")}
+        record.update(zip(names, decrypted[index * width:(index + 1) * width]))
+        records.append(record)
+    return records
+
+
+async def table_batches(db: AsyncSession, user_id: int, model, order_by) -> AsyncIterator[List[dict]]:
+    """A user's rows of one table as lists of dicts, EXPORT_BATCH_SIZE at a time"""
+    columns = export_columns(model)
+    if model is HealthRecord:
+        columns += [column.label(f"_export_{name}") for name, column in DECRYPTED_FIELDS.items()]
+    query = (
+        select(*columns)
+        .where(model.user_id == user_id)
+        .order_by(*order_by)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        if model is HealthRecord:
+            yield await decrypt_records(rows)
+        else:
+            yield [dict(row._mapping) for row in rows]
+
+
+async def export_header(db: AsyncSession, user_id: int) -> dict:
+    profile = (await db.execute(select(*export_columns(User)).where(User.id == user_id))).one()
+    return {
+        "format": "healthaxis-export",
+        "version": 1,
+        "exported_at": datetime.now(timezone.utc),
+        "user": dict(profile._mapping),
+        "tables": [model.__tablename__ for model, _ in EXPORT_TABLES],
+    }
+
+
+async def export_ndjson(db: AsyncSession, user_id: int) -> AsyncIterator[bytes]:
+    """
+    A user's history as NDJSON: a header line with the profile, then one
+    {"table": ..., "row": ...} line per row, streamed a batch at a time
+    """
+    yield orjson.dumps(await export_header(db, user_id), option=orjson.OPT_APPEND_NEWLINE)
+    for model, order_by in EXPORT_TABLES:
+        async for rows in table_batches(db, user_id, model, order_by):
+            yield encode_lines([{"table": model.__tablename__, "row": row} for row in rows])
+
+
+class ZipChunks:
+    """Write-only file for ZipFile that hands back what was written since the last take()"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+async def export_zip(db: AsyncSession, user_id: int) -> AsyncIterator[bytes]:
+    """
+    The same export as a ZIP with export.json for the header and one NDJSON
+    file per table. The archive is written to an unseekable stream, so sizes
+    go in data descriptors and nothing but the current batch is buffered.
+    """
+    chunks = ZipChunks()
+    with zipfile.ZipFile(chunks, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("export.json", orjson.dumps(await export_header(db, user_id), option=orjson.OPT_INDENT_2))
+        yield chunks.take()
+        for model, order_by in EXPORT_TABLES:
+            with archive.open(f"{model.__tablename__}.ndjson", "w", force_zip64=True) as entry:
+                async for rows in table_batches(db, user_id, model, order_by):
+                    # Deflate off the event loop
+                    await asyncio.to_thread(entry.write, encode_lines(rows))
+                    data = chunks.take()
+                    if data:
+                        yield data
+            yield chunks.take()
+    yield chunks.take()
+
+
+# format: (generator, media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson", "ndjson"),
+    "zip": (export_zip, "application/zip", "zip"),
+}
+
+
+def export_filename(user_id: int, extension: str) -> str:
+    return f"healthaxis-export-{user_id}-{datetime.now(timezone.utc):%Y%m%d}.{extension}"
+
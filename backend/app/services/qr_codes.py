@@ -0,0 +1,11 @@
+import io
+
+
+def render_qr(payload: str) -> bytes:
+    """PNG of a QR code; qrcode and Pillow are only imported when one is drawn"""
+    import qrcode
+
+    image = qrcode.make(payload, box_size=8, border=2)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,78 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+CacheKey = Tuple[int, int, str]  # (user_id, record_id, field)
+
+
+class DecryptedRecordCache:
+    """
+    Decrypted health-record fields, keyed by user so one user's entries can
+    never answer another's request. Entries expire after ttl seconds, and the
+    least recently used go first once the cached plaintext exceeds max_bytes.
+    Evict a record whenever it is locked or changed.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float, int]]" = OrderedDict()
+        self._by_user: Dict[int, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    def _pop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry[2]
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+    def get(self, user_id: int, record_id: int, field: str) -> Optional[str]:
+        key = (user_id, record_id, field)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, user_id: int, record_id: int, field: str, value: str) -> None:
+        key = (user_id, record_id, field)
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, size)
+            self._by_user.setdefault(user_id, set()).add(key)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def evict_record(self, user_id: int, record_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._by_user.get(user_id, ()) if key[1] == record_id]:
+                self._pop(key)
+
+    def evict_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._pop(key)
+
+    def status(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes}
+
+
+record_cache = DecryptedRecordCache(settings.RECORD_CACHE_MAX_BYTES, settings.RECORD_CACHE_TTL_SECONDS)
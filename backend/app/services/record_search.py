@@ -0,0 +1,81 @@
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, cast, column, func, literal_column, select, table
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tokenizer import tokenize
+from app.models.health_record import HealthRecord
+from app.models.health_record_search import HealthRecordSearch, clinic_key, clinic_scope, user_scope
+
+# Query words beyond this are ignored; every one of them has to match
+MAX_QUERY_TOKENS = 8
+
+FTS_TABLE = "health_record_search_fts"
+fts = table(FTS_TABLE, column("rowid"), column("terms"))
+
+
+def fts5_match(terms: Sequence[str]) -> str:
+    """FTS5 query for every term, the last as a prefix so results keep up with typing"""
+    return " AND ".join(f'"{term}"' for term in terms) + "*"
+
+
+def tsquery_text(terms: Sequence[str]) -> str:
+    """The same query as tsquery text; quoted lexemes are taken as they are"""
+    return " & ".join(f"'{term}'" for term in terms) + ":*"
+
+
+def search_statement(dialect: str, terms: Sequence[str], columns: list) -> Tuple:
+    """(select of columns then score, score expression); lower scores rank first on both backends"""
+    if dialect == "postgresql":
+        query = cast(bindparam("query", tsquery_text(terms)), TSQUERY)
+        document = literal_column(f"{HealthRecordSearch.__tablename__}.document")
+        score = -func.ts_rank(document, query)
+        statement = (
+            select(*columns, score.label("score"))
+            .select_from(HealthRecordSearch)
+            .join(HealthRecord, HealthRecord.id == HealthRecordSearch.record_id)
+            .where(document.op("@@")(query))
+        )
+        return statement, score
+    score = func.bm25(literal_column(FTS_TABLE))
+    statement = (
+        select(*columns, score.label("score"))
+        .select_from(fts)
+        .join(HealthRecordSearch, HealthRecordSearch.record_id == fts.c.rowid)
+        .join(HealthRecord, HealthRecord.id == fts.c.rowid)
+        .where(literal_column(FTS_TABLE).op("MATCH")(bindparam("match", fts5_match(terms))))
+    )
+    return statement, score
+
+
+async def search_records(
+    db: AsyncSession,
+    text: str,
+    columns: list,
+    user_id: Optional[int] = None,
+    clinic: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 20,
+):
+    """
+    Records whose diagnosis and symptoms contain every word of text, best
+    match first, limited to a user's records, a clinic's or both. At most
+    limit + 1 rows from offset on, so the caller can tell whether another page
+    follows. Pages go by position rather than by score: bm25 and ts_rank
+    depend on statistics over every indexed record, so any record written
+    between two requests moves all the scores.
+    """
+    tokens = list(dict.fromkeys(tokenize(text)))[:MAX_QUERY_TOKENS]
+    key = clinic_key(clinic) if clinic is not None else None
+    if not tokens or (user_id is None and clinic is None) or (clinic is not None and key is None):
+        return []
+    # Search the smaller scope's terms; a clinic within a patient's records is a filter
+    scope = user_scope(user_id) if user_id is not None else clinic_scope(key)
+    statement, score = search_statement(db.get_bind().dialect.name, [scope + token for token in tokens], columns)
+    if user_id is not None:
+        statement = statement.where(HealthRecord.user_id == user_id)
+        if key is not None:
+            statement = statement.where(HealthRecordSearch.clinic_key == key)
+    statement = statement.order_by(score, HealthRecord.id).offset(offset).limit(limit + 1)
+    return (await db.execute(statement)).all()
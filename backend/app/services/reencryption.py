@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crypto import DecryptionError, RecordCipher
+from app.models.health_record import HealthRecord
+from app.models.job_checkpoint import JobCheckpoint
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "reencrypt-health-records"
+
+ENCRYPTED_COLUMNS = (
+    HealthRecord.encrypted_transcript,
+    HealthRecord.encrypted_audio_url,
+    HealthRecord.encrypted_summary,
+    HealthRecord.encrypted_prescription,
+)
+
+
+def rotate_rows(record_cipher: RecordCipher, rows) -> List[dict]:
+    """Update parameters for the rows that have a value not yet under the current key"""
+    changes = []
+    for row in rows:
+        try:
+            rotated = [record_cipher.rotate(value) for value in row[1:]]
+        except DecryptionError:
+            logger.warning("Health record %d has a value no configured key can decrypt; left as is", row[0])
+            continue
+        if any(value is not None for value in rotated):
+            params = {"row_id": row[0]}
+            for column, old, new in zip(ENCRYPTED_COLUMNS, row[1:], rotated):
+                params[f"old_{column.key}"] = old
+                params[f"new_{column.key}"] = old if new is None else new
+            changes.append(params)
+    return changes
+
+
+class ReencryptionJob:
+    """
+    Re-encrypts every health record under the current ENCRYPTION_KEY while the
+    service keeps running. Rows are read in primary-key order, one batch per
+    transaction, and the checkpoint is committed with each batch so a stopped
+    run resumes where it left off. A row changed by live traffic between the
+    read and the write is left alone, since it was just written with the
+    current key anyway.
+    """
+
+    def __init__(self, record_cipher: RecordCipher, rows_per_second: float, batch_size: int):
+        self.cipher = record_cipher
+        self.rows_per_second = rows_per_second
+        self.batch_size = batch_size
+        self.statement = (
+            update(HealthRecord.__table__)
+            .where(HealthRecord.id == bindparam("row_id"))
+            .where(*(column.is_not_distinct_from(bindparam(f"old_{column.key}")) for column in ENCRYPTED_COLUMNS))
+            .values({column.key: bindparam(f"new_{column.key}") for column in ENCRYPTED_COLUMNS})
+            # Same content, so not an update as far as clients and sync are concerned
+            .values(updated_at=HealthRecord.__table__.c.updated_at)
+        )
+
+    async def checkpoint(self, db: AsyncSession, restart: bool = False) -> JobCheckpoint:
+        """The checkpoint to continue from; a new key or restart=True starts over"""
+        checkpoint = await db.get(JobCheckpoint, JOB_NAME)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=JOB_NAME)
+            db.add(checkpoint)
+        elif not restart and checkpoint.target == self.cipher.fingerprint:
+            return checkpoint
+        checkpoint.target = self.cipher.fingerprint
+        checkpoint.last_id = 0
+        checkpoint.processed = 0
+        checkpoint.updated = 0
+        checkpoint.total = await db.scalar(select(func.count()).select_from(HealthRecord))
+        checkpoint.started_at = func.now()
+        checkpoint.finished_at = None
+        await db.commit()
+        await db.refresh(checkpoint)
+        return checkpoint
+
+    async def run(self, db: AsyncSession, restart: bool = False, stop: Optional[asyncio.Event] = None) -> JobCheckpoint:
+        checkpoint = await self.checkpoint(db, restart)
+        if checkpoint.finished_at is not None:
+            logger.info("All %d health records already use the current key", checkpoint.processed)
+            return checkpoint
+
+        started = time.monotonic()
+        done_this_run = 0
+        while stop is None or not stop.is_set():
+            result = await db.execute(
+                select(HealthRecord.id, *ENCRYPTED_COLUMNS)
+                .where(HealthRecord.id > checkpoint.last_id)
+                .order_by(HealthRecord.id)
+                .limit(self.batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                checkpoint.finished_at = func.now()
+                await db.commit()
+                logger.info("Re-encryption finished: %d rows examined, %d rewritten", checkpoint.processed, checkpoint.updated)
+                break
+
+            changes = await asyncio.to_thread(rotate_rows, self.cipher, rows)
+            if changes:
+                await db.execute(self.statement, changes)
+            checkpoint.last_id = rows[-1].id
+            checkpoint.processed += len(rows)
+            checkpoint.updated += len(changes)
+            await db.commit()
+
+            done_this_run += len(rows)
+            logger.info(
+                "Re-encrypted up to id %d: %d/%s rows examined, %d rewritten",
+                checkpoint.last_id, checkpoint.processed, checkpoint.total, checkpoint.updated,
+            )
+            # Throttle to rows_per_second averaged over the run
+            ahead = done_this_run / self.rows_per_second - (time.monotonic() - started)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+        await db.refresh(checkpoint)
+        return checkpoint
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.change_log import ChangeLog
+from app.models.reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+
+# Changed reminders re-read per query while catching up on the change log
+REFRESH_BATCH = 1000
+
+
+class DueReminder(NamedTuple):
+    reminder_id: int
+    user_id: int
+    medicine_id: int
+    sound: bool
+
+
+DueListener = Callable[[int, List[DueReminder]], Awaitable[None]]
+
+
+def minute_of_day(time_str: str) -> Optional[int]:
+    """Parse an HH:MM reminder time into minutes since midnight, None if malformed"""
+    try:
+        hours, minutes = time_str.split(":")
+        hours, minutes = int(hours), int(minutes)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+class ReminderScheduler:
+    """
+    Timing wheel of enabled reminders with one bucket per minute of the day.
+
+    Each bucket maps reminder id -> DueReminder, and a reverse index remembers
+    which bucket a reminder sits in, so create/update/toggle/delete are O(1)
+    and emitting a minute is O(due) instead of a scan over the reminders table.
+
+    The wheel is per worker. The worker that handles a reminder write applies
+    it at once; every worker also polls the change log for reminder changes
+    every REMINDER_SCHEDULER_POLL_SECONDS and re-reads those reminders, so
+    writes made through other workers or /sync/push reach its wheel too.
+    """
+
+    def __init__(
+        self,
+        timezone: str = settings.REMINDER_TIMEZONE,
+        interval: float = settings.REMINDER_SCHEDULER_POLL_SECONDS,
+    ):
+        self.timezone = ZoneInfo(timezone)
+        self.interval = interval
+        self.last_change_id = 0
+        self._wheel: List[Dict[int, DueReminder]] = [{} for _ in range(MINUTES_PER_DAY)]
+        self._minute_of: Dict[int, int] = {}
+        self._listeners: List[DueListener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._minute_of)
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the wheel from the reminders table"""
+        for bucket in self._wheel:
+            bucket.clear()
+        self._minute_of.clear()
+
+        # Changes from here on are picked up by refresh(); the settle window
+        # covers writes still committing while the table is read
+        self.last_change_id = await db.scalar(
+            select(func.coalesce(func.max(ChangeLog.id), 0)).where(ChangeLog.changed_at <= self._settled())
+        )
+        query = select(
+            Reminder.id, Reminder.user_id, Reminder.medicine_id, Reminder.time, Reminder.sound
+        ).where(Reminder.enabled.is_(True)).execution_options(yield_per=5000)
+        async for row in await db.stream(query):
+            self._add(row.id, row.user_id, row.medicine_id, row.time, row.sound)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Re-read the reminders changed since the last refresh and apply them"""
+        settled = self._settled()
+        entries = (await db.execute(
+            select(ChangeLog.id, ChangeLog.row_id, ChangeLog.changed_at)
+            .where(ChangeLog.id > self.last_change_id, ChangeLog.table_name == Reminder.__tablename__)
+            .order_by(ChangeLog.id)
+        )).all()
+        changed = list(dict.fromkeys(entry.row_id for entry in entries))
+        for start in range(0, len(changed), REFRESH_BATCH):
+            ids = changed[start:start + REFRESH_BATCH]
+            rows = {row.id: row for row in (await db.execute(
+                select(
+                    Reminder.id, Reminder.user_id, Reminder.medicine_id, Reminder.time, Reminder.sound, Reminder.enabled
+                ).where(Reminder.id.in_(ids))
+            )).all()}
+            for reminder_id in ids:
+                self.remove(reminder_id)
+                row = rows.get(reminder_id)
+                if row is not None and row.enabled:
+                    self._add(row.id, row.user_id, row.medicine_id, row.time, row.sound)
+        # Ids are assigned at insert but become visible at commit, so only move
+        # past entries old enough that no earlier id can still appear; younger
+        # ones are re-read next time, which is harmless
+        for entry in entries:
+            changed_at = entry.changed_at
+            if changed_at is None:
+                break
+            if changed_at.tzinfo is None:
+                changed_at = changed_at.replace(tzinfo=timezone.utc)
+            if changed_at > settled:
+                break
+            self.last_change_id = entry.id
+
+    @staticmethod
+    def _settled() -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=settings.CHANGE_LOG_SETTLE_SECONDS)
+
+    def _add(self, reminder_id, user_id, medicine_id, time_str, sound) -> None:
+        minute = minute_of_day(time_str)
+        if minute is None:
+            return
+        self._wheel[minute][reminder_id] = DueReminder(reminder_id, user_id, medicine_id, bool(sound))
+        self._minute_of[reminder_id] = minute
+
+    def upsert(self, reminder: Reminder) -> None:
+        """Sync a created, updated or toggled reminder into the wheel"""
+        self.remove(reminder.id)
+        if reminder.enabled:
+            self._add(reminder.id, reminder.user_id, reminder.medicine_id, reminder.time, reminder.sound)
+
+    def remove(self, reminder_id: int) -> None:
+        minute = self._minute_of.pop(reminder_id, None)
+        if minute is not None:
+            self._wheel[minute].pop(reminder_id, None)
+
+    def due(self, minute: int) -> List[DueReminder]:
+        return list(self._wheel[minute % MINUTES_PER_DAY].values())
+
+    def add_listener(self, listener: DueListener) -> None:
+        self._listeners.append(listener)
+
+    def current_minute(self) -> int:
+        now = datetime.now(self.timezone)
+        return now.hour * 60 + now.minute
+
+    async def _emit(self, minute: int) -> None:
+        due = self.due(minute)
+        if not due:
+            return
+        for listener in self._listeners:
+            await listener(minute, due)
+
+    async def run(self) -> None:
+        """Emit the due set once per minute, catching up on minutes missed under load"""
+        last = self.current_minute()
+        while True:
+            now = datetime.now(self.timezone)
+            await asyncio.sleep(60 - now.second - now.microsecond / 1_000_000)
+            current = self.current_minute()
+            missed = (current - last) % MINUTES_PER_DAY
+            # A large gap means the clock jumped; only the current minute is still relevant
+            if missed > settings.REMINDER_SCHEDULER_MAX_CATCHUP_MINUTES:
+                missed = 1
+            for offset in range(missed, 0, -1):
+                await self._emit(current - offset + 1)
+            last = current
+
+    async def poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.refresh(db)
+            except Exception as exc:
+                logger.warning("Could not refresh reminders: %r", exc)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            self._poll_task = asyncio.create_task(self.poll())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._poll_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._poll_task = None
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Ids are assigned at insert but become visible at commit, so a revocation
+# may appear after one with a higher id. A poll only moves past rows at least
+# this old; younger ones are read again next time.
+SETTLE_SECONDS = 60
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands datetimes back without their zone; every stored one is UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class TokenRevocations:
+    """
+    Keeps this worker's revoked tokens (security.revoked_tokens) in step with
+    the revoked_tokens table, so a logout holds in every worker and across
+    restarts. Unexpired revocations are loaded at startup and newer ones
+    polled for every TOKEN_REVOCATION_POLL_SECONDS; the worker that handles a
+    logout applies it at once. Tokens are only ever looked up in memory.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self, db: AsyncSession) -> None:
+        """Apply the revocations this worker has not seen yet"""
+        now = datetime.now(timezone.utc)
+        rows = (await db.execute(
+            select(RevokedToken.id, RevokedToken.token_hash, RevokedToken.expires_at, RevokedToken.revoked_at)
+            .where(RevokedToken.id > self.last_id, RevokedToken.expires_at > now)
+            .order_by(RevokedToken.id)
+        )).all()
+        settled = now - timedelta(seconds=SETTLE_SECONDS)
+        advancing = True
+        for row in rows:
+            security.mark_revoked(bytes.fromhex(row.token_hash), as_utc(row.expires_at).timestamp())
+            advancing = advancing and row.revoked_at is not None and as_utc(row.revoked_at) <= settled
+            if advancing:
+                self.last_id = row.id
+
+    async def revoke(self, db: AsyncSession, token: str) -> None:
+        """Revoke a token here and record it for the other workers"""
+        revoked = security.revoke_token(token)
+        if revoked is None:
+            return
+        key, expires_at = revoked
+        # Rows whose token has expired anyway are dropped as new ones come in
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+        statement = (postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert)(RevokedToken)
+        await db.execute(
+            statement.on_conflict_do_nothing(index_elements=[RevokedToken.token_hash]),
+            {"token_hash": key.hex(), "expires_at": datetime.fromtimestamp(expires_at, timezone.utc)}
+        )
+        await db.commit()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.load(db)
+            except Exception as exc:
+                logger.warning("Could not refresh revoked tokens: %r", exc)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_revocations = TokenRevocations(settings.TOKEN_REVOCATION_POLL_SECONDS)
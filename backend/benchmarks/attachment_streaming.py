@@ -0,0 +1,127 @@
+"""
+Attachment store: upload/download throughput and peak memory for a large file.
+
+Streams a consultation-sized recording through a uvicorn server: an upload, a
+full download, a resumed download of the second half and a burst of small
+seeks. Peak Python heap growth during each step (tracemalloc, client and server
+together) must stay under --ceiling-mb whatever the file size; the run exits
+non-zero if it doesn't.
+
+    cd backend
+    python -m benchmarks.attachment_streaming --mb 40
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("ATTACHMENT_STORE_DIR", f"{_db_dir}/attachments")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.health_record import HealthRecord  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+PORT = 8769
+PIECE = 256 * 1024
+
+
+def file_pieces(size: int):
+    """Pseudo-random file content, generated piece by piece rather than held in memory"""
+    generator = random.Random(size)
+    sent = 0
+    while sent < size:
+        piece = generator.randbytes(min(PIECE, size - sent))
+        sent += len(piece)
+        yield piece
+
+
+def timed(label, size, fn):
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = (tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20
+    print(f"{label:<26} {size / 2 ** 20 / elapsed:8.1f} MB/s   {elapsed * 1000:8.0f} ms   peak heap +{peak:5.1f} MB")
+    return result, peak
+
+
+def drain(client, url, headers) -> int:
+    received = 0
+    with client.stream("GET", url, headers=headers) as response:
+        response.raise_for_status()
+        for piece in response.iter_bytes():
+            received += len(piece)
+    return received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mb", type=int, default=40, help="file size")
+    parser.add_argument("--seeks", type=int, default=50, help="random 16 KB range reads")
+    parser.add_argument("--ceiling-mb", type=float, default=8.0)
+    args = parser.parse_args()
+    size = args.mb * 2 ** 20
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+        conn.execute(insert(HealthRecord), [{
+            "id": 1, "user_id": 1, "consultation_date": datetime(2024, 9, 20),
+            "doctor_name": "Dr. Sharma", "consultation_type": "general", "is_locked": False,
+        }])
+    engine.dispose()
+
+    headers = auth_headers(1)
+    peaks = []
+    tracemalloc.start()
+    with serve(app, PORT), httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=None) as client:
+        upload, peak = timed("upload", size, lambda: client.post(
+            "/api/v1/records/1/attachments?filename=consultation.m4a",
+            content=file_pieces(size),
+            headers={**headers, "Content-Type": "audio/mp4"},
+        ))
+        upload.raise_for_status()
+        peaks.append(peak)
+        url = f"/api/v1/records/1/attachments/{upload.json()['id']}"
+
+        received, peak = timed("download", size, lambda: drain(client, url, headers))
+        assert received == size, received
+        peaks.append(peak)
+
+        half = size // 2
+        received, peak = timed("resume second half", size - half, lambda: drain(
+            client, url, {**headers, "Range": f"bytes={half}-"}
+        ))
+        assert received == size - half, received
+        peaks.append(peak)
+
+        offsets = [random.randrange(size - 16384) for _ in range(args.seeks)]
+        _, peak = timed(f"{args.seeks} seeks x 16 KB", args.seeks * 16384, lambda: [
+            drain(client, url, {**headers, "Range": f"bytes={offset}-{offset + 16383}"}) for offset in offsets
+        ])
+        peaks.append(peak)
+    tracemalloc.stop()
+
+    worst = max(peaks)
+    verdict = "ok" if worst <= args.ceiling_mb else "EXCEEDED"
+    print(f"peak heap growth {worst:.1f} MB for a {args.mb} MB file (ceiling {args.ceiling_mb} MB): {verdict}")
+    sys.exit(0 if worst <= args.ceiling_mb else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Bulk registration: one POST /auth/register per patient vs one /users/bulk upload.
+
+The per-row path is timed on a sample and reported as patients per second;
+the bulk path imports the whole file. Both hash at the configured bcrypt cost
+on the server's password hashing pool (PASSWORD_HASH_WORKERS).
+
+    cd backend
+    python -m benchmarks.bulk_registration --rows 2000 --sample 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+import orjson  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+PORT = 8768
+
+
+def patient(number: int) -> dict:
+    return {
+        "phone_number": f"7{number:09d}",
+        "password": "village-pass",
+        "name": f"Patient {number}",
+        "age": 20 + number % 60,
+        "gender": "female" if number % 2 else "male",
+        "village": "Rampur",
+        "district": "Sitapur",
+        "state": "Uttar Pradesh",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000, help="patients in the bulk file")
+    parser.add_argument("--sample", type=int, default=50, help="patients registered one at a time")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+    engine.dispose()
+
+    body = b"".join(orjson.dumps(patient(number)) + b"\n" for number in range(args.sample, args.sample + args.rows))
+    with serve(app, PORT), httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=None) as client:
+        started = time.perf_counter()
+        for number in range(args.sample):
+            client.post("/api/v1/auth/register", json=patient(number)).raise_for_status()
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = client.post(
+            "/api/v1/users/bulk",
+            files={"file": ("patients.ndjson", body, "application/x-ndjson")},
+            headers=auth_headers(1),
+        )
+        response.raise_for_status()
+        bulk = time.perf_counter() - started
+    result = response.json()
+
+    per_row = args.sample / single
+    print(f"bcrypt rounds {settings.PASSWORD_BCRYPT_ROUNDS}, hashing workers {settings.PASSWORD_HASH_WORKERS}")
+    print(f"one at a time   {per_row:8.1f} patients/s   (10k patients in {10000 / per_row / 60:6.1f} min)")
+    print(
+        f"bulk upload     {result['created'] / bulk:8.1f} patients/s   (10k patients in {10000 * bulk / result['created'] / 60:6.1f} min)"
+        f"   created {result['created']}, failed {result['failed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
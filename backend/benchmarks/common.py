@@ -0,0 +1,49 @@
+import threading
+import time
+
+import uvicorn
+
+
+class BackgroundServer(uvicorn.Server):
+    """uvicorn on its own thread, so a blocked server loop shows up in client timings"""
+
+    def install_signal_handlers(self):
+        pass
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        while not self.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.should_exit = True
+        self.thread.join()
+
+
+def serve(app, port: int) -> BackgroundServer:
+    return BackgroundServer(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed_users(connection, count: int) -> None:
+    """Users 1..count, so requests can authenticate as any of them"""
+    from sqlalchemy import insert
+
+    from app.models.user import User
+
+    connection.execute(insert(User), [
+        {"id": user_id, "phone_number": f"9{user_id:09d}", "name": f"User {user_id}"}
+        for user_id in range(1, count + 1)
+    ])
+
+
+def auth_headers(user_id: int) -> dict:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
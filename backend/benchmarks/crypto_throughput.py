@@ -0,0 +1,81 @@
+"""
+Health-record field encryption: throughput and stored size.
+
+Compares the old per-call path (derive the key and build a Fernet object on
+every call, base64 the token again) with the cached RecordCipher, one value at
+a time and in batches over the crypto thread pool, for short and long fields.
+
+    cd backend
+    python -m benchmarks.crypto_throughput --values 5000
+"""
+import argparse
+import asyncio
+import base64
+import time
+
+from cryptography.fernet import Fernet
+
+from app.core.config import settings
+from app.core.crypto import cipher, fernet_key
+
+SIZES = {"summary (200 B)": 200, "transcript (4 KB)": 4096}
+
+
+def legacy_encrypt(data: str) -> str:
+    f = Fernet(fernet_key(settings.ENCRYPTION_KEY))
+    return base64.urlsafe_b64encode(f.encrypt(data.encode())).decode()
+
+
+def legacy_decrypt(encrypted_data: str) -> str:
+    f = Fernet(fernet_key(settings.ENCRYPTION_KEY))
+    return f.decrypt(base64.urlsafe_b64decode(encrypted_data.encode())).decode()
+
+
+def rate(fn, count):
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--values", type=int, default=5000)
+    args = parser.parse_args()
+
+    record_cipher = cipher()
+    print(f"{'':<20} {'encrypt/s':>12} {'decrypt/s':>12} {'stored bytes':>14}")
+    for label, size in SIZES.items():
+        values = [("नमस्ते patient notes " * size)[:size] for _ in range(args.values)]
+        legacy = [legacy_encrypt(value) for value in values]
+        stored = record_cipher.encrypt_many(values)
+        assert record_cipher.decrypt_many(stored) == values
+
+        rows = {
+            "per-call Fernet": (
+                rate(lambda: [legacy_encrypt(v) for v in values], args.values),
+                rate(lambda: [legacy_decrypt(v) for v in legacy], args.values),
+                len(legacy[0]),
+            ),
+            "cached cipher": (
+                rate(lambda: [record_cipher.encrypt(v) for v in values], args.values),
+                rate(lambda: [record_cipher.decrypt(v) for v in stored], args.values),
+                len(stored[0]),
+            ),
+            f"batch ({settings.CRYPTO_THREADS} threads)": (
+                rate(lambda: record_cipher.encrypt_many(values), args.values),
+                rate(lambda: record_cipher.decrypt_many(stored), args.values),
+                len(stored[0]),
+            ),
+            "batch, async": (
+                rate(lambda: asyncio.run(record_cipher.aencrypt_many(values)), args.values),
+                rate(lambda: asyncio.run(record_cipher.adecrypt_many(stored)), args.values),
+                len(stored[0]),
+            ),
+        }
+        print(label)
+        for name, (encrypt_rate, decrypt_rate, stored_bytes) in rows.items():
+            print(f"  {name:<18} {encrypt_rate:12.0f} {decrypt_rate:12.0f} {stored_bytes:14d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Device reading ingestion: large glucometer, oximeter and BP batches.
+
+Uploads --readings readings per device format (NDJSON, then compact msgpack)
+to POST /devices/sync on a uvicorn server and reports readings per second.
+Each batch is then uploaded again, as a device re-syncing after a dropped
+connection would: every reading must come back as a duplicate of its
+earlier copy, the table must hold each reading once with one change log
+entry, and the run exits non-zero otherwise.
+
+    cd backend
+    python -m benchmarks.device_ingestion --readings 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+import msgpack  # noqa: E402
+import orjson  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.change_log import ChangeLog  # noqa: E402
+from app.models.device_data import DeviceData  # noqa: E402
+from app.schemas.device import MEASUREMENT_SCHEMAS  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+PORT = 8773
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# device type, measurement, unit, value generator in MEASUREMENT_SCHEMAS order
+DEVICES = [
+    ("glucometer", "blood_sugar", "mg/dL", lambda: [random.randint(70, 220)]),
+    ("pulse_oximeter", "oxygen_saturation", "%", lambda: [random.randint(90, 100), random.randint(55, 110)]),
+    ("bp_monitor", "blood_pressure", "mmHg",
+     lambda: [random.randint(100, 160), random.randint(60, 100), random.randint(55, 110)]),
+]
+
+
+def series_for(device_type: str, count: int):
+    """(unix time, values) for count readings a minute apart"""
+    _, _, _, values = next(device for device in DEVICES if device[0] == device_type)
+    return [(int((START + timedelta(minutes=n)).timestamp()), values()) for n in range(count)]
+
+
+def ndjson_batch(device_id: str, device_type: str, readings) -> bytes:
+    _, measurement_type, unit, _ = next(device for device in DEVICES if device[0] == device_type)
+    fields = list(MEASUREMENT_SCHEMAS[measurement_type].model_fields)
+    return b"\n".join(orjson.dumps({
+        "device_id": device_id, "device_type": device_type, "measurement_type": measurement_type, "unit": unit,
+        "measured_at": datetime.fromtimestamp(at, timezone.utc).isoformat(), "values": dict(zip(fields, values)),
+    }) for at, values in readings)
+
+
+def msgpack_batch(device_id: str, device_type: str, readings) -> bytes:
+    _, measurement_type, unit, _ = next(device for device in DEVICES if device[0] == device_type)
+    return msgpack.packb({
+        "device_id": device_id, "device_type": device_type,
+        "series": [{"measurement_type": measurement_type, "unit": unit, "readings": [[at, *values] for at, values in readings]}],
+    })
+
+
+def upload(client, body: bytes, content_type: str) -> dict:
+    response = client.post("/api/v1/devices/sync", content=body, headers={"Content-Type": content_type})
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=50000, help="readings per format")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+
+    per_device = args.readings // len(DEVICES)
+    formats = [("ndjson", "application/x-ndjson", ndjson_batch), ("msgpack", "application/msgpack", msgpack_batch)]
+    batches = {
+        name: [
+            (content_type, build(f"{name}-{device_type}", device_type, series_for(device_type, per_device)))
+            for device_type, *_ in DEVICES
+        ]
+        for name, content_type, build in formats
+    }
+
+    failed = False
+    with serve(app, PORT), httpx.Client(
+        base_url=f"http://127.0.0.1:{PORT}", headers=auth_headers(1), timeout=None
+    ) as client:
+        for name, uploads in batches.items():
+            size = sum(len(body) for _, body in uploads)
+            for attempt in ("first upload", "re-sync"):
+                started = time.perf_counter()
+                results = [upload(client, body, content_type) for content_type, body in uploads]
+                elapsed = time.perf_counter() - started
+                stored = sum(result["stored"] for result in results)
+                duplicates = sum(result["duplicates"] for result in results)
+                errors = sum(len(result["errors"]) for result in results)
+                print(
+                    f"{name:8} {attempt:12} {stored} stored in {elapsed:.2f} s, "
+                    f"{(stored + duplicates) / elapsed:,.0f} readings/s ({size / 1024 / 1024:.1f} MB), "
+                    f"{duplicates} duplicates, {errors} errors"
+                )
+                expected_stored = per_device * len(DEVICES) if attempt == "first upload" else 0
+                failed |= errors > 0 or stored != expected_stored or stored + duplicates != per_device * len(DEVICES)
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(func.count()).select_from(DeviceData)).scalar()
+        distinct = conn.execute(select(func.count()).select_from(
+            select(DeviceData.device_id, DeviceData.measurement_type, DeviceData.measured_at).distinct().subquery()
+        )).scalar()
+        logged = conn.execute(
+            select(func.count()).select_from(ChangeLog).where(ChangeLog.table_name == "device_data")
+        ).scalar()
+    engine.dispose()
+
+    expected = per_device * len(DEVICES) * len(formats)
+    print(f"{rows} device_data rows, {distinct} distinct readings, {logged} change log entries, {expected} expected")
+    if failed or rows != expected or distinct != rows or logged != rows:
+        print("FAILED: re-synced readings were not stored exactly once")
+        sys.exit(1)
+    print("every reading stored exactly once across re-syncs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Load test for the real-time event hub.
+
+Two phases:
+
+* hub: tens of thousands of simulated clients subscribe in-process, a share of
+  them never read (to exercise backpressure), and events are published at a
+  fixed rate. Reports delivery latency, resync drops and memory per connection.
+* sse: real ``/api/v1/events/stream`` clients over HTTP against uvicorn, with
+  ``points_earned`` events triggered through ``POST /medicines/log``.
+
+    cd backend
+    python -m benchmarks.event_hub_load --connections 20000 --sse-clients 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+import httpx  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.event_hub import EventHub  # noqa: E402
+from benchmarks.common import auth_headers, percentile, seed_users, serve  # noqa: E402
+
+
+async def simulated_client(subscription, latencies, stalled):
+    if stalled:
+        await asyncio.Event().wait()
+    while True:
+        event = await subscription.get()
+        if event["type"] == "resync":
+            return
+        latencies.append((time.perf_counter() - event["sent_at"]) * 1000)
+
+
+async def hub_phase(connections: int, users: int, events: int, rate: float, stalled_share: float):
+    hub = EventHub()
+    latencies = []
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    subscriptions = [hub.subscribe(i % users) for i in range(connections)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    clients = [
+        asyncio.create_task(simulated_client(sub, latencies, random.random() < stalled_share))
+        for sub in subscriptions
+    ]
+    await asyncio.sleep(0)
+
+    interval = 1 / rate
+    start = time.perf_counter()
+    for i in range(events):
+        hub.publish(random.randrange(users), {"type": "points_earned", "sent_at": time.perf_counter()})
+        await asyncio.sleep(max(0, start + (i + 1) * interval - time.perf_counter()))
+    await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - start
+
+    for task in clients:
+        task.cancel()
+    await asyncio.gather(*clients, return_exceptions=True)
+
+    print(f"hub  connections={connections} users={users} published={hub.published} in {elapsed:.1f}s")
+    print(f"hub  memory/connection={(after - before) / connections:.0f}B resync_drops={hub.dropped}")
+    if latencies:
+        print(
+            f"hub  delivered={len(latencies)} p50={statistics.median(latencies):.3f}ms "
+            f"p99={percentile(latencies, 99):.3f}ms"
+        )
+
+
+async def sse_client(client, headers, ready, latencies, sent_at):
+    async with client.stream("GET", "/api/v1/events/stream", headers=headers) as response:
+        ready.release()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                event = json.loads(line[len("data: "):])
+                latencies.append((time.perf_counter() - sent_at[event["medicine_id"]]) * 1000)
+
+
+async def sse_phase(clients: int, events: int, port: int):
+    latencies = []
+    sent_at = {}
+    ready = asyncio.Semaphore(0)
+    limits = httpx.Limits(max_connections=clients + 10)
+    timeout = httpx.Timeout(None)
+
+    headers = {user_id: auth_headers(user_id) for user_id in range(1, 51)}
+    async with httpx.AsyncClient(base_url=f"http://localhost:{port}", limits=limits, timeout=timeout) as client:
+        readers = [
+            asyncio.create_task(sse_client(client, headers[i % 50 + 1], ready, latencies, sent_at))
+            for i in range(clients)
+        ]
+        for _ in range(clients):
+            await ready.acquire()
+
+        for i in range(events):
+            sent_at[i] = time.perf_counter()
+            await client.post("/api/v1/medicines/log", params={"medicine_id": i}, headers=headers[i % 50 + 1])
+        await asyncio.sleep(1)
+
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    print(f"sse  clients={clients} events={events} delivered={len(latencies)}")
+    if latencies:
+        print(f"sse  p50={statistics.median(latencies):.2f}ms p99={percentile(latencies, 99):.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=2000, help="events per second")
+    parser.add_argument("--stalled-share", type=float, default=0.01)
+    parser.add_argument("--sse-clients", type=int, default=200)
+    parser.add_argument("--sse-events", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    asyncio.run(hub_phase(args.connections, args.users, args.events, args.rate, args.stalled_share))
+    if args.sse_clients:
+        upgrade_schema()
+        with engine.begin() as conn:
+            seed_users(conn, 50)
+        with serve(app, args.port):
+            asyncio.run(sse_phase(args.sse_clients, args.sse_events, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+History export: stream a patient with years of data and watch memory.
+
+Seeds one patient with --rows rows spread across five years: health records
+with encrypted content, medicines and their dose logs, symptom logs, device
+readings and appointments. The NDJSON and ZIP exports are then streamed from
+a uvicorn server. Every row must come back, locked health records without
+their content, and peak Python heap growth (tracemalloc, client and server
+together) must stay under --ceiling-mb whatever the row count; the run exits
+non-zero otherwise.
+
+    cd backend
+    python -m benchmarks.history_export --rows 1000000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+import orjson  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.crypto import cipher  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.appointment import Appointment  # noqa: E402
+from app.models.device_data import DeviceData  # noqa: E402
+from app.models.health_record import HealthRecord  # noqa: E402
+from app.models.medicine import Medicine, MedicineLog  # noqa: E402
+from app.models.symptom_log import SymptomLog  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+PORT = 8771
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+SPAN = timedelta(days=5 * 365)
+INSERT_BATCH = 20000
+LOCKED_EVERY = 10  # every tenth health record is still locked
+
+# Share of the rows per table; readings and dose logs dominate real histories
+SHARES = [
+    (HealthRecord, 0.002),
+    (Medicine, 0.0005),
+    (MedicineLog, 0.4),
+    (SymptomLog, 0.05),
+    (Appointment, 0.0025),
+    (DeviceData, 0.545),
+]
+
+
+def when(index: int, count: int) -> datetime:
+    return START + SPAN * index / max(count, 1)
+
+
+def fixture_rows(model, count: int, medicines: int):
+    encrypted = {
+        "encrypted_transcript": cipher().encrypt("Patient reports fever for three days. " * 20),
+        "encrypted_summary": cipher().encrypt("Viral fever; rest and fluids"),
+        "encrypted_prescription": cipher().encrypt("Paracetamol 500 mg, twice daily for 3 days"),
+    }
+    for index in range(count):
+        at = when(index, count)
+        if model is HealthRecord:
+            yield {"user_id": 1, "consultation_date": at, "doctor_name": "Dr. Sharma",
+                   "consultation_type": "general", "is_locked": index % LOCKED_EVERY == 0, "unlock_count": 0, **encrypted}
+        elif model is Medicine:
+            yield {"user_id": 1, "name": f"Medicine {index}", "dosage": "500 mg", "frequency": "twice_daily",
+                   "start_date": at, "is_active": True}
+        elif model is MedicineLog:
+            yield {"user_id": 1, "medicine_id": index % medicines + 1, "scheduled_time": at,
+                   "taken_time": at, "status": "taken"}
+        elif model is SymptomLog:
+            yield {"user_id": 1, "symptom_type": "headache", "severity": 4, "logged_at": at,
+                   "description": "Mild, evening"}
+        elif model is Appointment:
+            yield {"user_id": 1, "doctor_name": "Dr. Rao", "appointment_date": at,
+                   "appointment_type": "in-person", "status": "completed"}
+        else:
+            yield {"user_id": 1, "device_type": "bp_monitor", "measurement_type": "blood_pressure",
+                   "values": '{"systolic": 122, "diastolic": 81}', "unit": "mmHg", "measured_at": at}
+
+
+def seed(engine, total: int) -> dict:
+    counts = {model: max(1, int(total * share)) for model, share in SHARES}
+    counts[DeviceData] += total - sum(counts.values())
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+    for model, count in counts.items():
+        rows = fixture_rows(model, count, counts[Medicine])
+        while True:
+            batch = [row for _, row in zip(range(INSERT_BATCH), rows)]
+            if not batch:
+                break
+            with engine.begin() as conn:
+                conn.execute(insert(model), batch)
+    return {model.__tablename__: count for model, count in counts.items()}
+
+
+def measure(label: str, fn):
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = (tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20
+    return result, elapsed, peak
+
+
+def leaked(record: dict) -> bool:
+    """A locked health record exported with its content"""
+    return bool(record["is_locked"]) and any(
+        record[name] is not None for name in ("transcript", "audio_url", "summary", "prescription")
+    )
+
+
+def stream_ndjson(client, headers) -> tuple:
+    lines = received = leaks = 0
+    with client.stream("GET", "/api/v1/users/1/export", headers=headers) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            lines += 1
+            received += len(line) + 1
+            if line.startswith('{"table":"health_records"'):
+                leaks += leaked(orjson.loads(line)["row"])
+    return lines - 1, received, leaks  # less the header line
+
+
+def stream_zip(client, headers, path: str) -> tuple:
+    received = 0
+    with client.stream("GET", "/api/v1/users/1/export?format=zip", headers=headers) as response, open(path, "wb") as out:
+        response.raise_for_status()
+        for piece in response.iter_bytes():
+            received += len(piece)
+            out.write(piece)
+    return received
+
+
+def count_zip_rows(path: str) -> tuple:
+    rows = leaks = 0
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if name.endswith(".ndjson"):
+                with archive.open(name) as entry:
+                    for line in io.BufferedReader(entry):
+                        rows += 1
+                        if name == "health_records.ndjson":
+                            leaks += leaked(orjson.loads(line))
+    return rows, leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--ceiling-mb", type=float, default=32.0)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    started = time.perf_counter()
+    counts = seed(engine, args.rows)
+    engine.dispose()
+    print(f"seeded {args.rows} rows in {time.perf_counter() - started:.0f} s: {counts}")
+
+    headers = auth_headers(1)
+    zip_path = os.path.join(_db_dir, "export.zip")
+    tracemalloc.start()
+    with serve(app, PORT), httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=None) as client:
+        (lines, size, ndjson_leaks), ndjson_time, ndjson_peak = measure("ndjson", lambda: stream_ndjson(client, headers))
+        zip_size, zip_time, zip_peak = measure("zip", lambda: stream_zip(client, headers, zip_path))
+    tracemalloc.stop()
+    zip_rows, zip_leaks = count_zip_rows(zip_path)
+
+    for label, rows, size, elapsed, peak in (
+        ("ndjson", lines, size, ndjson_time, ndjson_peak),
+        ("zip", zip_rows, zip_size, zip_time, zip_peak),
+    ):
+        print(f"{label:<7} {rows:>9} rows  {size / 2 ** 20:8.1f} MB  {elapsed:6.1f} s  "
+              f"{rows / elapsed:9.0f} rows/s  peak heap +{peak:5.1f} MB")
+
+    worst = max(ndjson_peak, zip_peak)
+    complete = lines == args.rows and zip_rows == args.rows
+    redacted = ndjson_leaks == zip_leaks == 0
+    ok = complete and redacted and worst <= args.ceiling_mb
+    print(f"all rows exported: {complete}; locked records redacted: {redacted}; peak heap growth {worst:.1f} MB (ceiling {args.ceiling_mb} MB): "
+          f"{'ok' if ok else 'FAILED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
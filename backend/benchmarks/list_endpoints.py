@@ -0,0 +1,119 @@
+"""
+Requests per second on the list endpoints, before and after the fast response path.
+
+"Before" routes are registered next to the real ones and reproduce the old
+shape: hand-built models (or plain dicts) returned through ``response_model``
+and the stdlib ``JSONResponse``. "After" are the real endpoints, which
+validate once and serialize with pydantic-core/orjson.
+
+    cd backend
+    python -m benchmarks.list_endpoints --reminders 300 --requests 300
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.api.api_v1.endpoints.reminders import ReminderResponse, select_reminders  # noqa: E402
+from app.core.database import engine, get_async_db  # noqa: E402
+from app.core.responses import model_response  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.medicine import Medicine  # noqa: E402
+from app.models.reminder import Reminder  # noqa: E402
+from app.schemas.medicine import MedicineLogResponse  # noqa: E402
+from benchmarks.common import auth_headers, seed_users  # noqa: E402
+
+MOCK_LOG = {
+    "id": 1, "user_id": 1, "medicine_id": 1,
+    "scheduled_time": "2024-09-24T08:00:00Z", "taken_time": "2024-09-24T08:15:00Z",
+    "status": "taken", "notes": None, "side_effects": None,
+    "created_at": "2024-09-24T08:15:00Z",
+}
+
+
+@app.get("/bench/before/reminders", response_model=List[ReminderResponse], response_class=JSONResponse)
+async def reminders_before(user_id: int = 1, db: AsyncSession = Depends(get_async_db)):
+    rows = (await db.execute(select_reminders().where(Reminder.user_id == user_id))).scalars().all()
+    return [
+        ReminderResponse(
+            id=r.id, medicine_id=r.medicine_id, user_id=r.user_id, time=r.time,
+            frequency=r.frequency, enabled=r.enabled, sound=r.sound,
+            snooze_minutes=r.snooze_minutes, medicine_name=r.medicine_name,
+            medicine_dosage=r.medicine_dosage,
+        )
+        for r in rows
+    ]
+
+
+@app.get("/bench/before/medicine-logs", response_model=List[MedicineLogResponse], response_class=JSONResponse)
+def medicine_logs_before(rows: int = 2):
+    return [dict(MOCK_LOG, id=i) for i in range(rows)]
+
+
+@app.get("/bench/after/medicine-logs", response_model=List[MedicineLogResponse])
+def medicine_logs_after(rows: int = 2):
+    return model_response(List[MedicineLogResponse], [dict(MOCK_LOG, id=i) for i in range(rows)])
+
+
+def seed(count: int) -> None:
+    upgrade_schema()
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+        conn.execute(insert(Medicine), [{
+            "id": 1, "user_id": 1, "name": "Paracetamol", "dosage": "500mg",
+            "frequency": "morning", "start_date": datetime(2024, 9, 20),
+        }])
+        conn.execute(insert(Reminder), [
+            {"medicine_id": 1, "user_id": 1, "time": "08:00", "frequency": f"slot{i}"}
+            for i in range(count)
+        ])
+
+
+async def requests_per_second(client, url, total):
+    await client.get(url)
+    start = time.perf_counter()
+    for _ in range(total):
+        response = await client.get(url)
+        response.raise_for_status()
+    return total / (time.perf_counter() - start)
+
+
+async def run(args):
+    cases = [
+        ("reminders", "/bench/before/reminders", "/api/v1/reminders/"),
+        ("medicine_logs", f"/bench/before/medicine-logs?rows={args.logs}", f"/bench/after/medicine-logs?rows={args.logs}"),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", headers=auth_headers(1)) as client:
+        for name, before, after in cases:
+            before_rps = await requests_per_second(client, before, args.requests)
+            after_rps = await requests_per_second(client, after, args.requests)
+            print(f"{name:<14} before={before_rps:8.0f} req/s  after={after_rps:8.0f} req/s  x{after_rps / before_rps:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reminders", type=int, default=300)
+    parser.add_argument("--logs", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    seed(args.reminders)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
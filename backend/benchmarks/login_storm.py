@@ -0,0 +1,121 @@
+"""
+Login storm: many clients signing in at once while others use the app.
+
+Runs the same storm twice against a uvicorn server: once hashing on the request
+threadpool with no queue limit, as before, and once on the bounded process pool
+with PASSWORD_HASH_MAX_PENDING. Reports login latency and rejections, and the
+latency of two unrelated endpoints: /points (sync, runs on the threadpool) and
+/users/me (async).
+
+    cd backend
+    python -m benchmarks.login_storm --logins 64 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.passwords import password_hasher  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import auth_headers, percentile, seed_users, serve  # noqa: E402
+
+PORT = 8767
+PASSWORD = "storm-password"
+PROBES = {"points (sync)": "/api/v1/points/", "users/me (async)": "/api/v1/users/me"}
+
+
+async def log_in(client, user_id, stop, stats):
+    body = {"phone_number": f"9{user_id:09d}", "password": PASSWORD}
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.post("/api/v1/auth/login", json=body)
+        if response.status_code == 503:
+            stats["rejected"] += 1
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+            continue
+        response.raise_for_status()
+        stats["latencies"].append(time.perf_counter() - started)
+
+
+async def probe(client, path, headers, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.05)
+
+
+async def storm(logins, users, seconds):
+    limits = httpx.Limits(max_connections=logins + len(PROBES) + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120) as client:
+        stop = asyncio.Event()
+        stats = {"latencies": [], "rejected": 0}
+        probes = {label: [] for label in PROBES}
+        tasks = [asyncio.create_task(log_in(client, 1 + i % users, stop, stats)) for i in range(logins)]
+        headers = auth_headers(1)
+        tasks += [
+            asyncio.create_task(probe(client, path, headers, stop, probes[label]))
+            for label, path in PROBES.items()
+        ]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return stats, probes
+
+
+def ms(samples, pct):
+    return percentile(samples, pct) * 1000 if samples else float("nan")
+
+
+def run(label, workers, max_pending, logins, users, seconds):
+    password_hasher.workers = workers
+    password_hasher.max_pending = max_pending
+    with serve(app, PORT):
+        stats, probes = asyncio.run(storm(logins, users, seconds))
+    latencies = stats["latencies"]
+    print(
+        f"{label:<20} logins {len(latencies) / seconds:6.1f}/s   rejected {stats['rejected']:5d}"
+        f"   p50 {ms(latencies, 50):7.0f} ms   p99 {ms(latencies, 99):7.0f} ms"
+    )
+    for probe_label, samples in probes.items():
+        print(
+            f"{'':<20} {probe_label:<18} {len(samples):5d} requests"
+            f"   p50 {ms(samples, 50):7.1f} ms   p99 {ms(samples, 99):7.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64, help="concurrent clients signing in")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        seed_users(conn, args.users)
+        conn.execute(update(User).values(hashed_password=get_password_hash(PASSWORD)))
+    engine.dispose()
+
+    workers = settings.PASSWORD_HASH_WORKERS or 2
+    run("request threadpool", 0, args.logins, args.logins, args.users, args.seconds)
+    run(f"process pool ({workers})", workers, settings.PASSWORD_HASH_MAX_PENDING, args.logins, args.users, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
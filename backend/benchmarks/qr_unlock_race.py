@@ -0,0 +1,111 @@
+"""
+QR unlock race: many scans of the same code arriving at once.
+
+Gives each record a known single-use QR key, then fires --scans concurrent
+unlocks per record at a uvicorn server. Exactly one scan per record may
+succeed, the record must show a single unlock, and every other scan must be
+refused; the run exits non-zero otherwise. Also reports unlock latency and
+how long issuing a new key and rendering its QR code takes.
+
+    cd backend
+    python -m benchmarks.qr_unlock_race --records 20 --scans 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.crypto import cipher  # noqa: E402
+from app.core.database import build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.core.security import qr_key_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.health_record import HealthRecord  # noqa: E402
+from benchmarks.common import auth_headers, percentile, seed_users, serve  # noqa: E402
+
+PORT = 8770
+
+
+def key_for(record_id: int) -> str:
+    return f"bench-qr-key-{record_id:06d}"
+
+
+async def scan(client, record_id, headers, latencies):
+    started = time.perf_counter()
+    response = await client.post(
+        f"/api/v1/records/{record_id}/unlock", json={"qr_key": key_for(record_id)}, headers=headers
+    )
+    latencies.append(time.perf_counter() - started)
+    return record_id, response.status_code
+
+
+async def race(records: int, scans: int, headers: dict):
+    latencies = []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=None) as client:
+        results = await asyncio.gather(*(
+            scan(client, record_id, headers, latencies)
+            for _ in range(scans) for record_id in range(1, records + 1)
+        ))
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20)
+    parser.add_argument("--scans", type=int, default=16, help="concurrent scans of each record's code")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    summary = cipher().encrypt("Viral fever; rest and fluids")
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+        conn.execute(insert(HealthRecord), [{
+            "id": record_id, "user_id": 1, "consultation_date": datetime(2024, 9, 20),
+            "doctor_name": "Dr. Sharma", "consultation_type": "general", "is_locked": True,
+            "unlock_count": 0, "encrypted_summary": summary, "qr_key_hash": qr_key_hash(key_for(record_id)),
+        } for record_id in range(1, args.records + 1)])
+
+    headers = auth_headers(1)
+    with serve(app, PORT):
+        results, latencies = asyncio.run(race(args.records, args.scans, headers))
+        with httpx.Client(base_url=f"http://127.0.0.1:{PORT}", headers=headers) as client:
+            started = time.perf_counter()
+            client.post("/api/v1/records/1/qr").raise_for_status()
+            render = time.perf_counter() - started
+
+    winners = Counter(record_id for record_id, code in results if code == 200)
+    codes = Counter(code for _, code in results)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(HealthRecord.id, HealthRecord.is_locked, HealthRecord.unlock_count, HealthRecord.qr_key_hash)
+            .where(HealthRecord.id <= args.records)
+        ).all()
+    engine.dispose()
+
+    print(f"{len(results)} scans of {args.records} codes: {dict(codes)}")
+    print(f"unlock latency p50 {percentile(latencies, 50) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"QR code: issue and render {render * 1000:.1f} ms")
+    bad = [record_id for record_id in range(1, args.records + 1) if winners[record_id] != 1]
+    # Record 1 was given a new key by the QR reissue above
+    bad += [row.id for row in rows if row.unlock_count != 1 or (row.id != 1 and (row.is_locked or row.qr_key_hash))]
+    if bad or codes[200] + codes[403] != len(results):
+        print(f"FAILED: records {sorted(set(bad))} were not unlocked exactly once")
+        sys.exit(1)
+    print("every code unlocked its record exactly once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Check that the hot per-user queries are served by the migration-managed indexes.
+
+Upgrades a scratch SQLite database to the migration head, runs
+``EXPLAIN QUERY PLAN`` for each query and fails if it scans the table or
+sorts in a temporary b-tree instead of walking the expected index.
+
+    cd backend
+    python -m benchmarks.query_plans
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+from sqlalchemy import select, text, tuple_  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.models import Appointment, DeviceData, HealthRecord, Medicine, MedicineLog, Reminder, SymptomLog  # noqa: E402
+
+# (label, query, columns of the index it should use)
+HOT_QUERIES = [
+    (
+        "health records page",
+        select(HealthRecord.id, HealthRecord.doctor_name)
+        .where(
+            HealthRecord.user_id == 1,
+            tuple_(HealthRecord.consultation_date, HealthRecord.id) < tuple_(datetime(2024, 1, 1), 10)
+        )
+        .order_by(HealthRecord.consultation_date.desc(), HealthRecord.id.desc()),
+        ("user_id", "consultation_date", "id"),
+    ),
+    (
+        "medicines list",
+        select(Medicine.id, Medicine.name).where(Medicine.user_id == 1, Medicine.id > 10).order_by(Medicine.id),
+        ("user_id", "id"),
+    ),
+    (
+        "medicine logs page",
+        select(MedicineLog.id, MedicineLog.status)
+        .where(
+            MedicineLog.user_id == 1,
+            tuple_(MedicineLog.scheduled_time, MedicineLog.id) < tuple_(datetime(2024, 1, 1), 10)
+        )
+        .order_by(MedicineLog.scheduled_time.desc(), MedicineLog.id.desc()),
+        ("user_id", "scheduled_time", "id"),
+    ),
+    (
+        "medicine logs by medicine",
+        select(MedicineLog.id).where(MedicineLog.medicine_id == 1),
+        ("medicine_id",),
+    ),
+    (
+        "device readings by type",
+        select(DeviceData.id, DeviceData.values)
+        .where(DeviceData.user_id == 1, DeviceData.measurement_type == "blood_pressure")
+        .order_by(DeviceData.measured_at.desc()),
+        ("user_id", "measurement_type", "measured_at"),
+    ),
+    (
+        "symptom history",
+        select(SymptomLog.id).where(SymptomLog.user_id == 1).order_by(SymptomLog.logged_at.desc()),
+        ("user_id", "logged_at"),
+    ),
+    (
+        "reminder slot",
+        select(Reminder.id).where(
+            Reminder.user_id == 1, Reminder.medicine_id == 1, Reminder.frequency == "morning"
+        ),
+        ("user_id", "medicine_id", "frequency"),
+    ),
+    (
+        "upcoming appointments",
+        select(Appointment.id)
+        .where(Appointment.user_id == 1, Appointment.appointment_date >= datetime(2024, 1, 1))
+        .order_by(Appointment.appointment_date),
+        ("user_id", "appointment_date"),
+    ),
+]
+
+
+def index_names(connection, columns) -> set:
+    """Names of the indexes (including constraint-backed ones) with exactly these columns"""
+    names = set()
+    for table in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars():
+        for index in connection.execute(text(f"PRAGMA index_list('{table}')")).mappings():
+            info = connection.execute(text(f"PRAGMA index_info('{index['name']}')")).mappings()
+            if tuple(row["name"] for row in info) == columns:
+                names.add(index["name"])
+    return names
+
+
+def check(connection, label, query, columns) -> bool:
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    plan = [row.detail for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+    expected = index_names(connection, columns)
+    uses_index = any(f"INDEX {name} " in f"{step} " for step in plan for name in expected)
+    sorts = any("TEMP B-TREE" in step for step in plan)
+    ok = bool(expected) and uses_index and not sorts
+    print(f"{'ok' if ok else 'FAIL':<5} {label:<28} {' | '.join(plan)}")
+    return ok
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[1]).parse_args()
+
+    upgrade_schema()
+
+    with engine.connect() as connection:
+        results = [check(connection, *entry) for entry in HOT_QUERIES]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Record search at scale: index build rate and query latency over --records records.
+
+Seeds health records with diagnoses and symptoms in English, Hindi, Tamil and
+Telugu, spread over --users patients and --clinics clinics, and indexes them
+through the same index_records() the ORM hook uses. Then times ranked
+searches scoped to a patient (through the API) and to a clinic, against the
+LIKE '%word%' scans they replace.
+
+    cd backend
+    python -m benchmarks.record_search --records 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, or_, select  # noqa: E402
+
+from app.api.api_v1.endpoints.records import LIST_COLUMNS  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal, build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.health_record import HealthRecord  # noqa: E402
+from app.models.health_record_search import index_records, search_entry  # noqa: E402
+from app.services.record_search import search_records  # noqa: E402
+from benchmarks.common import auth_headers, percentile, seed_users, serve  # noqa: E402
+
+PORT = 8772
+BATCH = 10000
+
+DIAGNOSES = [
+    "viral fever", "type 2 diabetes", "hypertension", "acute gastritis", "migraine", "seasonal allergy",
+    "बुखार", "मधुमेह", "उच्च रक्तचाप", "पेट में संक्रमण", "माइग्रेन", "सर्दी जुकाम",
+    "காய்ச்சல்", "நீரிழிவு", "உயர் இரத்த அழுத்தம்", "வயிற்று வலி", "ஒற்றைத் தலைவலி",
+    "జ్వరం", "మధుమేహం", "అధిక రక్తపోటు", "కడుపు నొప్పి", "తలనొప్పి",
+]
+SYMPTOMS = [
+    "headache", "body ache", "cough", "fatigue", "nausea", "dizziness", "chest pain",
+    "सिरदर्द", "खांसी", "थकान", "चक्कर", "उल्टी",
+    "தலைவலி", "இருமல்", "சோர்வு", "குமட்டல்",
+    "దగ్గు", "అలసట", "వికారం", "తలతిరగడం",
+]
+QUERIES = ["fever", "diab", "बुखार", "सिरदर्द", "காய்ச்சல்", "இருமல்", "జ్వరం", "దగ్గు", "chest pain", "headache"]
+
+
+def record_rows(count: int, users: int, clinics: int, start_id: int, generator: random.Random):
+    base = datetime(2021, 1, 1)
+    for record_id in range(start_id, start_id + count):
+        yield {
+            "id": record_id,
+            "user_id": generator.randrange(users) + 1,
+            "consultation_date": base + timedelta(minutes=record_id),
+            "doctor_name": "Dr. Sharma",
+            "clinic_name": f"PHC {generator.randrange(clinics)}",
+            "consultation_type": "general",
+            "is_locked": True,
+            "unlock_count": 0,
+            "diagnosis": generator.choice(DIAGNOSES),
+            "symptoms": ", ".join(generator.sample(SYMPTOMS, 3)),
+        }
+
+
+def seed(engine, args) -> float:
+    """Insert the records and index them; returns seconds spent indexing"""
+    generator = random.Random(7)
+    with engine.begin() as conn:
+        seed_users(conn, args.users)
+    indexing = 0.0
+    for start in range(1, args.records + 1, BATCH):
+        rows = list(record_rows(min(BATCH, args.records + 1 - start), args.users, args.clinics, start, generator))
+        with engine.begin() as conn:
+            conn.execute(insert(HealthRecord), rows)
+            started = time.perf_counter()
+            index_records(conn, (
+                search_entry(row["id"], row["user_id"], row["clinic_name"], row["diagnosis"], row["symptoms"])
+                for row in rows
+            ))
+            indexing += time.perf_counter() - started
+    return indexing
+
+
+def report(label: str, samples) -> None:
+    print(f"{label:<34} p50 {percentile(samples, 50) * 1000:8.2f} ms   p99 {percentile(samples, 99) * 1000:8.2f} ms")
+
+
+async def compare(args, generator, scope: str) -> tuple:
+    """Latencies of the ranked search and of a LIKE scan for the same words and scope"""
+    indexed, scanned = [], []
+    async with AsyncSessionLocal() as db:
+        for _ in range(args.queries):
+            word = generator.choice(QUERIES)
+            if scope == "patient":
+                user_id = generator.randrange(args.users) + 1
+                kwargs, condition = {"user_id": user_id}, HealthRecord.user_id == user_id
+            else:
+                clinic = f"PHC {generator.randrange(args.clinics)}"
+                kwargs, condition = {"clinic": clinic}, HealthRecord.clinic_name == clinic
+            started = time.perf_counter()
+            await search_records(db, word, LIST_COLUMNS, limit=20, **kwargs)
+            indexed.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await db.execute(
+                select(*LIST_COLUMNS)
+                .where(condition)
+                .where(or_(HealthRecord.diagnosis.like(f"%{word}%"), HealthRecord.symptoms.like(f"%{word}%")))
+                .limit(21)
+            )
+            scanned.append(time.perf_counter() - started)
+    return indexed, scanned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--clinics", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    started = time.perf_counter()
+    indexing = seed(engine, args)
+    print(f"seeded {args.records} records in {time.perf_counter() - started:.0f} s; "
+          f"indexing {args.records / indexing:.0f} records/s")
+    engine.dispose()
+
+    generator = random.Random(11)
+    per_user, hits = [], 0
+    with serve(app, PORT), httpx.Client(base_url=f"http://127.0.0.1:{PORT}", timeout=None) as client:
+        for _ in range(args.queries):
+            user_id = generator.randrange(args.users) + 1
+            started = time.perf_counter()
+            response = client.get(
+                "/api/v1/records/search", params={"q": generator.choice(QUERIES)}, headers=auth_headers(user_id)
+            )
+            per_user.append(time.perf_counter() - started)
+            response.raise_for_status()
+            hits += len(response.json())
+    report("patient search, API round trip", per_user)
+    print(f"{hits / args.queries:.1f} results per patient search on average")
+    for scope in ("patient", "clinic"):
+        indexed, scanned = asyncio.run(compare(args, generator, scope))
+        report(f"{scope} search, ranked", indexed)
+        report(f"{scope} LIKE scan, unranked", scanned)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Reminder query counts: SQL statements each reminder endpoint runs.
+
+Seeds --reminders reminders across a few medicines, then counts the
+statements the database sees for each request against a uvicorn server. The
+list must not issue a query per reminder; the run exits non-zero if any
+endpoint runs more statements than its budget.
+
+    cd backend
+    python -m benchmarks.reminder_queries --reminders 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("REMINDER_SCHEDULER_ENABLED", "false")
+# Keep background polling out of the counts
+os.environ.setdefault("TOKEN_REVOCATION_POLL_SECONDS", "3600")
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import async_engine, build_engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.medicine import Medicine  # noqa: E402
+from app.models.reminder import Reminder  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+PORT = 8774
+
+FREQUENCIES = ("morning", "afternoon", "night")
+
+# (label, method, path, json body, statements allowed); writes are the
+# joined select, the UPDATE and the change log entry
+REQUESTS = [
+    ("list", "GET", "/api/v1/reminders/", None, 1),
+    ("get", "GET", "/api/v1/reminders/1", None, 1),
+    ("update", "PUT", "/api/v1/reminders/1", {"time": "07:30"}, 3),
+    ("toggle", "POST", "/api/v1/reminders/1/toggle", None, 3),
+]
+
+
+class StatementCounter:
+    """Statements run on the primary engine, from any thread"""
+
+    def __init__(self, engine):
+        self.count = 0
+        self.statements = []
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self.record)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.count += 1
+            self.statements.append(statement.split("\n")[0][:80])
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.statements = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reminders", type=int, default=50)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = build_engine(settings.DATABASE_URL)
+    medicines = max(1, -(-args.reminders // len(FREQUENCIES)))
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+        conn.execute(insert(Medicine), [{
+            "id": medicine_id, "user_id": 1, "name": f"Medicine {medicine_id}", "dosage": "500mg",
+            "frequency": "daily", "start_date": datetime(2026, 1, 1), "is_active": True,
+        } for medicine_id in range(1, medicines + 1)])
+        conn.execute(insert(Reminder), [{
+            "id": n + 1, "user_id": 1, "medicine_id": n // len(FREQUENCIES) + 1,
+            "time": "08:00", "frequency": FREQUENCIES[n % len(FREQUENCIES)],
+            "enabled": True, "sound": True, "snooze_minutes": 10,
+        } for n in range(args.reminders)])
+    engine.dispose()
+
+    counter = StatementCounter(async_engine.sync_engine)
+    over = []
+    with serve(app, PORT), httpx.Client(base_url=f"http://127.0.0.1:{PORT}", headers=auth_headers(1)) as client:
+        # Authenticates once, so the user lookup is cached for the counted requests
+        client.get("/api/v1/reminders/").raise_for_status()
+        for label, method, path, body, budget in REQUESTS:
+            counter.reset()
+            response = client.request(method, path, json=body)
+            response.raise_for_status()
+            count, statements = counter.count, counter.statements
+            print(f"{label:7} {count} statements (budget {budget})")
+            for statement in statements:
+                print(f"          {statement}")
+            if count > budget:
+                over.append(label)
+            if label == "list" and len(response.json()) != args.reminders:
+                over.append("list (rows missing)")
+
+    if over:
+        print(f"FAILED: {', '.join(over)} over budget")
+        sys.exit(1)
+    print(f"every reminder endpoint within its statement budget at {args.reminders} reminders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Per-item vs batch reminder mutations.
+
+Replays a prescription change (create, update, toggle and delete a set of
+reminder slots) once through the per-item endpoints and once through
+``POST /reminders/batch``. Reports round trips, commits and wall time, with an
+optional simulated link round-trip time for 2G conditions.
+
+    cd backend
+    python -m benchmarks.reminders_batch --medicines 20 --rtt-ms 300
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, event, insert  # noqa: E402
+
+from app.core.database import async_engine, engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.medicine import Medicine  # noqa: E402
+from app.models.reminder import Reminder  # noqa: E402
+from benchmarks.common import auth_headers, seed_users, serve  # noqa: E402
+
+FREQUENCIES = {"morning": "08:00", "afternoon": "14:00", "night": "21:00"}
+
+commits = 0
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def count_commit(conn):
+    global commits
+    commits += 1
+
+
+def seed(medicines: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(Reminder))
+        conn.execute(delete(Medicine))
+        conn.execute(insert(Medicine), [
+            {
+                "id": i,
+                "user_id": 1,
+                "name": f"Medicine {i}",
+                "dosage": "500mg",
+                "frequency": "morning",
+                "start_date": datetime(2024, 9, 20),
+            }
+            for i in range(1, medicines + 1)
+        ])
+
+
+class Link:
+    """HTTP client that adds a fixed round-trip time to every request"""
+
+    def __init__(self, client: httpx.AsyncClient, rtt: float):
+        self.client = client
+        self.rtt = rtt
+        self.round_trips = 0
+
+    async def request(self, method, url, **kwargs):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+        response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+async def per_item(link: Link, medicines: int):
+    created = []
+    for medicine_id in range(1, medicines + 1):
+        for frequency, time_str in FREQUENCIES.items():
+            body = {"medicine_id": medicine_id, "time": time_str, "frequency": frequency}
+            created.append((await link.request("POST", "/api/v1/reminders/", json=body))["id"])
+    for reminder_id in created[0::3]:
+        await link.request("PUT", f"/api/v1/reminders/{reminder_id}", json={"time": "07:30"})
+    for reminder_id in created[1::3]:
+        await link.request("POST", f"/api/v1/reminders/{reminder_id}/toggle")
+    for reminder_id in created[2::3]:
+        await link.request("DELETE", f"/api/v1/reminders/{reminder_id}")
+
+
+async def batched(link: Link, medicines: int):
+    operations = [
+        {"op": "create", "medicine_id": medicine_id, "time": time_str, "frequency": frequency}
+        for medicine_id in range(1, medicines + 1)
+        for frequency, time_str in FREQUENCIES.items()
+    ]
+    results = await link.request("POST", "/api/v1/reminders/batch", json={"operations": operations})
+    created = [result["reminder_id"] for result in results]
+    operations = (
+        [{"op": "update", "reminder_id": i, "time": "07:30"} for i in created[0::3]]
+        + [{"op": "toggle", "reminder_id": i} for i in created[1::3]]
+        + [{"op": "delete", "reminder_id": i} for i in created[2::3]]
+    )
+    await link.request("POST", "/api/v1/reminders/batch", json={"operations": operations})
+
+
+async def measure(label, scenario, medicines, rtt, port):
+    global commits
+    seed(medicines)
+    commits = 0
+    async with httpx.AsyncClient(base_url=f"http://localhost:{port}", headers=auth_headers(1)) as client:
+        link = Link(client, rtt)
+        start = time.perf_counter()
+        await scenario(link, medicines)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<9} slots={medicines * 3:<4} round_trips={link.round_trips:<4} commits={commits:<4} {elapsed * 1000:9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--medicines", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=0)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    with engine.begin() as conn:
+        seed_users(conn, 1)
+    with serve(app, args.port):
+        asyncio.run(measure("per-item", per_item, args.medicines, args.rtt_ms / 1000, args.port))
+        asyncio.run(measure("batch", batched, args.medicines, args.rtt_ms / 1000, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Concurrency benchmark for the reminders router.
+
+Serves the app with uvicorn and runs the same reminder list query through the
+old blocking ``Session`` path and through the ``AsyncSession`` path while a
+second stream of requests hits ``/health``, and reports p50/p99 latency for
+both streams.
+
+    cd backend
+    python -m benchmarks.reminders_concurrency --concurrency 50 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.medicine import Medicine  # noqa: E402
+from app.models.reminder import Reminder  # noqa: E402
+from benchmarks.common import auth_headers, percentile, seed_users, serve  # noqa: E402
+
+
+@app.get("/bench/blocking-reminders")
+async def blocking_reminders(user_id: int = 1):
+    """The pre-async handler shape: sync queries inside ``async def``"""
+    # The session is opened inline so it is released before the handler yields;
+    # a dependency-held sync session deadlocks the pool under this load.
+    with SessionLocal() as db:
+        reminders = db.query(Reminder).filter(Reminder.user_id == user_id).all()
+        result = []
+        for reminder in reminders:
+            medicine = db.query(Medicine).filter(Medicine.id == reminder.medicine_id).first()
+            result.append({"id": reminder.id, "medicine_name": medicine.name if medicine else None})
+    return result
+
+
+def seed(users: int, reminders_per_user: int) -> None:
+    upgrade_schema()
+    with engine.begin() as conn:
+        seed_users(conn, users)
+        conn.execute(insert(Medicine), [
+            {
+                "id": user_id,
+                "user_id": user_id,
+                "name": f"Medicine {user_id}",
+                "dosage": "500mg",
+                "frequency": "morning",
+                "start_date": datetime(2024, 9, 20),
+            }
+            for user_id in range(1, users + 1)
+        ])
+        conn.execute(insert(Reminder), [
+            {
+                "medicine_id": user_id,
+                "user_id": user_id,
+                "time": "08:00",
+                "frequency": f"slot{slot}",
+                "enabled": True,
+                "sound": True,
+                "snooze_minutes": 10,
+            }
+            for user_id in range(1, users + 1)
+            for slot in range(reminders_per_user)
+        ])
+
+
+async def run(path: str, concurrency: int, total: int, port: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = {"list": [], "health": []}
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://localhost:{port}", limits=limits) as client:
+        async def timed(kind, url, headers=None):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                timings[kind].append((time.perf_counter() - start) * 1000)
+
+        headers = {user_id: auth_headers(user_id) for user_id in range(1, 51)}
+        tasks = []
+        for i in range(total):
+            user_id = i % 50 + 1
+            tasks.append(timed("list", f"{path}?user_id={user_id}", headers[user_id]))
+            tasks.append(timed("health", "/health"))
+        await asyncio.gather(*tasks)
+    return timings
+
+
+def report(label, timings):
+    for kind, samples in timings.items():
+        print(
+            f"{label:<10} {kind:<7} n={len(samples):<5} "
+            f"p50={statistics.median(samples):8.2f}ms p99={percentile(samples, 99):8.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--reminders-per-user", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    seed(args.users, args.reminders_per_user)
+    with serve(app, args.port):
+        for label, path in (("before", "/bench/blocking-reminders"), ("after", "/api/v1/reminders/")):
+            report(label, asyncio.run(run(path, args.concurrency, args.requests, args.port)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start cost of the API: import time and time to first request.
+
+Each run is a fresh interpreter. "import" times ``import app.main``; "first
+request" starts uvicorn and polls ``/health`` until it answers, once per
+DATABASE_STARTUP_MODE, against a database already at the migration head.
+
+    cd backend
+    python -m benchmarks.startup_time --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed_import(env) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=env, check=True)
+    return time.perf_counter() - start
+
+
+def time_to_first_request(env, port: int) -> float:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}")
+            try:
+                if httpx.get(f"http://localhost:{port}/health").status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(label, samples):
+    print(
+        f"{label:<28} median {statistics.median(samples) * 1000:7.0f} ms"
+        f"   min {min(samples) * 1000:7.0f} ms   max {max(samples) * 1000:7.0f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_dir}/bench.db")
+    subprocess.run([sys.executable, "-m", "app.migrate"], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+
+    timed_import(env)  # warm the OS file cache and bytecode
+    report("import app.main", [timed_import(env) for _ in range(args.runs)])
+    # Modes are interleaved so machine noise spreads evenly across them
+    modes = {mode: [] for mode in ("skip", "check", "migrate")}
+    for _ in range(args.runs):
+        for mode, samples in modes.items():
+            samples.append(time_to_first_request(dict(env, DATABASE_STARTUP_MODE=mode), args.port))
+    for mode, samples in modes.items():
+        report(f"first request ({mode})", samples)
+
+
+if __name__ == "__main__":
+    main()
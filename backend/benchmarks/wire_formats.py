@@ -0,0 +1,101 @@
+"""
+Bytes on the wire and encoding CPU time per response format.
+
+Encodes representative payloads (a reminders list, a page of medicine logs and
+a /sync/changes page) as JSON and MessagePack, each uncompressed, gzip and
+brotli, using the same settings as the response middlewares.
+
+    cd backend
+    python -m benchmarks.wire_formats --rows 500
+"""
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import brotli
+import msgpack
+
+from app.core.config import settings
+
+
+def reminders(n):
+    return [
+        {
+            "id": i, "medicine_id": i // 3 + 1, "user_id": 1, "time": "08:00",
+            "frequency": ("morning", "afternoon", "night")[i % 3], "enabled": True,
+            "sound": True, "snooze_minutes": 10, "medicine_name": "Paracetamol",
+            "medicine_dosage": "500mg",
+        }
+        for i in range(n)
+    ]
+
+
+def medicine_logs(n):
+    start = datetime(2024, 1, 1, 8, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i, "user_id": 1, "medicine_id": i % 4 + 1,
+            "scheduled_time": (start + timedelta(hours=8 * i)).isoformat(),
+            "taken_time": (start + timedelta(hours=8 * i, minutes=12)).isoformat(),
+            "status": "taken", "notes": None, "side_effects": None,
+            "created_at": (start + timedelta(hours=8 * i, minutes=12)).isoformat(),
+        }
+        for i in range(n)
+    ]
+
+
+def sync_page(n):
+    return {
+        "cursor": 120000 + n, "has_more": True,
+        "changes": {"medicine_logs": medicine_logs(n // 2), "reminders": reminders(n // 2)},
+        "deleted": {"reminders": list(range(n // 10))},
+    }
+
+
+ENCODERS = {
+    "json": lambda payload: json.dumps(payload, separators=(",", ":")).encode(),
+    "msgpack": msgpack.packb,
+}
+
+COMPRESSORS = {
+    "identity": lambda body: body,
+    "gzip": lambda body: gzip.compress(body, compresslevel=settings.GZIP_LEVEL),
+    "br": lambda body: brotli.compress(body, quality=settings.BROTLI_QUALITY),
+}
+
+
+def measure(payload, encoder, compressor, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        body = compressor(encoder(payload))
+    return len(body), (time.process_time() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = {
+        "reminders(9)": reminders(9),
+        f"medicine_logs({args.rows})": medicine_logs(args.rows),
+        f"sync_page({args.rows})": sync_page(args.rows),
+    }
+    print(f"{'payload':<20} {'format':<18} {'bytes':>9} {'vs json':>8} {'cpu/op':>10}")
+    for name, payload in payloads.items():
+        baseline = None
+        for encoder_name, encoder in ENCODERS.items():
+            for compressor_name, compressor in COMPRESSORS.items():
+                size, cpu = measure(payload, encoder, compressor, args.repeat)
+                baseline = baseline or size
+                print(
+                    f"{name:<20} {encoder_name + '+' + compressor_name:<18} {size:>9} "
+                    f"{size / baseline:>7.0%} {cpu:>8.0f}us"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+SQLite write contention: threads logging doses while others read the log list.
+
+Runs the same workload against a copy of a migrated database twice: once with
+SQLite's defaults (rollback journal, synchronous=FULL) and once with the
+configured pragmas (WAL, busy_timeout, synchronous=NORMAL). Reports committed
+writes per second, "database is locked" failures, latency and pool wait time.
+
+    cd backend
+    python -m benchmarks.write_contention --writers 8 --readers 4 --seconds 10
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="healthaxis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import build_engine, pool_status  # noqa: E402
+from app.core.schema import upgrade_schema  # noqa: E402
+from app.models.medicine import Medicine, MedicineLog  # noqa: E402
+from benchmarks.common import percentile  # noqa: E402
+
+SCENARIOS = {
+    "sqlite defaults": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL"},
+    "tuned pragmas": {},
+}
+
+
+def writer(engine, stop, stats):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with Session(engine) as db:
+                medicine = db.get(Medicine, 1)
+                db.add(MedicineLog(
+                    user_id=medicine.user_id,
+                    medicine_id=medicine.id,
+                    scheduled_time=datetime.utcnow(),
+                    status="taken",
+                ))
+                db.commit()
+        except OperationalError:
+            stats["locked"] += 1
+            continue
+        stats["latencies"].append(time.perf_counter() - started)
+
+
+def reader(engine, stop, stats):
+    query = (
+        select(MedicineLog.id, MedicineLog.status)
+        .where(MedicineLog.user_id == 1)
+        .order_by(MedicineLog.scheduled_time.desc())
+        .limit(200)
+    )
+    while not stop.is_set():
+        try:
+            with Session(engine) as db:
+                db.execute(query).all()
+            stats["reads"] += 1
+        except OperationalError:
+            stats["locked"] += 1
+
+
+def run(label, template, overrides, writers, readers, seconds):
+    path = os.path.join(_db_dir, f"{label.replace(' ', '-')}.db")
+    shutil.copy(template, path)
+    defaults = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        engine = build_engine(f"sqlite:///{path}")
+        stats = {"latencies": [], "locked": 0, "reads": 0}
+        stop = threading.Event()
+        threads = [threading.Thread(target=writer, args=(engine, stop, stats)) for _ in range(writers)]
+        threads += [threading.Thread(target=reader, args=(engine, stop, stats)) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        pool = pool_status(engine)
+        engine.dispose()
+    finally:
+        for name, value in defaults.items():
+            setattr(settings, name, value)
+
+    latencies = stats["latencies"]
+    print(
+        f"{label:<16} {len(latencies) / seconds:8.0f} writes/s {stats['reads'] / seconds:8.0f} reads/s"
+        f"   locked {stats['locked']:5d}"
+        f"   p50 {percentile(latencies, 50) * 1000:7.1f} ms   p99 {percentile(latencies, 99) * 1000:7.1f} ms"
+        f"   pool wait {pool['wait_seconds_total']:.2f} s (max {pool['wait_seconds_max'] * 1000:.1f} ms)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    template = settings.DATABASE_URL.replace("sqlite:///", "", 1)
+    engine = build_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(insert(Medicine), [{
+            "id": 1, "user_id": 1, "name": "Paracetamol", "dosage": "500mg",
+            "frequency": "morning", "start_date": datetime(2024, 9, 20),
+        }])
+    engine.dispose()  # checkpoints the WAL so the copies below see the seed row
+
+    for label, overrides in SCENARIOS.items():
+        run(label, template, overrides, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
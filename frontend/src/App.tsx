@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { useTranslation } from 'react-i18next';
@@ -10,13 +10,23 @@ import RecordsPage from './pages/RecordsPage';
 import AppointmentsPage from './pages/AppointmentsPage';
 import PointsPage from './pages/PointsPage';
 import SettingsPage from './pages/SettingsPage';
+import SignInPage from './pages/SignInPage';
 
 // Import components
 import Navigation from './components/Navigation';
 import OfflineIndicator from './components/OfflineIndicator';
+import { AUTH_CHANGED_EVENT, isSignedIn } from './services/api';
 
 function App() {
   const { t } = useTranslation();
+  const [signedIn, setSignedIn] = useState(isSignedIn());
+
+  // Sign-in, logout and an expired token all change the stored token
+  useEffect(() => {
+    const update = () => setSignedIn(isSignedIn());
+    window.addEventListener(AUTH_CHANGED_EVENT, update);
+    return () => window.removeEventListener(AUTH_CHANGED_EVENT, update);
+  }, []);
 
   return (
     <Router>
@@ -54,18 +64,22 @@ function App() {
 
         {/* Main content */}
         <div className="relative z-10">
-          <Routes>
-            <Route path="/" element={<HomePage />} />
-            <Route path="/medicines" element={<MedicinesPage />} />
-            <Route path="/records" element={<RecordsPage />} />
-            <Route path="/appointments" element={<AppointmentsPage />} />
-            <Route path="/points" element={<PointsPage />} />
-            <Route path="/settings" element={<SettingsPage />} />
-          </Routes>
+          {signedIn ? (
+            <Routes>
+              <Route path="/" element={<HomePage />} />
+              <Route path="/medicines" element={<MedicinesPage />} />
+              <Route path="/records" element={<RecordsPage />} />
+              <Route path="/appointments" element={<AppointmentsPage />} />
+              <Route path="/points" element={<PointsPage />} />
+              <Route path="/settings" element={<SettingsPage />} />
+            </Routes>
+          ) : (
+            <SignInPage />
+          )}
         </div>
 
         {/* Bottom navigation */}
-        <Navigation />
+        {signedIn && <Navigation />}
       </div>
     </Router>
   );
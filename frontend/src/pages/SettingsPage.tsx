@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { motion } from 'framer-motion';
 import { useTranslation } from 'react-i18next';
+import { api } from '../services/api';
 
 const SettingsPage: React.FC = () => {
   const { t, i18n } = useTranslation();
@@ -224,6 +225,7 @@ const SettingsPage: React.FC = () => {
         <motion.button
           whileHover={{ scale: 1.02 }}
           whileTap={{ scale: 0.98 }}
+          onClick={() => api.logout()}
           className="w-full p-4 bg-gradient-to-r from-red-500 to-red-600 text-white rounded-2xl font-medium shadow-lg"
         >
           <div className="flex items-center justify-center space-x-2">
@@ -0,0 +1,92 @@
+import React, { useState } from 'react';
+import { motion } from 'framer-motion';
+import { useTranslation } from 'react-i18next';
+import { api } from '../services/api';
+
+const SignInPage: React.FC = () => {
+  const { t } = useTranslation();
+  const [phoneNumber, setPhoneNumber] = useState('');
+  const [password, setPassword] = useState('');
+  const [failed, setFailed] = useState(false);
+  const [submitting, setSubmitting] = useState(false);
+
+  const handleSubmit = async (event: React.FormEvent) => {
+    event.preventDefault();
+    setSubmitting(true);
+    setFailed(false);
+    try {
+      // Storing the token switches the app to its pages
+      await api.login(phoneNumber, password);
+    } catch (error) {
+      console.error('Error signing in:', error);
+      setFailed(true);
+    } finally {
+      setSubmitting(false);
+    }
+  };
+
+  return (
+    <div className="min-h-screen px-4 pt-16">
+      <motion.div
+        initial={{ y: -20, opacity: 0 }}
+        animate={{ y: 0, opacity: 1 }}
+        className="mb-6"
+      >
+        <h1 className="text-2xl font-bold text-gradient mb-2">
+          {t('auth.title')}
+        </h1>
+      </motion.div>
+
+      <motion.form
+        initial={{ y: 20, opacity: 0 }}
+        animate={{ y: 0, opacity: 1 }}
+        transition={{ delay: 0.1 }}
+        onSubmit={handleSubmit}
+        className="glass rounded-2xl p-6 space-y-4"
+      >
+        <div>
+          <label className="block text-sm text-gray-600 mb-2">
+            {t('auth.phoneNumber')}
+          </label>
+          <input
+            type="tel"
+            value={phoneNumber}
+            onChange={(e) => setPhoneNumber(e.target.value)}
+            className="w-full bg-white/50 border border-gray-200 rounded-lg px-3 py-2 text-gray-800"
+            autoComplete="tel"
+            required
+          />
+        </div>
+
+        <div>
+          <label className="block text-sm text-gray-600 mb-2">
+            {t('auth.password')}
+          </label>
+          <input
+            type="password"
+            value={password}
+            onChange={(e) => setPassword(e.target.value)}
+            className="w-full bg-white/50 border border-gray-200 rounded-lg px-3 py-2 text-gray-800"
+            autoComplete="current-password"
+            required
+          />
+        </div>
+
+        {failed && (
+          <p className="text-sm text-red-600">{t('auth.failed')}</p>
+        )}
+
+        <motion.button
+          whileTap={{ scale: 0.98 }}
+          type="submit"
+          disabled={submitting}
+          className="w-full p-4 bg-gradient-to-r from-primary-500 to-primary-600 text-white rounded-2xl font-medium shadow-lg disabled:opacity-50"
+        >
+          {submitting ? t('common.loading') : t('auth.signIn')}
+        </motion.button>
+      </motion.form>
+    </div>
+  );
+};
+
+export default SignInPage;
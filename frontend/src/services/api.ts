@@ -33,9 +33,20 @@ export interface HealthRecord {
   id: number;
   consultation_date: string;
   doctor_name: string;
+  clinic_name?: string;
   consultation_type: string;
+  diagnosis?: string;
   is_locked: boolean;
+}
+
+// Decrypted on request by GET /records/{id}; the list never carries these
+export type HealthRecordField = 'transcript' | 'audio_url' | 'summary' | 'prescription';
+
+export interface HealthRecordDetail extends HealthRecord {
+  transcript?: string;
+  audio_url?: string;
   summary?: string;
+  prescription?: string;
 }
 
 export interface HealthAxisPointsData {
@@ -79,12 +90,74 @@ export interface ReminderUpdate {
   snooze_minutes?: number;
 }
 
+export type ReminderOperation =
+  | ({ op: 'create' } & ReminderCreate)
+  | ({ op: 'update'; reminder_id: number } & ReminderUpdate)
+  | { op: 'toggle'; reminder_id: number }
+  | { op: 'delete'; reminder_id: number };
+
+export interface ReminderBatchResult {
+  index: number;
+  op: ReminderOperation['op'];
+  status_code: number;
+  detail?: string;
+  reminder_id?: number;
+  reminder?: Reminder;
+}
+
+// Columns the medicines list renders; instructions is only sent when asked for
+const MEDICINE_LIST_FIELDS = 'name,dosage,frequency,instructions,morning_time,afternoon_time,night_time,is_active';
+
+// Bearer token from sign-in; every endpoint except /auth requires it
+const TOKEN_STORAGE_KEY = 'healthaxis_token';
+
+// Fired when the token is set or cleared, so the app can show or leave the sign-in page
+export const AUTH_CHANGED_EVENT = 'healthaxis:auth-changed';
+
+export const setAccessToken = (token: string | null) => {
+  if (token) localStorage.setItem(TOKEN_STORAGE_KEY, token);
+  else localStorage.removeItem(TOKEN_STORAGE_KEY);
+  window.dispatchEvent(new Event(AUTH_CHANGED_EVENT));
+};
+
+export const isSignedIn = () => localStorage.getItem(TOKEN_STORAGE_KEY) !== null;
+
+const apiFetch = async (url: string, init: RequestInit = {}) => {
+  const headers = new Headers(init.headers);
+  const token = localStorage.getItem(TOKEN_STORAGE_KEY);
+  if (token) headers.set('Authorization', `Bearer ${token}`);
+  const response = await fetch(url, { ...init, headers });
+  // Expired or revoked: sign in again
+  if (response.status === 401 && token) setAccessToken(null);
+  return response;
+};
+
 // API Functions
 export const api = {
+  // Auth
+  async login(phoneNumber: string, password: string): Promise<void> {
+    const response = await fetch(`${API_BASE_URL}/auth/login`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ phone_number: phoneNumber, password })
+    });
+    if (!response.ok) throw new Error('Failed to sign in');
+    setAccessToken((await response.json()).access_token);
+  },
+
+  async logout(): Promise<void> {
+    try {
+      await apiFetch(`${API_BASE_URL}/auth/logout`, { method: 'POST' });
+    } catch (error) {
+      console.error('Error signing out:', error);
+    }
+    setAccessToken(null);
+  },
+
   // Medicines
   async getMedicines(): Promise<Medicine[]> {
     try {
-      const response = await fetch(`${API_BASE_URL}/medicines/`);
+      const response = await apiFetch(`${API_BASE_URL}/medicines/?fields=${MEDICINE_LIST_FIELDS}`);
       if (!response.ok) throw new Error('Failed to fetch medicines');
       return await response.json();
     } catch (error) {
@@ -112,7 +185,7 @@ export const api = {
 
   async logMedicine(medicineId: number, status: string = 'taken'): Promise<any> {
     try {
-      const response = await fetch(`${API_BASE_URL}/medicines/log?medicine_id=${medicineId}&status=${status}`, {
+      const response = await apiFetch(`${API_BASE_URL}/medicines/log?medicine_id=${medicineId}&status=${status}`, {
         method: 'POST'
       });
       if (!response.ok) throw new Error('Failed to log medicine');
@@ -126,7 +199,7 @@ export const api = {
   // Appointments
   async getAppointments(): Promise<Appointment[]> {
     try {
-      const response = await fetch(`${API_BASE_URL}/appointments/`);
+      const response = await apiFetch(`${API_BASE_URL}/appointments/`);
       if (!response.ok) throw new Error('Failed to fetch appointments');
       return await response.json();
     } catch (error) {
@@ -148,7 +221,7 @@ export const api = {
   // Health Records
   async getHealthRecords(): Promise<HealthRecord[]> {
     try {
-      const response = await fetch(`${API_BASE_URL}/records/`);
+      const response = await apiFetch(`${API_BASE_URL}/records/`);
       if (!response.ok) throw new Error('Failed to fetch health records');
       return await response.json();
     } catch (error) {
@@ -160,16 +233,32 @@ export const api = {
           consultation_date: '2024-09-20T00:00:00Z',
           doctor_name: 'Dr. Sharma',
           consultation_type: 'General Consultation',
-          is_locked: false,
-          summary: 'Patient reported mild headache and fatigue. Prescribed rest and hydration.'
+          is_locked: false
         }
       ];
     }
   },
 
-  async unlockRecord(recordId: number, qrKey: string): Promise<any> {
+  async getHealthRecord(recordId: number, fields: HealthRecordField[] = ['summary']): Promise<HealthRecordDetail> {
+    const response = await apiFetch(`${API_BASE_URL}/records/${recordId}?fields=${fields.join(',')}`);
+    if (!response.ok) throw new Error('Failed to fetch health record');
+    return await response.json();
+  },
+
+  // Ranked search over diagnoses and symptoms; pass the returned cursor for the next page
+  async searchHealthRecords(query: string, cursor?: string, clinic?: string): Promise<{ records: HealthRecord[]; nextCursor: string | null }> {
+    const params = new URLSearchParams({ q: query });
+    if (cursor) params.set('cursor', cursor);
+    if (clinic) params.set('clinic', clinic);
+    const response = await apiFetch(`${API_BASE_URL}/records/search?${params}`);
+    if (!response.ok) throw new Error('Failed to search health records');
+    return { records: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+  },
+
+  // Returns the unlocked record with the requested fields decrypted
+  async unlockRecord(recordId: number, qrKey: string, fields: HealthRecordField[] = ['summary']): Promise<any> {
     try {
-      const response = await fetch(`${API_BASE_URL}/records/${recordId}/unlock`, {
+      const response = await apiFetch(`${API_BASE_URL}/records/${recordId}/unlock?fields=${fields.join(',')}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ qr_key: qrKey })
@@ -185,7 +274,7 @@ export const api = {
   // HealthAxis Points
   async getHealthAxisPoints(): Promise<HealthAxisPointsData> {
     try {
-      const response = await fetch(`${API_BASE_URL}/points/`);
+      const response = await apiFetch(`${API_BASE_URL}/points/`);
       if (!response.ok) throw new Error('Failed to fetch HealthAxis points');
       return await response.json();
     } catch (error) {
@@ -212,7 +301,7 @@ export const api = {
       const url = medicineId 
         ? `${API_BASE_URL}/reminders/?medicine_id=${medicineId}`
         : `${API_BASE_URL}/reminders/`;
-      const response = await fetch(url);
+      const response = await apiFetch(url);
       if (!response.ok) throw new Error('Failed to fetch reminders');
       return await response.json();
     } catch (error) {
@@ -223,7 +312,7 @@ export const api = {
 
   async createReminder(reminder: ReminderCreate): Promise<Reminder> {
     try {
-      const response = await fetch(`${API_BASE_URL}/reminders/`, {
+      const response = await apiFetch(`${API_BASE_URL}/reminders/`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -240,7 +329,7 @@ export const api = {
 
   async updateReminder(reminderId: number, update: ReminderUpdate): Promise<Reminder> {
     try {
-      const response = await fetch(`${API_BASE_URL}/reminders/${reminderId}`, {
+      const response = await apiFetch(`${API_BASE_URL}/reminders/${reminderId}`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -257,7 +346,7 @@ export const api = {
 
   async deleteReminder(reminderId: number): Promise<void> {
     try {
-      const response = await fetch(`${API_BASE_URL}/reminders/${reminderId}`, {
+      const response = await apiFetch(`${API_BASE_URL}/reminders/${reminderId}`, {
         method: 'DELETE',
       });
       if (!response.ok) throw new Error('Failed to delete reminder');
@@ -269,7 +358,7 @@ export const api = {
 
   async toggleReminder(reminderId: number): Promise<{ enabled: boolean }> {
     try {
-      const response = await fetch(`${API_BASE_URL}/reminders/${reminderId}/toggle`, {
+      const response = await apiFetch(`${API_BASE_URL}/reminders/${reminderId}/toggle`, {
         method: 'POST',
       });
       if (!response.ok) throw new Error('Failed to toggle reminder');
@@ -278,5 +367,22 @@ export const api = {
       console.error('Error toggling reminder:', error);
       throw error;
     }
+  },
+
+  async batchReminders(operations: ReminderOperation[]): Promise<ReminderBatchResult[]> {
+    try {
+      const response = await apiFetch(`${API_BASE_URL}/reminders/batch`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ operations }),
+      });
+      if (!response.ok) throw new Error('Failed to apply reminder changes');
+      return await response.json();
+    } catch (error) {
+      console.error('Error applying reminder changes:', error);
+      throw error;
+    }
   }
 };
\ No newline at end of file